@@ -1,6 +1,11 @@
+from ast import literal_eval
 from importlib import import_module
+from json import loads
+from logging import getLogger
 from os import getenv
 
+LOGGER = getLogger(__name__)
+
 
 class Config:
     AS_DOCUMENT = False
@@ -16,6 +21,8 @@ class Config:
     DATABASE_URL = ""
     DEFAULT_UPLOAD = "rc"
     DELETE_LINKS = False
+    DIRECT_PARALLEL = 4
+    DIRECT_HOST_PARALLEL = {}
     DEBRID_LINK_API = ""
     DISABLE_TORRENTS = False
     DISABLE_LEECH = False
@@ -26,10 +33,12 @@ class Config:
     EQUAL_SPLITS = False
     EXCLUDED_EXTENSIONS = ""
     FFMPEG_CMDS = {}
+    FFMPEG_SLOTS = 0
     FILELION_API = ""
     MEDIA_STORE = True
     FORCE_SUB_IDS = ""
     GDRIVE_ID = ""
+    GDRIVE_WORKERS = 4
     GD_DESP = "Uploaded with WZ Bot"
     AUTHOR_NAME = "WZML-X"
     AUTHOR_URL = "https://t.me/WZML_X"
@@ -65,6 +74,7 @@ class Config:
     LEECH_SUFFIX = ""
     LEECH_FONT = ""
     LEECH_SPLIT_SIZE = 2097152000
+    LEECH_UPLOAD_THREADS = 1
     MEDIA_GROUP = False
     HYBRID_LEECH = True
     HYPER_THREADS = 0
@@ -213,6 +223,20 @@ class Config:
                 return float(value)
             except (ValueError, TypeError):
                 return original_value
+        elif isinstance(original_value, dict):
+            if isinstance(value, dict):
+                return value
+            if not str(value).strip():
+                return original_value
+            for parse in (loads, literal_eval):
+                try:
+                    parsed = parse(str(value).strip())
+                except (ValueError, TypeError, SyntaxError):
+                    continue
+                if isinstance(parsed, dict):
+                    return parsed
+            LOGGER.warning(f"{key} must be a dict, ignoring value: {value}")
+            return original_value
         return value
 
     @classmethod
@@ -0,0 +1,115 @@
+from inspect import iscoroutinefunction
+
+
+class TaskRegistry(dict):
+    def __init__(self):
+        super().__init__()
+        self._gids = {}
+        self._by_gid = {}
+        self._by_user = {}
+        self._statuses = {}
+        self._by_status = {}
+
+    def __setitem__(self, mid, task):
+        old_task = self.get(mid)
+        if old_task is not None:
+            self._drop_gid(mid)
+            self._drop_status(mid)
+            if old_task.listener.user_id != task.listener.user_id:
+                self._drop_user(mid, old_task.listener.user_id)
+        super().__setitem__(mid, task)
+        self._by_user.setdefault(task.listener.user_id, {})[mid] = None
+        self.reindex(mid)
+
+    def __delitem__(self, mid):
+        task = self[mid]
+        self._drop_gid(mid)
+        self._drop_status(mid)
+        self._drop_user(mid, task.listener.user_id)
+        super().__delitem__(mid)
+
+    def pop(self, mid, *args):
+        if mid in self:
+            task = self[mid]
+            del self[mid]
+            return task
+        return super().pop(mid, *args)
+
+    def clear(self):
+        super().clear()
+        self._gids.clear()
+        self._by_gid.clear()
+        self._by_user.clear()
+        self._statuses.clear()
+        self._by_status.clear()
+
+    def _drop_gid(self, mid):
+        gid = self._gids.pop(mid, None)
+        if gid is not None and self._by_gid.get(gid) == mid:
+            del self._by_gid[gid]
+
+    def _drop_status(self, mid):
+        status = self._statuses.pop(mid, None)
+        if status is not None:
+            bucket = self._by_status[status]
+            bucket.pop(mid, None)
+            if not bucket:
+                del self._by_status[status]
+
+    def _drop_user(self, mid, user_id):
+        if (tasks := self._by_user.get(user_id)) is not None:
+            tasks.pop(mid, None)
+            if not tasks:
+                del self._by_user[user_id]
+
+    def index_gid(self, mid):
+        try:
+            gid = self[mid].gid()
+        except (AttributeError, IndexError, KeyError, TypeError):
+            # engine info isn't fetched yet
+            gid = None
+        if gid == self._gids.get(mid):
+            return gid
+        self._drop_gid(mid)
+        if gid:
+            self._gids[mid] = gid
+            self._by_gid[gid] = mid
+        return gid
+
+    def reindex(self, mid):
+        # async status() getters are bucketed on their next status refresh
+        task = self[mid]
+        self.index_gid(mid)
+        if iscoroutinefunction(task.status):
+            return
+        try:
+            status = task.status()
+        except (AttributeError, IndexError, KeyError, TypeError):
+            return
+        self.set_status(mid, status)
+
+    def set_status(self, mid, status):
+        if mid not in self or self._statuses.get(mid) == status:
+            return
+        self._drop_status(mid)
+        self._statuses[mid] = status
+        self._by_status.setdefault(status, {})[mid] = None
+
+    def get_by_gid(self, gid):
+        mid = self._by_gid.get(gid)
+        return None if mid is None else self.get(mid)
+
+    def get_by_user(self, user_id):
+        return [self[mid] for mid in self._by_user.get(user_id, ())]
+
+    def get_by_status(self, status, user_id=None):
+        return self.get_by_statuses((status,), user_id)
+
+    def get_by_statuses(self, statuses, user_id=None):
+        # keep task_dict order so status pages don't shuffle between buckets
+        buckets = [self._by_status[st] for st in statuses if st in self._by_status]
+        mids = self._by_user.get(user_id, {}) if user_id else self
+        return [self[mid] for mid in mids if any(mid in bucket for bucket in buckets)]
+
+    def get_statuses(self):
+        return list(self._by_status)
@@ -14,6 +14,7 @@ class TgClient:
     user = None
     helper_bots = {}
     helper_loads = {}
+    user_load = 0
 
     BNAME = ""
     ID = 0
@@ -1,9 +1,12 @@
-from asyncio import TimeoutError, gather
+from asyncio import Event, Lock, TimeoutError, gather, wait_for
 from contextlib import suppress
 from inspect import iscoroutinefunction
 from pathlib import Path
+from time import time
+from typing import ClassVar
 
 from aioaria2 import Aria2WebsocketClient
+from aioaria2.exceptions import Aria2rpcException
 from aiohttp import ClientError
 from aioqbt.client import create_client
 from tenacity import (
@@ -16,6 +19,25 @@ from tenacity import (
 from .. import LOGGER, aria2_options
 from .config_manager import Config
 
+ARIA2_TICK = 1
+ARIA2_KEYS = [
+    "gid",
+    "status",
+    "totalLength",
+    "completedLength",
+    "downloadSpeed",
+    "uploadLength",
+    "uploadSpeed",
+    "connections",
+    "numSeeders",
+    "seeder",
+    "followedBy",
+    "errorMessage",
+    "dir",
+    "files",
+    "bittorrent",
+]
+
 
 def wrap_with_retry(obj, max_retries=3):
     for attr_name in dir(obj):
@@ -164,3 +186,63 @@ def is_metadata(download_info):
     return any(
         f["path"].startswith("[METADATA]") for f in download_info.get("files", [])
     )
+
+
+class Aria2Tracker:
+    downloads: ClassVar[dict] = {}
+    _updated = 0
+    _lock = Lock()
+    _events: ClassVar[dict] = {}
+
+    @classmethod
+    async def refresh(cls):
+        if time() - cls._updated < ARIA2_TICK:
+            return
+        async with cls._lock:
+            if time() - cls._updated < ARIA2_TICK:
+                return
+            calls = [
+                {"methodName": "aria2.tellActive", "params": [ARIA2_KEYS]},
+                {"methodName": "aria2.tellWaiting", "params": [0, 1000, ARIA2_KEYS]},
+                {"methodName": "aria2.tellStopped", "params": [0, 1000, ARIA2_KEYS]},
+            ]
+            results = await TorrentManager.aria2.jsonrpc(
+                "multicall", [calls], prefix="system."
+            )
+            downloads = {}
+            for res in results:
+                # successful multicall entries are wrapped in a one-item list
+                if isinstance(res, list):
+                    for download in res[0]:
+                        downloads[download["gid"]] = download
+            cls.downloads = downloads
+            cls._updated = time()
+
+    @classmethod
+    async def get(cls, gid, old_info=None):
+        await cls.refresh()
+        if (download := cls.downloads.get(gid)) is None:
+            # gids born after the last snapshot, e.g. a followedBy download
+            try:
+                download = await TorrentManager.aria2.tellStatus(gid, ARIA2_KEYS)
+            except (Aria2rpcException, ClientError, TimeoutError):
+                return old_info
+            cls.downloads[gid] = download
+        return download or old_info
+
+    @classmethod
+    def notify(cls, gid):
+        cls._updated = 0
+        if event := cls._events.get(gid):
+            event.set()
+
+    @classmethod
+    async def wait(cls, gid, timeout):
+        event = cls._events.setdefault(gid, Event())
+        with suppress(TimeoutError):
+            await wait_for(event.wait(), timeout)
+        event.clear()
+
+    @classmethod
+    def forget(cls, gid):
+        cls._events.pop(gid, None)
@@ -1,5 +1,5 @@
 import re
-from asyncio import gather, sleep
+from asyncio import Semaphore, gather, sleep
 from contextlib import suppress
 from os import path as ospath, walk
 from re import sub
@@ -13,7 +13,7 @@ from pyrogram.enums import ChatAction
 from .. import (
     DOWNLOAD_DIR,
     LOGGER,
-    cpu_eater_lock,
+    cpu_no,
     excluded_extensions,
     intervals,
     multi_tags,
@@ -27,6 +27,7 @@ from .ext_utils.bot_utils import get_size_bytes, new_task, sync_to_async
 from .ext_utils.bulk_links import extract_bulk_links
 from .ext_utils.files_utils import (
     SevenZ,
+    MAX_EXTRACT_JOBS,
     get_base_name,
     get_path_size,
     is_archive,
@@ -43,6 +44,7 @@ from .ext_utils.links_utils import (
 )
 from .ext_utils.media_utils import (
     FFMpeg,
+    FFMpegJobs,
     create_thumb,
     get_document_type,
     take_ss,
@@ -644,24 +646,36 @@ class TaskConfig:
         LOGGER.info(f"Extracting: {self.name}")
         async with task_dict_lock:
             task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Extract")
+        jobs = max(1, min(MAX_EXTRACT_JOBS, cpu_no, len(self.files_to_proceed)))
+        semaphore = Semaphore(jobs)
+
+        async def extract(f_path, t_path):
+            async with semaphore:
+                if self.is_cancelled:
+                    return False
+                self.proceed_count += 1
+                if not self.is_file:
+                    self.subname = ospath.basename(f_path)
+                return await sevenz.extract(f_path, t_path, pswd, jobs)
+
         for dirpath, _, files in await sync_to_async(
             walk, self.up_dir or self.dir, topdown=False
         ):
-            code = 0
+            if self.is_cancelled:
+                return False
+            archives = []
             for file_ in files:
-                if self.is_cancelled:
-                    return False
                 if (
                     is_first_archive_split(file_)
                     or is_archive(file_)
                     and not file_.strip().lower().endswith(".rar")
                 ):
-                    self.proceed_count += 1
                     f_path = ospath.join(dirpath, file_)
                     t_path = get_base_name(f_path) if self.is_file else dirpath
-                    if not self.is_file:
-                        self.subname = file_
-                    code = await sevenz.extract(f_path, t_path, pswd)
+                    archives.append((f_path, t_path))
+            # archives in one directory are independent, extract them together
+            codes = await gather(*(extract(*archive) for archive in archives))
+            code = next((code for code in codes if code != 0), 0)
             if self.is_cancelled:
                 return code
             if code == 0:
@@ -680,136 +694,141 @@ class TaskConfig:
             [part.strip() for part in split(item) if part.strip()]
             for item in self.ffmpeg_cmds
         ]
-        try:
-            ffmpeg = FFMpeg(self)
-            for ffmpeg_cmd in cmds:
-                self.proceed_count = 0
-                cmd = [
-                    BinConfig.FFMPEG_NAME,
-                    "-hide_banner",
-                    "-loglevel",
-                    "error",
-                    "-progress",
-                    "pipe:1",
-                ] + ffmpeg_cmd
-                if "-del" in cmd:
-                    cmd.remove("-del")
-                    delete_files = True
-                else:
-                    delete_files = False
-                index = cmd.index("-i")
-                input_file = cmd[index + 1]
-                if input_file.strip().endswith(".video"):
-                    ext = "video"
-                elif input_file.strip().endswith(".audio"):
-                    ext = "audio"
-                elif "." not in input_file:
-                    ext = "all"
-                else:
-                    ext = ospath.splitext(input_file)[-1].lower()
-                if await aiopath.isfile(dl_path):
-                    is_video, is_audio, _ = await get_document_type(dl_path)
-                    if not is_video and not is_audio:
-                        break
-                    elif is_video and ext == "audio":
-                        break
-                    elif is_audio and not is_video and ext == "video":
-                        break
-                    elif ext not in [
-                        "all",
-                        "audio",
-                        "video",
-                    ] and not dl_path.strip().lower().endswith(ext):
-                        break
-                    new_folder = ospath.splitext(dl_path)[0]
-                    if await aiopath.isfile(new_folder):
-                        new_folder = f"{new_folder}_temp"
-                    name = ospath.basename(dl_path)
-                    await makedirs(new_folder, exist_ok=True)
-                    file_path = f"{new_folder}/{name}"
-                    await move(dl_path, file_path)
-                    if not checked:
-                        checked = True
-                        async with task_dict_lock:
-                            task_dict[self.mid] = FFmpegStatus(
-                                self, ffmpeg, gid, "FFmpeg"
-                            )
-                        self.progress = False
-                        await cpu_eater_lock.acquire()
-                        self.progress = True
-                    LOGGER.info(f"Running ffmpeg cmd for: {file_path}")
-                    var_cmd = cmd.copy()
-                    var_cmd[index + 1] = file_path
-                    self.subsize = self.size
-                    res = await ffmpeg.ffmpeg_cmds(var_cmd, file_path)
-                    if res:
-                        if delete_files:
-                            await remove(file_path)
-                            if len(await listdir(new_folder)) == 1:
-                                folder = new_folder.rsplit("/", 1)[0]
-                                self.name = ospath.basename(res[0])
-                                if self.name.startswith("ffmpeg"):
-                                    self.name = self.name.split(".", 1)[-1]
-                                dl_path = ospath.join(folder, self.name)
-                                await move(res[0], dl_path)
-                                await rmtree(new_folder)
-                            else:
-                                dl_path = new_folder
-                                self.name = new_folder.rsplit("/", 1)[-1]
+        ffmpeg = FFMpegJobs(self)
+        for ffmpeg_cmd in cmds:
+            self.proceed_count = 0
+            cmd = [
+                BinConfig.FFMPEG_NAME,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-progress",
+                "pipe:1",
+            ] + ffmpeg_cmd
+            if "-del" in cmd:
+                cmd.remove("-del")
+                delete_files = True
+            else:
+                delete_files = False
+            index = cmd.index("-i")
+            input_file = cmd[index + 1]
+            if input_file.strip().endswith(".video"):
+                ext = "video"
+            elif input_file.strip().endswith(".audio"):
+                ext = "audio"
+            elif "." not in input_file:
+                ext = "all"
+            else:
+                ext = ospath.splitext(input_file)[-1].lower()
+            if await aiopath.isfile(dl_path):
+                is_video, is_audio, _ = await get_document_type(dl_path)
+                if not is_video and not is_audio:
+                    break
+                elif is_video and ext == "audio":
+                    break
+                elif is_audio and not is_video and ext == "video":
+                    break
+                elif ext not in [
+                    "all",
+                    "audio",
+                    "video",
+                ] and not dl_path.strip().lower().endswith(ext):
+                    break
+                new_folder = ospath.splitext(dl_path)[0]
+                if await aiopath.isfile(new_folder):
+                    new_folder = f"{new_folder}_temp"
+                name = ospath.basename(dl_path)
+                await makedirs(new_folder, exist_ok=True)
+                file_path = f"{new_folder}/{name}"
+                await move(dl_path, file_path)
+                if not checked:
+                    checked = True
+                    async with task_dict_lock:
+                        task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "FFmpeg")
+                LOGGER.info(f"Running ffmpeg cmd for: {file_path}")
+                var_cmd = cmd.copy()
+                var_cmd[index + 1] = file_path
+                self.subsize = self.size
+                self.progress = False
+                ffmpeg.reset(self.size)
+                async with ffmpeg.job(self.size) as job:
+                    res = await job.ffmpeg_cmds(var_cmd, file_path)
+                if res:
+                    if delete_files:
+                        await remove(file_path)
+                        if len(await listdir(new_folder)) == 1:
+                            folder = new_folder.rsplit("/", 1)[0]
+                            self.name = ospath.basename(res[0])
+                            if self.name.startswith("ffmpeg"):
+                                self.name = self.name.split(".", 1)[-1]
+                            dl_path = ospath.join(folder, self.name)
+                            await move(res[0], dl_path)
+                            await rmtree(new_folder)
                         else:
                             dl_path = new_folder
                             self.name = new_folder.rsplit("/", 1)[-1]
                     else:
-                        await move(file_path, dl_path)
-                        await rmtree(new_folder)
+                        dl_path = new_folder
+                        self.name = new_folder.rsplit("/", 1)[-1]
                 else:
-                    for dirpath, _, files in await sync_to_async(
-                        walk, dl_path, topdown=False
-                    ):
-                        for file_ in files:
-                            var_cmd = cmd.copy()
-                            if self.is_cancelled:
-                                return False
-                            f_path = ospath.join(dirpath, file_)
-                            is_video, is_audio, _ = await get_document_type(f_path)
-                            if not is_video and not is_audio:
-                                continue
-                            elif is_video and ext == "audio":
-                                continue
-                            elif is_audio and not is_video and ext == "video":
-                                continue
-                            elif ext not in [
-                                "all",
-                                "audio",
-                                "video",
-                            ] and not f_path.strip().lower().endswith(ext):
-                                continue
-                            self.proceed_count += 1
-                            var_cmd[index + 1] = f_path
-                            if not checked:
-                                checked = True
-                                async with task_dict_lock:
-                                    task_dict[self.mid] = FFmpegStatus(
-                                        self, ffmpeg, gid, "FFmpeg"
-                                    )
-                                self.progress = False
-                                await cpu_eater_lock.acquire()
-                                self.progress = True
-                            LOGGER.info(f"Running ffmpeg cmd for: {f_path}")
-                            self.subsize = await get_path_size(f_path)
-                            self.subname = file_
-                            res = await ffmpeg.ffmpeg_cmds(var_cmd, f_path)
-                            if res and delete_files:
-                                await remove(f_path)
-                                if len(res) == 1:
-                                    file_name = ospath.basename(res[0])
-                                    if file_name.startswith("ffmpeg"):
-                                        newname = file_name.split(".", 1)[-1]
-                                        newres = ospath.join(dirpath, newname)
-                                        await move(res[0], newres)
-        finally:
-            if checked:
-                cpu_eater_lock.release()
+                    await move(file_path, dl_path)
+                    await rmtree(new_folder)
+            else:
+                to_proceed = []
+                for dirpath, _, files in await sync_to_async(
+                    walk, dl_path, topdown=False
+                ):
+                    for file_ in files:
+                        if self.is_cancelled:
+                            return False
+                        f_path = ospath.join(dirpath, file_)
+                        is_video, is_audio, _ = await get_document_type(f_path)
+                        if not is_video and not is_audio:
+                            continue
+                        elif is_video and ext == "audio":
+                            continue
+                        elif is_audio and not is_video and ext == "video":
+                            continue
+                        elif ext not in [
+                            "all",
+                            "audio",
+                            "video",
+                        ] and not f_path.strip().lower().endswith(ext):
+                            continue
+                        to_proceed.append(
+                            (dirpath, file_, f_path, await get_path_size(f_path))
+                        )
+                if not to_proceed:
+                    continue
+                if not checked:
+                    checked = True
+                    async with task_dict_lock:
+                        task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "FFmpeg")
+                self.progress = False
+                ffmpeg.reset(sum(item[3] for item in to_proceed))
+
+                async def _run_cmd(dirpath, file_, f_path, f_size):
+                    var_cmd = cmd.copy()
+                    var_cmd[index + 1] = f_path
+                    async with ffmpeg.job(f_size) as job:
+                        if self.is_cancelled:
+                            return
+                        self.proceed_count += 1
+                        self.subname = file_
+                        LOGGER.info(f"Running ffmpeg cmd for: {f_path}")
+                        res = await job.ffmpeg_cmds(var_cmd, f_path)
+                    if res and delete_files:
+                        await remove(f_path)
+                        if len(res) == 1:
+                            file_name = ospath.basename(res[0])
+                            if file_name.startswith("ffmpeg"):
+                                newname = file_name.split(".", 1)[-1]
+                                newres = ospath.join(dirpath, newname)
+                                await move(res[0], newres)
+
+                await gather(*(_run_cmd(*item) for item in to_proceed))
+                if self.is_cancelled:
+                    return False
         return dl_path
 
     async def substitute(self, dl_path):
@@ -958,32 +977,48 @@ class TaskConfig:
         del all_files
 
         if self.files_to_proceed:
-            ffmpeg = FFMpeg(self)
+            if self.is_file:
+                sizes = {dl_path: self.size}
+            else:
+                sizes = {
+                    f_path: await get_path_size(f_path)
+                    for f_path in self.files_to_proceed
+                }
+            ffmpeg = FFMpegJobs(self, sum(sizes.values()))
             async with task_dict_lock:
                 task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Convert")
             self.progress = False
-            async with cpu_eater_lock:
-                self.progress = True
-                for f_path, f_type in self.files_to_proceed.items():
+
+            async def _convert(f_path, f_type):
+                async with ffmpeg.job(sizes[f_path]) as job:
+                    if self.is_cancelled:
+                        return None
                     self.proceed_count += 1
                     LOGGER.info(f"Converting: {f_path}")
-                    if self.is_file:
-                        self.subsize = self.size
-                    else:
-                        self.subsize = await get_path_size(f_path)
+                    if not self.is_file:
                         self.subname = ospath.basename(f_path)
                     if f_type == "video":
-                        res = await ffmpeg.convert_video(f_path, vext)
+                        res = await job.convert_video(f_path, vext)
                     else:
-                        res = await ffmpeg.convert_audio(f_path, aext)
-                    if res:
-                        try:
-                            await remove(f_path)
-                        except Exception:
-                            self.is_cancelled = True
-                            return False
-                        if self.is_file:
-                            return res
+                        res = await job.convert_audio(f_path, aext)
+                if res:
+                    try:
+                        await remove(f_path)
+                    except Exception:
+                        self.is_cancelled = True
+                        return None
+                return res
+
+            results = await gather(
+                *(
+                    _convert(f_path, f_type)
+                    for f_path, f_type in self.files_to_proceed.items()
+                )
+            )
+            if self.is_cancelled:
+                return False
+            if self.is_file and results[0]:
+                return results[0]
         return dl_path
 
     async def generate_sample_video(self, dl_path, gid):
@@ -1008,33 +1043,47 @@ class TaskConfig:
                     if (await get_document_type(f_path))[0]:
                         self.files_to_proceed[f_path] = file_
         if self.files_to_proceed:
-            ffmpeg = FFMpeg(self)
+            if self.is_file:
+                sizes = {dl_path: self.size}
+            else:
+                sizes = {
+                    f_path: await get_path_size(f_path)
+                    for f_path in self.files_to_proceed
+                }
+            ffmpeg = FFMpegJobs(self, sum(sizes.values()))
             async with task_dict_lock:
                 task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Sample Video")
+            LOGGER.info(f"Creating Sample video: {self.name}")
             self.progress = False
-            async with cpu_eater_lock:
-                self.progress = True
-                LOGGER.info(f"Creating Sample video: {self.name}")
-                for f_path, file_ in self.files_to_proceed.items():
+
+            async def _sample(f_path, file_):
+                async with ffmpeg.job(sizes[f_path]) as job:
+                    if self.is_cancelled:
+                        return None
                     self.proceed_count += 1
-                    if self.is_file:
-                        self.subsize = self.size
-                    else:
-                        self.subsize = await get_path_size(f_path)
+                    if not self.is_file:
                         self.subname = file_
-                    res = await ffmpeg.sample_video(
+                    return await job.sample_video(
                         f_path, sample_duration, part_duration
                     )
-                    if res and self.is_file:
-                        new_folder = ospath.splitext(f_path)[0]
-                        if await aiopath.isfile(new_folder):
-                            new_folder = f"{new_folder}_temp"
-                        await makedirs(new_folder, exist_ok=True)
-                        await gather(
-                            move(f_path, f"{new_folder}/{file_}"),
-                            move(res, f"{new_folder}/SAMPLE.{file_}"),
-                        )
-                        return new_folder
+
+            results = await gather(
+                *(
+                    _sample(f_path, file_)
+                    for f_path, file_ in self.files_to_proceed.items()
+                )
+            )
+            for (f_path, file_), res in zip(self.files_to_proceed.items(), results):
+                if res and self.is_file:
+                    new_folder = ospath.splitext(f_path)[0]
+                    if await aiopath.isfile(new_folder):
+                        new_folder = f"{new_folder}_temp"
+                    await makedirs(new_folder, exist_ok=True)
+                    await gather(
+                        move(f_path, f"{new_folder}/{file_}"),
+                        move(res, f"{new_folder}/SAMPLE.{file_}"),
+                    )
+                    return new_folder
         return dl_path
 
     async def proceed_compress(self, dl_path, gid):
@@ -1,8 +1,8 @@
 from aioshutil import rmtree as aiormtree, move
-from asyncio import create_subprocess_exec, sleep, wait_for
+from asyncio import Lock, create_subprocess_exec, sleep, wait_for
 from asyncio.subprocess import PIPE
 from contextlib import suppress
-from psutil import disk_usage
+from psutil import disk_usage, virtual_memory
 from os import path as ospath, readlink, walk
 from re import I, escape, search as re_search, split as re_split
 
@@ -17,7 +17,7 @@ from aiofiles.os import (
 )
 from magic import Magic
 
-from ... import DOWNLOAD_DIR, LOGGER
+from ... import DOWNLOAD_DIR, LOGGER, cpu_no
 from ...core.torrent_manager import TorrentManager
 from .bot_utils import cmd_exec, sync_to_async
 from .exceptions import NotSupportedExtractionArchive
@@ -96,9 +96,23 @@ FIRST_SPLIT_REGEX = (
 
 SPLIT_REGEX = r"\.r\d+$|\.7z\.\d+$|\.z\d+$|\.zip\.\d+$|\.part\d+\.rar$"
 
+MAX_EXTRACT_JOBS = 4
+SEVENZ_THREAD_MEMORY = 256 * 1024 * 1024
+
+
+def is_archive_volume(file, first=False):
+    # name.tar.001 style volumes, 7z opens these as one stream
+    if not (match := re_search(r"\.(\d{3,})$", file.strip())):
+        return False
+    if first and int(match[1]) != 1:
+        return False
+    return is_archive(file.strip()[: match.start()])
+
 
 def is_first_archive_split(file):
-    return bool(re_search(FIRST_SPLIT_REGEX, file.lower(), I))
+    return bool(re_search(FIRST_SPLIT_REGEX, file.lower(), I)) or is_archive_volume(
+        file, True
+    )
 
 
 def is_archive(file):
@@ -106,7 +120,12 @@ def is_archive(file):
 
 
 def is_archive_split(file):
-    return bool(re_search(SPLIT_REGEX, file.lower(), I))
+    return bool(re_search(SPLIT_REGEX, file.lower(), I)) or is_archive_volume(file)
+
+
+def get_sevenz_threads(jobs=1):
+    available = virtual_memory().available // SEVENZ_THREAD_MEMORY
+    return max(1, min(cpu_no // jobs, available // jobs))
 
 
 async def clean_target(opath):
@@ -242,7 +261,7 @@ async def move_and_merge(source, destination, mid):
             await move(src_path, dest_path)
 
 
-async def join_files(opath):
+async def join_files(opath, skip_archives=False):
     files = await listdir(opath)
     results = []
     exists = False
@@ -252,6 +271,9 @@ async def join_files(opath):
         ) not in ["application/x-7z-compressed", "application/zip"]:
             exists = True
             final_name = file_.rsplit(".", 1)[0]
+            if skip_archives and is_archive(final_name):
+                LOGGER.info(f"Leaving {final_name} volumes for extraction")
+                continue
             fpath = f"{opath}/{final_name}"
             cmd = f'cat "{fpath}."* > "{fpath}"'
             _, stderr, code = await cmd_exec(cmd, True)
@@ -304,40 +326,58 @@ async def split_file(f_path, split_size, listener):
 class SevenZ:
     def __init__(self, listener):
         self._listener = listener
-        self._processed_bytes = 0
-        self._percentage = "0%"
+        self._jobs = {}
+        # finished jobs leave _jobs, their bytes stay counted here
+        self._done_bytes = 0
+        self._merge_lock = Lock()
 
     @property
     def processed_bytes(self):
-        return self._processed_bytes
+        return self._done_bytes + sum(processed for _, processed in self._jobs.values())
 
     @property
-    def progress(self):
-        return self._percentage
+    def _total_size(self):
+        return self._done_bytes + sum(size for size, _ in self._jobs.values())
 
-    async def _sevenz_progress(self):
+    @property
+    def progress(self):
+        total = self._total_size
+        if not total:
+            return "0%"
+        return f"{round(self.processed_bytes * 100 / total)}%"
+
+    def _set_job(self, proc, size=None, processed=None):
+        job = self._jobs.setdefault(proc, [0, 0])
+        if size is not None:
+            job[0] = size
+        if processed is not None:
+            job[1] = processed
+        self._listener.subsize = self._total_size
+
+    async def _sevenz_progress(self, proc):
         pattern = r"(\d+)\s+bytes|Total Physical Size\s*=\s*(\d+)"
+        self._set_job(proc)
         while not (
-            self._listener.subproc.returncode is not None
+            proc.returncode is not None
             or self._listener.is_cancelled
-            or self._listener.subproc.stdout.at_eof()
+            or proc.stdout.at_eof()
         ):
             try:
-                line = await wait_for(self._listener.subproc.stdout.readline(), 2)
+                line = await wait_for(proc.stdout.readline(), 2)
             except Exception:
                 break
             line = line.decode().strip()
             if match := re_search(pattern, line):
-                self._listener.subsize = int(match[1] or match[2])
+                self._set_job(proc, size=int(match[1] or match[2]))
             await sleep(0.05)
         s = b""
         while not (
             self._listener.is_cancelled
-            or self._listener.subproc.returncode is not None
-            or self._listener.subproc.stdout.at_eof()
+            or proc.returncode is not None
+            or proc.stdout.at_eof()
         ):
             try:
-                char = await wait_for(self._listener.subproc.stdout.read(1), 60)
+                char = await wait_for(proc.stdout.read(1), 60)
             except Exception:
                 break
             if not char:
@@ -345,28 +385,67 @@ class SevenZ:
             s += char
             if char == b"%":
                 try:
-                    self._percentage = s.decode().rsplit(" ", 1)[-1].strip()
-                    self._processed_bytes = (
-                        int(self._percentage.strip("%")) / 100
-                    ) * self._listener.subsize
+                    percentage = s.decode().rsplit(" ", 1)[-1].strip()
+                    self._set_job(
+                        proc,
+                        processed=int(percentage.strip("%"))
+                        / 100
+                        * self._jobs[proc][0],
+                    )
                 except Exception:
-                    self._processed_bytes = 0
-                    self._percentage = "0%"
+                    self._set_job(proc, processed=0)
                 s = b""
             await sleep(0.05)
 
-        self._processed_bytes = 0
-        self._percentage = "0%"
+    async def _run(self, cmd):
+        proc = self._listener.subproc = await create_subprocess_exec(
+            *cmd, stdout=PIPE, stderr=PIPE
+        )
+        try:
+            await self._sevenz_progress(proc)
+            if self._listener.is_cancelled:
+                # siblings of the killed process must stop too
+                with suppress(Exception):
+                    proc.kill()
+            _, stderr = await proc.communicate()
+        finally:
+            if job := self._jobs.pop(proc, None):
+                self._done_bytes += job[0]
+            self._listener.subsize = self._total_size
+        return proc.returncode, stderr
+
+    async def _merge_extracted(self, source, destination):
+        # same renaming as -aot, for parallel jobs sharing one target
+        for item in await listdir(source):
+            src_path = ospath.join(source, item)
+            dest_path = ospath.join(destination, item)
+            if await aiopath.isdir(src_path) and await aiopath.isdir(dest_path):
+                await self._merge_extracted(src_path, dest_path)
+                continue
+            name, ext = ospath.splitext(item)
+            index = 1
+            while await aiopath.exists(dest_path):
+                dest_path = ospath.join(destination, f"{name}_{index}{ext}")
+                index += 1
+            await move(src_path, dest_path)
 
-    async def extract(self, f_path, t_path, pswd):
+    async def extract(self, f_path, t_path, pswd, jobs=1):
+        # parallel jobs extract into their own dir, -aot can't guard files
+        # that another 7z process is writing at the same time
+        o_path = (
+            ospath.join(t_path, f".extract_{ospath.basename(f_path)}")
+            if jobs > 1
+            else t_path
+        )
         cmd = [
             "7z",
             "x",
             f"-p{pswd}",
             f_path,
-            f"-o{t_path}",
+            f"-o{o_path}",
             "-aot",
             "-xr!@PaxHeader",
+            f"-mmt{get_sevenz_threads(jobs)}",
             "-bsp1",
             "-bse1",
             "-bb3",
@@ -375,14 +454,14 @@ class SevenZ:
             del cmd[2]
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *cmd,
-            stdout=PIPE,
-            stderr=PIPE,
-        )
-        await self._sevenz_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        try:
+            code, stderr = await self._run(cmd)
+            if code == 0 and o_path != t_path and not self._listener.is_cancelled:
+                async with self._merge_lock:
+                    await self._merge_extracted(o_path, t_path)
+        finally:
+            if o_path != t_path:
+                await aiormtree(o_path, ignore_errors=True)
         if self._listener.is_cancelled:
             return False
         if code == -9:
@@ -411,6 +490,7 @@ class SevenZ:
             f"-p{pswd}",
             up_path,
             dl_path,
+            f"-mmt{get_sevenz_threads()}",
             "-bsp1",
             "-bse1",
             "-bb3",
@@ -426,12 +506,7 @@ class SevenZ:
             LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}")
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *cmd, stdout=PIPE, stderr=PIPE
-        )
-        await self._sevenz_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        code, stderr = await self._run(cmd)
         if self._listener.is_cancelled:
             return False
         if code == -9:
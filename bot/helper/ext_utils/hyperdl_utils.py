@@ -1,26 +1,48 @@
 from asyncio import (
     CancelledError,
     create_task,
-    gather,
     sleep,
+    wait,
     wait_for,
     TimeoutError as AsyncTimeoutError,
     Event,
+    Lock,
 )
+from collections import OrderedDict
+from contextlib import aclosing, suppress
 from datetime import datetime
-from math import ceil, floor
 from mimetypes import guess_extension
-from os import path as ospath
+from json import dump, load
+from os import (
+    O_CREAT,
+    O_RDWR,
+    close,
+    fsync,
+    ftruncate,
+    listdir,
+    makedirs as osmakedirs,
+    open as osopen,
+    path as ospath,
+    posix_fallocate,
+    pwrite,
+    remove as osremove,
+    replace,
+)
 from pathlib import Path
 from re import sub
 from sys import argv
 from time import time
 
-from aiofiles import open as aiopen
 from aiofiles.os import makedirs, remove
 from aioshutil import move
 from pyrogram import StopTransmission, raw, utils
-from pyrogram.errors import AuthBytesInvalid, FloodWait
+from pyrogram.errors import (
+    AuthBytesInvalid,
+    FileReferenceExpired,
+    FileReferenceInvalid,
+    FloodWait,
+    RPCError,
+)
 from pyrogram.file_id import PHOTO_TYPES, FileId, FileType, ThumbnailSource
 from pyrogram.session import Auth, Session
 from pyrogram.session.internals import MsgId
@@ -28,6 +50,188 @@ from pyrogram.session.internals import MsgId
 from ... import LOGGER
 from ...core.config_manager import Config
 from ...core.tg_client import TgClient
+from .bot_utils import sync_to_async
+
+PART_RETRY_ROUNDS = 3
+RESUME_DIR = "/usr/src/app/hyperdl/"
+RESUME_TTL = 2 * 24 * 60 * 60
+MANIFEST_INTERVAL = 5
+CONTROL_INTERVAL = 3
+MAX_CHUNK_SIZE = 1024 * 1024
+MIN_CHUNK_SIZE = 128 * 1024
+MIN_PART_SIZE = 4 * MAX_CHUNK_SIZE
+
+FILE_REF_TTL = 45 * 60
+FILE_REF_CACHE_SIZE = 512
+SESSION_IDLE = 10 * 60
+SESSION_CHECK_AFTER = 60
+
+client_speeds = {}
+# resume keys of downloads running in this process
+active_resumes = set()
+
+
+class FileRefCache:
+    def __init__(self, max_size=FILE_REF_CACHE_SIZE, ttl=FILE_REF_TTL):
+        self._entries = OrderedDict()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or time() - entry[1] > self.ttl:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, file_ref):
+        self._entries[key] = (file_ref, time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+file_refs = FileRefCache()
+
+
+class PooledSession:
+    __slots__ = ("checked", "last_used", "refs", "session")
+
+    def __init__(self, session):
+        self.session = session
+        self.refs = 0
+        self.last_used = time()
+        self.checked = time()
+
+
+class MediaSessionPool:
+    def __init__(self):
+        self._sessions = {}
+        self._locks = {}
+        self._janitor = None
+
+    @staticmethod
+    async def _create(client, dc_id, max_retries=3):
+        retries = 0
+        while retries < max_retries:
+            try:
+                if dc_id != await client.storage.dc_id():
+                    media_session = Session(
+                        client,
+                        dc_id,
+                        await Auth(
+                            client, dc_id, await client.storage.test_mode()
+                        ).create(),
+                        await client.storage.test_mode(),
+                        is_media=True,
+                    )
+                    await media_session.start()
+
+                    for _ in range(6):
+                        exported_auth = await client.invoke(
+                            raw.functions.auth.ExportAuthorization(dc_id=dc_id)
+                        )
+
+                        try:
+                            await media_session.invoke(
+                                raw.functions.auth.ImportAuthorization(
+                                    id=exported_auth.id, bytes=exported_auth.bytes
+                                )
+                            )
+                            break
+                        except AuthBytesInvalid:
+                            await sleep(1)
+                    else:
+                        await media_session.stop()
+                        raise AuthBytesInvalid
+                else:
+                    media_session = Session(
+                        client,
+                        dc_id,
+                        await client.storage.auth_key(),
+                        await client.storage.test_mode(),
+                        is_media=True,
+                    )
+                    await media_session.start()
+
+                return media_session
+
+            except (RPCError, OSError, AsyncTimeoutError):
+                retries += 1
+                await sleep(1)
+
+        raise ValueError(f"Failed to create media session after {max_retries} attempts")
+
+    @staticmethod
+    async def _is_alive(session):
+        try:
+            await wait_for(
+                session.invoke(raw.functions.Ping(ping_id=MsgId())), timeout=10
+            )
+            return True
+        except (RPCError, OSError, AsyncTimeoutError):
+            return False
+
+    async def _stop(self, key):
+        if entry := self._sessions.pop(key, None):
+            with suppress(Exception):
+                await entry.session.stop()
+
+    async def acquire(self, client, dc_id):
+        key = (client, dc_id)
+        async with self._locks.setdefault(key, Lock()):
+            entry = self._sessions.get(key)
+            if entry and time() - entry.checked > SESSION_CHECK_AFTER:
+                if await self._is_alive(entry.session):
+                    entry.checked = time()
+                else:
+                    LOGGER.warning(f"Dropping dead media session for DC {dc_id}")
+                    await self._stop(key)
+                    entry = None
+            if entry is None:
+                entry = self._sessions[key] = PooledSession(
+                    await self._create(client, dc_id)
+                )
+            entry.refs += 1
+        if self._janitor is None or self._janitor.done():
+            self._janitor = create_task(self._evict_idle())
+        return entry.session
+
+    def release(self, client, dc_id, failed=False):
+        if entry := self._sessions.get((client, dc_id)):
+            entry.refs = max(0, entry.refs - 1)
+            entry.last_used = time()
+            if failed:
+                entry.checked = 0
+
+    async def _evict_idle(self):
+        while self._sessions:
+            await sleep(SESSION_CHECK_AFTER)
+            now = time()
+            for key, entry in list(self._sessions.items()):
+                if not entry.refs and now - entry.last_used > SESSION_IDLE:
+                    await self._stop(key)
+                    self._locks.pop(key, None)
+
+    async def stop_all(self):
+        for key in list(self._sessions):
+            await self._stop(key)
+        self._locks.clear()
+
+
+media_sessions = MediaSessionPool()
 
 
 class HyperTGDownload:
@@ -39,16 +243,27 @@ class HyperTGDownload:
         self.download_dir = "downloads/"
         self.directory = None
         self.num_parts = Config.HYPER_THREADS or max(8, len(self.clients))
-        self.cache_file_ref = {}
-        self.cache_last_access = {}
-        self.cache_max_size = 100
+        self.max_parts = Config.HYPER_THREADS or max(16, 4 * len(self.clients))
         self._processed_bytes = 0
+        self._part_progress = []
+        self._completed = bytearray()
+        self._fd = None
+        self._ranges = []
+        self._claimed = set()
+        self._workers = {}
+        self._parallel = 0
+        self._max_parallel = 0
+        self._flood_waits = 0
+        self._timeouts = 0
+        self._flood_until = {}
+        self._client_bytes = {}
+        self.dc_id = 0
+        self.file_unique_id = ""
+        self.resume_key = ""
         self.file_size = 0
-        self.chunk_size = 1024 * 1024
+        self.chunk_size = MAX_CHUNK_SIZE
         self.file_name = ""
         self._cancel_event = Event()
-        self.session_pool = {}
-        create_task(self._clean_cache())
 
     @staticmethod
     async def get_media_type(message):
@@ -68,15 +283,6 @@ class HyperTGDownload:
                 return media
         raise ValueError("This message doesn't contain any downloadable media")
 
-    def _update_cache(self, index, file_ref):
-        self.cache_file_ref[index] = file_ref
-        self.cache_last_access[index] = time()
-
-        if len(self.cache_file_ref) > self.cache_max_size:
-            oldest = sorted(self.cache_last_access.items(), key=lambda x: x[1])[0][0]
-            del self.cache_file_ref[oldest]
-            del self.cache_last_access[oldest]
-
     async def get_specific_file_ref(self, mid, client, max_retries=3):
         retries = 0
         last_error = None
@@ -99,86 +305,14 @@ class HyperTGDownload:
             f"Bot needs Admin access in Chat or message may be deleted. Error: {last_error}"
         )
 
-    async def get_file_id(self, client, index) -> FileId:
-        if index not in self.cache_file_ref:
+    async def get_file_id(self, client, refresh=False) -> FileId:
+        key = (client, self.dump_chat, self.message.id)
+        if refresh:
+            file_refs.invalidate(key)
+        if (file_ref := file_refs.get(key)) is None:
             file_ref = await self.get_specific_file_ref(self.message.id, client)
-            self._update_cache(index, file_ref)
-        else:
-            self.cache_last_access[index] = time()
-        return self.cache_file_ref[index]
-
-    async def _clean_cache(self):
-        while True:
-            await sleep(15 * 60)
-            current_time = time()
-            expired_keys = [
-                k
-                for k, v in self.cache_last_access.items()
-                if current_time - v > 45 * 60
-            ]
-
-            for key in expired_keys:
-                if key in self.cache_file_ref:
-                    del self.cache_file_ref[key]
-                if key in self.cache_last_access:
-                    del self.cache_last_access[key]
-
-    async def generate_media_session(self, client, file_id, index, max_retries=3):
-        session_key = (index, file_id.dc_id)
-
-        if session_key in self.session_pool:
-            return self.session_pool[session_key]
-
-        retries = 0
-        while retries < max_retries:
-            try:
-                if file_id.dc_id != await client.storage.dc_id():
-                    media_session = Session(
-                        client,
-                        file_id.dc_id,
-                        await Auth(
-                            client, file_id.dc_id, await client.storage.test_mode()
-                        ).create(),
-                        await client.storage.test_mode(),
-                        is_media=True,
-                    )
-                    await media_session.start()
-
-                    for _ in range(6):
-                        exported_auth = await client.invoke(
-                            raw.functions.auth.ExportAuthorization(dc_id=file_id.dc_id)
-                        )
-
-                        try:
-                            await media_session.invoke(
-                                raw.functions.auth.ImportAuthorization(
-                                    id=exported_auth.id, bytes=exported_auth.bytes
-                                )
-                            )
-                            break
-                        except AuthBytesInvalid:
-                            await sleep(1)
-                    else:
-                        await media_session.stop()
-                        raise AuthBytesInvalid
-                else:
-                    media_session = Session(
-                        client,
-                        file_id.dc_id,
-                        await client.storage.auth_key(),
-                        await client.storage.test_mode(),
-                        is_media=True,
-                    )
-                    await media_session.start()
-
-                self.session_pool[session_key] = media_session
-                return media_session
-
-            except Exception:
-                retries += 1
-                await sleep(1)
-
-        raise ValueError(f"Failed to create media session after {max_retries} attempts")
+            file_refs.put(key, file_ref)
+        return file_ref
 
     @staticmethod
     async def get_location(file_id: FileId):
@@ -219,19 +353,120 @@ class HyperTGDownload:
                 thumb_size=file_id.thumbnail_size,
             )
 
+    def _pick_client(self):
+        now = time()
+        healthy = [
+            i for i in self.clients if self._flood_until.get(i, 0) <= now
+        ] or list(self.clients)
+        return min(
+            healthy,
+            key=lambda i: (
+                self.work_loads[i],
+                -client_speeds.get((i, self.dc_id), 0),
+            ),
+        )
+
+    @property
+    def hyper_params(self):
+        if not self._parallel:
+            return ""
+        now = time()
+        healthy = sum(1 for i in self.clients if self._flood_until.get(i, 0) <= now)
+        return (
+            f"{self._parallel}/{self._max_parallel} parts | "
+            f"{self.chunk_size // 1024} KiB chunks | "
+            f"{healthy}/{len(self.clients)} bots on DC {self.dc_id}"
+        )
+
+    async def _adapt_parallelism(self):
+        last_bytes = self._processed_bytes
+        last_speed = 0.0
+        while not self._cancel_event.is_set():
+            await sleep(CONTROL_INTERVAL)
+            speed = (self._processed_bytes - last_bytes) / CONTROL_INTERVAL
+            last_bytes = self._processed_bytes
+            floods, self._flood_waits = self._flood_waits, 0
+            timeouts, self._timeouts = self._timeouts, 0
+
+            for index in self.clients:
+                key = (index, self.dc_id)
+                rate = self._client_bytes.pop(index, 0) / CONTROL_INTERVAL
+                client_speeds[key] = client_speeds.get(key, rate) * 0.7 + rate * 0.3
+
+            if timeouts:
+                self.chunk_size = max(MIN_CHUNK_SIZE, self.chunk_size // 2)
+            elif not floods and self.chunk_size < MAX_CHUNK_SIZE:
+                self.chunk_size *= 2
+
+            if floods:
+                self._parallel = max(1, self._parallel - max(1, self._parallel // 4))
+            elif (
+                speed > last_speed * 1.1
+                and self._parallel < self._max_parallel
+                and not all(self._completed)
+            ):
+                self._parallel += 1
+                self._spawn_workers()
+            last_speed = speed
+
+    def _spawn_workers(self):
+        for worker_no in range(self._parallel):
+            task = self._workers.get(worker_no)
+            if task is None or task.done():
+                self._workers[worker_no] = create_task(self._part_worker(worker_no))
+
+    def _claim_part(self):
+        for part_index, done in enumerate(self._completed):
+            if not done and part_index not in self._claimed:
+                self._claimed.add(part_index)
+                return part_index
+
+        # steal the back half of the running range with the most bytes left
+        victim, remaining = None, 0
+        for part_index in self._claimed:
+            start, end = self._ranges[part_index]
+            left = end - start + 1 - self._part_progress[part_index]
+            if left > remaining:
+                victim, remaining = part_index, left
+        if victim is None or remaining < 2 * MIN_PART_SIZE:
+            return None
+        start, end = self._ranges[victim]
+        position = start + self._part_progress[victim]
+        split = (position + remaining // 2) // MAX_CHUNK_SIZE * MAX_CHUNK_SIZE
+        self._ranges[victim][1] = split - 1
+        self._ranges.append([split, end])
+        self._part_progress.append(0)
+        self._completed.append(0)
+        part_index = len(self._ranges) - 1
+        self._claimed.add(part_index)
+        return part_index
+
+    async def _part_worker(self, worker_no):
+        while not self._cancel_event.is_set() and worker_no < self._parallel:
+            if (part_index := self._claim_part()) is None:
+                return
+            try:
+                await self.single_part(part_index, worker_no)
+            finally:
+                self._claimed.discard(part_index)
+
     async def get_file(
         self,
         offset_bytes: int,
         first_part_cut: int,
         last_part_cut: int,
         part_count: int,
+        chunk_size: int,
         max_retries=5,
     ):
-        index = min(self.work_loads, key=self.work_loads.get)
+        index = self._pick_client()
         client = self.clients[index]
 
         self.work_loads[index] += 1
         current_retry = 0
+        ref_refreshes = 0
+        media_session = None
+        failed = False
 
         try:
             while current_retry < max_retries:
@@ -239,11 +474,11 @@ class HyperTGDownload:
                     if self._cancel_event.is_set():
                         raise CancelledError("Download cancelled")
 
-                    file_id = await self.get_file_id(client, index)
-                    media_session, location = await gather(
-                        self.generate_media_session(client, file_id, index),
-                        self.get_location(file_id),
-                    )
+                    file_id = await self.get_file_id(client)
+                    if media_session is None:
+                        session_dc = file_id.dc_id
+                        media_session = await media_sessions.acquire(client, session_dc)
+                    location = await self.get_location(file_id)
 
                     current_part = 1
                     current_offset = offset_bytes
@@ -258,7 +493,7 @@ class HyperTGDownload:
                                     raw.functions.upload.GetFile(
                                         location=location,
                                         offset=current_offset,
-                                        limit=self.chunk_size,
+                                        limit=chunk_size,
                                     ),
                                 ),
                                 timeout=30,
@@ -269,6 +504,9 @@ class HyperTGDownload:
 
                                 if not chunk:
                                     break
+                                self._client_bytes[index] = self._client_bytes.get(
+                                    index, 0
+                                ) + len(chunk)
 
                                 if part_count == 1:
                                     yield chunk[first_part_cut:last_part_cut]
@@ -280,15 +518,25 @@ class HyperTGDownload:
                                     yield chunk
 
                                 current_part += 1
-                                current_offset += self.chunk_size
-                                self._processed_bytes += len(chunk)
+                                current_offset += chunk_size
                             else:
                                 raise ValueError(f"Unexpected response: {r}")
 
+                        except (FileReferenceExpired, FileReferenceInvalid):
+                            # the cached reference is dead, fetch the message again
+                            ref_refreshes += 1
+                            if ref_refreshes > max_retries:
+                                raise
+                            file_id = await self.get_file_id(client, refresh=True)
+                            location = await self.get_location(file_id)
+                            continue
                         except (FloodWait, AsyncTimeoutError, ConnectionError) as e:
                             if isinstance(e, FloodWait):
+                                self._flood_waits += 1
+                                self._flood_until[index] = time() + e.value
                                 await sleep(e.value + 1)
                             else:
+                                self._timeouts += 1
                                 await sleep(1)
                             continue
 
@@ -299,6 +547,7 @@ class HyperTGDownload:
                     break
 
                 except (AsyncTimeoutError, ConnectionError, AttributeError):
+                    failed = True
                     current_retry += 1
                     if current_retry >= max_retries:
                         raise
@@ -306,6 +555,8 @@ class HyperTGDownload:
 
         finally:
             self.work_loads[index] -= 1
+            if media_session is not None:
+                media_sessions.release(client, session_dc, failed)
 
     async def progress_callback(self, progress, progress_args):
         if not progress:
@@ -319,123 +570,240 @@ class HyperTGDownload:
                     )
                 await sleep(1)
             except (CancelledError, StopTransmission):
+                self._cancel_event.set()
                 break
             except Exception:
                 await sleep(1)
 
-    async def single_part(self, start, end, part_index, max_retries=3):
-        until_bytes, from_bytes = min(end, self.file_size - 1), start
-
-        offset = from_bytes - (from_bytes % self.chunk_size)
-        first_part_cut = from_bytes - offset
-        last_part_cut = until_bytes % self.chunk_size + 1
-
-        part_count = ceil(until_bytes / self.chunk_size) - floor(
-            offset / self.chunk_size
-        )
-        part_file_path = ospath.join(
-            self.directory, f"{self.file_name}.temp.{part_index:02d}"
+    @staticmethod
+    def _open_temp_file(path, size):
+        fd = osopen(path, O_RDWR | O_CREAT, 0o644)
+        try:
+            posix_fallocate(fd, 0, size)
+        except OSError:
+            ftruncate(fd, size)
+        return fd
+
+    def _prune_resume_dir(self):
+        osmakedirs(RESUME_DIR, exist_ok=True)
+        now = time()
+        for name in listdir(RESUME_DIR):
+            path = ospath.join(RESUME_DIR, name)
+            with suppress(OSError):
+                if now - ospath.getmtime(path) > RESUME_TTL:
+                    osremove(path)
+
+    def _load_manifest(self, manifest_path, part_path):
+        try:
+            with open(manifest_path) as f:
+                manifest = load(f)
+            if (
+                manifest["file_id"] != self.file_unique_id
+                or manifest["size"] != self.file_size
+                or ospath.getsize(part_path) != self.file_size
+            ):
+                return False
+            ranges = [[start, end] for start, end, _ in manifest["parts"]]
+            progress = [done for _, _, done in manifest["parts"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self._ranges = ranges
+        self._part_progress = progress
+        self._completed = bytearray(
+            done >= end - start + 1 for (start, end), done in zip(ranges, progress)
         )
+        self._processed_bytes = sum(progress)
+        return True
 
+    def _save_manifest(self, manifest_path):
+        if self._fd is None:
+            return
+        manifest = {
+            "file_id": self.file_unique_id,
+            "size": self.file_size,
+            "parts": [
+                [start, end, done]
+                for (start, end), done in zip(self._ranges, self._part_progress)
+            ],
+        }
+        fsync(self._fd)
+        with open(f"{manifest_path}.tmp", "w") as f:
+            dump(manifest, f)
+        replace(f"{manifest_path}.tmp", manifest_path)
+
+    async def _manifest_saver(self, manifest_path):
+        while not self._cancel_event.is_set():
+            await sleep(MANIFEST_INTERVAL)
+            try:
+                await sync_to_async(self._save_manifest, manifest_path)
+            except OSError as e:
+                LOGGER.error(f"HyperDL manifest save failed: {e}")
+
+    async def single_part(self, part_index, worker_no=0, max_retries=3):
         for attempt in range(max_retries):
+            start, end = self._ranges[part_index]
+            from_bytes = start + self._part_progress[part_index]
+            until_bytes = min(end, self.file_size - 1)
+            if from_bytes > until_bytes:
+                break
+            chunk_size = self.chunk_size
+            offset = from_bytes - (from_bytes % chunk_size)
+            first_part_cut = from_bytes - offset
+            last_part_cut = until_bytes % chunk_size + 1
+            part_count = until_bytes // chunk_size - offset // chunk_size + 1
+
             try:
-                async with aiopen(part_file_path, "wb") as f:
-                    async for chunk in self.get_file(
-                        offset, first_part_cut, last_part_cut, part_count
-                    ):
+                position = from_bytes
+                async with aclosing(
+                    self.get_file(
+                        offset, first_part_cut, last_part_cut, part_count, chunk_size
+                    )
+                ) as stream:
+                    async for chunk in stream:
                         if self._cancel_event.is_set():
                             raise CancelledError("Download cancelled")
-                        await f.write(chunk)
-                return part_index, part_file_path
-            except (AsyncTimeoutError, ConnectionError):
+                        # the range may have been shortened by a stealing worker
+                        end = self._ranges[part_index][1]
+                        chunk = chunk[: max(0, end + 1 - position)]
+                        if chunk:
+                            await sync_to_async(pwrite, self._fd, chunk, position)
+                            position += len(chunk)
+                            self._part_progress[part_index] += len(chunk)
+                            self._processed_bytes += len(chunk)
+                        if position > end or worker_no >= self._parallel:
+                            break
+                break
+            except (AsyncTimeoutError, ConnectionError, ValueError):
                 if attempt == max_retries - 1:
                     raise
                 await sleep((attempt + 1) * 2)
-                self._processed_bytes = 0
+
+        start, end = self._ranges[part_index]
+        if self._part_progress[part_index] >= end - start + 1:
+            self._completed[part_index] = 1
+        return part_index
 
     async def handle_download(self, progress, progress_args):
         self._cancel_event.clear()
 
         await makedirs(self.directory, exist_ok=True)
-        temp_file_path = (
-            ospath.abspath(
-                sub("\\\\", "/", ospath.join(self.directory, self.file_name))
-            )
-            + ".temp"
+        file_path = ospath.abspath(
+            sub("\\\\", "/", ospath.join(self.directory, self.file_name))
         )
+        # a concurrent download of the same source gets a private, throwaway part
+        resumable = self.resume_key not in active_resumes
+        resume_key = self.resume_key if resumable else f"{self.resume_key}_{MsgId()}"
+        active_resumes.add(resume_key)
+        part_path = ospath.join(RESUME_DIR, f"{resume_key}.part")
+        manifest_path = f"{part_path}.json"
+
+        await sync_to_async(self._prune_resume_dir)
+        if await sync_to_async(self._load_manifest, manifest_path, part_path):
+            LOGGER.info(
+                f"HyperDL resuming {self.file_name} from {self._processed_bytes} bytes"
+            )
+        else:
+            num_parts = min(
+                self.num_parts, max(1, self.file_size // (10 * 1024 * 1024))
+            )
 
-        num_parts = min(self.num_parts, max(1, self.file_size // (10 * 1024 * 1024)))
-
-        if self.file_size < 10 * 1024 * 1024:
-            num_parts = 1
+            if self.file_size < 10 * 1024 * 1024:
+                num_parts = 1
 
-        part_size = self.file_size // num_parts if num_parts > 0 else self.file_size
-        ranges = [
-            (i * part_size, min((i + 1) * part_size - 1, self.file_size - 1))
-            for i in range(num_parts)
-        ]
+            part_size = self.file_size // num_parts
+            self._ranges = [
+                [i * part_size, min((i + 1) * part_size - 1, self.file_size - 1)]
+                for i in range(num_parts)
+            ]
+            self._ranges[-1][1] = self.file_size - 1
+            self._part_progress = [0] * num_parts
+            self._completed = bytearray(num_parts)
+        self._max_parallel = max(
+            1, min(self.max_parts, self.file_size // MIN_PART_SIZE)
+        )
+        self._parallel = min(len(self._ranges), self._max_parallel)
 
-        tasks = []
         prog_task = None
+        saver_task = None
+        control_task = None
+        keep_parts = False
+        completed = False
 
         try:
-            for i, (start, end) in enumerate(ranges):
-                tasks.append(create_task(self.single_part(start, end, i)))
+            self._fd = await sync_to_async(
+                self._open_temp_file, part_path, self.file_size
+            )
+            saver_task = create_task(self._manifest_saver(manifest_path))
+            control_task = create_task(self._adapt_parallelism())
 
             if progress:
                 prog_task = create_task(self.progress_callback(progress, progress_args))
 
-            results = await gather(*tasks)
-
-            async with aiopen(temp_file_path, "wb") as temp_file:
-                for _, part_file_path in sorted(results, key=lambda x: x[0]):
-                    try:
-                        async with aiopen(part_file_path, "rb") as part_file:
-                            while True:
-                                chunk = await part_file.read(8 * 1024 * 1024)
-                                if not chunk:
-                                    break
-                                await temp_file.write(chunk)
-                        await remove(part_file_path)
-                    except Exception as e:
-                        LOGGER.error(
-                            f"Error processing part file {part_file_path}: {e}"
-                        )
-                        raise
+            for _ in range(PART_RETRY_ROUNDS):
+                if all(self._completed):
+                    break
+                self._spawn_workers()
+                while running := [t for t in self._workers.values() if not t.done()]:
+                    await wait(running)
+                for task in self._workers.values():
+                    if task.cancelled():
+                        raise CancelledError("Download cancelled")
+                    result = task.exception()
+                    if isinstance(
+                        result, (CancelledError, StopTransmission, FloodWait)
+                    ):
+                        raise result
+                    if result is not None:
+                        LOGGER.error(f"HyperDL part failed, retrying: {result}")
+                self._workers.clear()
+
+            if not all(self._completed):
+                raise ValueError(
+                    f"Incomplete download: {self._completed.count(0)} of {len(self._ranges)} parts failed"
+                )
 
             if prog_task and not prog_task.done():
                 prog_task.cancel()
 
-            file_path = ospath.splitext(temp_file_path)[0]
-            await move(temp_file_path, file_path)
+            await sync_to_async(close, self._fd)
+            self._fd = None
+            await move(part_path, file_path)
+            completed = True
 
             return file_path
 
         except FloodWait as fw:
+            keep_parts = resumable
             raise fw
         except (CancelledError, StopTransmission):
             return None
         except Exception as e:
             LOGGER.error(f"HyperDL Error: {e}")
+            keep_parts = resumable
             return None
         finally:
+            active_resumes.discard(resume_key)
             self._cancel_event.set()
             if prog_task and not prog_task.done():
                 prog_task.cancel()
-
-            for task in tasks:
-                if not task.done():
+            for task in (saver_task, control_task, *self._workers.values()):
+                if task and not task.done():
                     task.cancel()
-
-            for i in range(len(ranges)):
-                part_path = ospath.join(
-                    self.directory, f"{self.file_name}.temp.{i:02d}"
-                )
-                try:
-                    if ospath.exists(part_path):
-                        await remove(part_path)
-                except Exception:
-                    pass
+            self._workers.clear()
+            self._parallel = 0
+
+            if keep_parts:
+                with suppress(OSError):
+                    await sync_to_async(self._save_manifest, manifest_path)
+            if self._fd is not None:
+                with suppress(OSError):
+                    close(self._fd)
+                self._fd = None
+            if not keep_parts:
+                for path in (manifest_path, *([] if completed else [part_path])):
+                    if ospath.exists(path):
+                        with suppress(Exception):
+                            await remove(path)
 
     @staticmethod
     async def get_extension(file_type, mime_type):
@@ -483,10 +851,14 @@ class HyperTGDownload:
 
             file_id_str = media if isinstance(media, str) else media.file_id
             file_id_obj = FileId.decode(file_id_str)
+            self.dc_id = file_id_obj.dc_id
 
             file_type = file_id_obj.file_type
             media_file_name = getattr(media, "file_name", "")
             self.file_size = getattr(media, "file_size", 0)
+            self.file_unique_id = getattr(media, "file_unique_id", "") or MsgId()
+            # the source message survives restarts, the listener mid doesn't
+            self.resume_key = f"{self.file_unique_id}_{message.chat.id}_{message.id}"
             mime_type = getattr(media, "mime_type", "image/jpeg")
             date = getattr(media, "date", None)
 
@@ -2,27 +2,108 @@ import re
 from contextlib import suppress
 from PIL import Image
 from hashlib import md5
-from aiofiles.os import remove, path as aiopath, makedirs
+from aiofiles.os import remove, path as aiopath, makedirs, stat as aiostat
 import json
 from asyncio import (
+    CancelledError,
+    Semaphore,
     create_subprocess_exec,
+    create_task,
     gather,
+    shield,
     wait_for,
     sleep,
 )
 from asyncio.subprocess import PIPE
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from functools import partial
 from os import path as ospath
-from re import search as re_search, escape
+from re import search as re_search
 from time import time
 from aioshutil import rmtree
 from langcodes import Language
 
-from ... import LOGGER, cpu_no, DOWNLOAD_DIR
-from ...core.config_manager import BinConfig
+from ... import LOGGER, bot_loop, cpu_no, DOWNLOAD_DIR
+from ...core.config_manager import BinConfig, Config
 from .bot_utils import cmd_exec, sync_to_async
 from .files_utils import get_mime_type, is_archive, is_archive_split
 from .status_utils import time_to_seconds
 
+MAX_SPLIT_JOBS = 4
+PROBE_CACHE_SIZE = 1024
+
+FFMPEG_JOB_THREADS = 4
+
+_probe_cache = OrderedDict()
+_probe_tasks = {}
+
+
+class FFmpegScheduler:
+    """
+    Bounds concurrent ffmpeg jobs and hands free slots out round-robin per
+    user, so one big task can't hold every slot while others wait.
+    """
+
+    def __init__(self):
+        self._running = 0
+        self._waiters = {}
+        self._order = deque()
+
+    @property
+    def slots(self):
+        return max(1, Config.FFMPEG_SLOTS or cpu_no // FFMPEG_JOB_THREADS)
+
+    @property
+    def threads(self):
+        return max(1, cpu_no // self.slots)
+
+    def _wake(self):
+        while self._running < self.slots and self._order:
+            user_id = self._order.popleft()
+            waiters = self._waiters[user_id]
+            future = waiters.popleft()
+            if waiters:
+                self._order.append(user_id)
+            else:
+                del self._waiters[user_id]
+            if future.done():
+                continue
+            self._running += 1
+            future.set_result(None)
+
+    async def acquire(self, user_id):
+        if self._running < self.slots and not self._order:
+            self._running += 1
+            return
+        future = bot_loop.create_future()
+        if user_id not in self._waiters:
+            self._waiters[user_id] = deque()
+            self._order.append(user_id)
+        self._waiters[user_id].append(future)
+        self._wake()
+        try:
+            await future
+        except CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        self._running -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, user_id):
+        await self.acquire(user_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+ffmpeg_scheduler = FFmpegScheduler()
+
 
 def get_md5_hash(up_path):
     md5_hash = md5()
@@ -46,29 +127,74 @@ async def create_thumb(msg, _id=""):
     return output
 
 
+async def _run_ffprobe(path):
+    stdout, stderr, code = await cmd_exec(
+        [
+            "ffprobe",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            path,
+        ]
+    )
+    info = None
+    if stdout and code == 0:
+        with suppress(ValueError):
+            info = json.loads(stdout)
+    return info, stderr, code
+
+
+def _probe_done(key, task):
+    # runs even when every caller was cancelled, so the task never lingers
+    if _probe_tasks.get(key) is task:
+        del _probe_tasks[key]
+    if task.cancelled() or task.exception() is not None:
+        return
+    _probe_cache[key] = task.result()
+    while len(_probe_cache) > PROBE_CACHE_SIZE:
+        _probe_cache.popitem(last=False)
+
+
+async def probe_media(path):
+    """
+    Runs ffprobe once per file version and shares the result.
+
+    Results are keyed on (device, inode, size, mtime), so renames keep the
+    entry and rewritten files are probed again.
+
+    Returns:
+        (info, stderr, returncode) where info is the parsed json or None.
+        info is shared with every other caller of the same file, read it
+        but don't mutate it.
+    """
+    try:
+        st = await aiostat(path)
+    except OSError:
+        return await _run_ffprobe(path)
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    if (result := _probe_cache.get(key)) is not None:
+        _probe_cache.move_to_end(key)
+        return result
+    if (task := _probe_tasks.get(key)) is None:
+        task = _probe_tasks[key] = create_task(_run_ffprobe(path))
+        task.add_done_callback(partial(_probe_done, key))
+    return await shield(task)
+
+
 async def get_media_info(path, extra_info=False):
     try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_format",
-                "-show_streams",
-                path,
-            ]
-        )
+        ffresult, _, _ = await probe_media(path)
     except Exception as e:
         LOGGER.error(f"Get Media Info: {e}. Mostly File not found! - File: {path}")
         return (0, "", "", "") if extra_info else (0, None, None)
-    if result[0] and result[2] == 0:
-        ffresult = eval(result[0])
+    if ffresult:
         fields = ffresult.get("format")
         if fields is None:
-            LOGGER.error(f"get_media_info: {result}")
+            LOGGER.error(f"get_media_info: {ffresult}")
             return (0, "", "", "") if extra_info else (0, None, None)
         duration = round(float(fields.get("duration", 0)))
         if extra_info:
@@ -113,19 +239,8 @@ async def get_document_type(path):
     if mime_type.startswith("image"):
         return False, False, True
     try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_streams",
-                path,
-            ]
-        )
-        if result[1] and mime_type.startswith("video"):
+        ffresult, stderr, _ = await probe_media(path)
+        if stderr and mime_type.startswith("video"):
             is_video = True
     except Exception as e:
         LOGGER.error(f"Get Document Type: {e}. Mostly File not found! - File: {path}")
@@ -136,10 +251,10 @@ async def get_document_type(path):
         if mime_type.startswith("video"):
             is_video = True
         return is_video, is_audio, is_image
-    if result[0] and result[2] == 0:
-        fields = eval(result[0]).get("streams")
+    if ffresult:
+        fields = ffresult.get("streams")
         if fields is None:
-            LOGGER.error(f"get_document_type: {result}")
+            LOGGER.error(f"get_document_type: {ffresult}")
             return is_video, is_audio, is_image
         is_video = False
         for stream in fields:
@@ -161,79 +276,129 @@ async def get_streams(file):
 
     Returns:
         A list of stream objects (dictionaries) or None if an error occurs
-        or no streams are found.
+        or no streams are found. The list comes from the shared probe cache,
+        copy it before changing anything.
     """
-    cmd = [
-        "ffprobe",
-        "-hide_banner",
-        "-loglevel",
-        "error",
-        "-print_format",
-        "json",
-        "-show_streams",
-        file,
-    ]
-    process = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
-    stdout, stderr = await process.communicate()
+    info, stderr, code = await probe_media(file)
 
-    if process.returncode != 0:
-        LOGGER.error(f"Error getting stream info: {stderr.decode().strip()}")
+    if code != 0:
+        LOGGER.error(f"Error getting stream info: {stderr}")
         return None
 
     try:
-        return json.loads(stdout)["streams"]
-    except KeyError:
+        return info["streams"]
+    except (KeyError, TypeError):
+        LOGGER.error(f"No streams found in the ffprobe output: {info}")
+        return None
+
+
+async def _grab_frames(video_file, timestamps, outputs=None, layout="", grid=""):
+    """
+    Extracts every requested frame with a single ffmpeg run.
+
+    Each timestamp is its own input seeked with -ss, so ffmpeg only decodes
+    from the nearest keyframe instead of the whole file. Frames come from the
+    first video stream that isn't an attached picture (cover art).
+
+    Args:
+        video_file: Path to the video.
+        timestamps: Seconds to capture.
+        outputs: Optional png path per timestamp.
+        layout: Tile layout (e.g. 3x3) when a grid is wanted.
+        grid: Path of the tiled jpeg, written when layout is set.
+
+    Returns:
+        (stdout, stderr, returncode) of the ffmpeg run.
+    """
+    cmd = [BinConfig.FFMPEG_NAME, "-hide_banner", "-loglevel", "error", "-y"]
+    for cap_time in timestamps:
+        cmd += ["-ss", f"{cap_time}", "-i", video_file]
+    if layout:
+        filters = []
+        for i in range(len(timestamps)):
+            frame = f"[{i}:V:0]trim=end_frame=1,setpts=PTS-STARTPTS,setsar=1"
+            if outputs:
+                filters.append(f"{frame},split=2[s{i}][g{i}]")
+            else:
+                filters.append(f"{frame}[g{i}]")
+        tiles = "".join(f"[g{i}]" for i in range(len(timestamps)))
+        filters.append(f"{tiles}concat=n={len(timestamps)}:v=1:a=0,tile={layout}[grid]")
+        cmd += ["-filter_complex", ";".join(filters)]
+    for i, output in enumerate(outputs or []):
+        source = f"[s{i}]" if layout else f"{i}:V:0"
+        cmd += [
+            "-map",
+            source,
+            "-q:v",
+            "1",
+            "-frames:v",
+            "1",
+            "-threads",
+            f"{ffmpeg_scheduler.threads}",
+            output,
+        ]
+    if layout:
+        cmd += [
+            "-map",
+            "[grid]",
+            "-q:v",
+            "1",
+            "-frames:v",
+            "1",
+            "-f",
+            "mjpeg",
+            "-threads",
+            f"{ffmpeg_scheduler.threads}",
+            grid,
+        ]
+    return await wait_for(cmd_exec(cmd), timeout=60 + 2 * len(timestamps))
+
+
+def _ss_timestamps(duration, ss_nb):
+    interval = duration // (ss_nb + 1)
+    return [interval * i for i in range(1, ss_nb + 1)]
+
+
+async def _grab_frame(video_file, cap_time, output):
+    try:
+        _, stderr, code = await _grab_frames(video_file, [cap_time], [output])
+    except TimeoutError:
+        stderr, code = "Timeout", -1
+    if code != 0:
         LOGGER.error(
-            f"No streams found in the ffprobe output: {stdout.decode().strip()}",
+            f"Error while creating screenshot at {cap_time}s. Path: {video_file}. stderr: {stderr}"
         )
-        return None
+        return False
+    return True
 
 
-async def take_ss(video_file, ss_nb) -> bool:
+async def take_ss(video_file, ss_nb, layout="", grid="") -> bool:
     duration = (await get_media_info(video_file))[0]
     if duration != 0:
         dirpath, name = video_file.rsplit("/", 1)
         name, _ = ospath.splitext(name)
         dirpath = f"{dirpath}/{name}_mltbss"
         await makedirs(dirpath, exist_ok=True)
-        interval = duration // (ss_nb + 1)
-        cap_time = interval
-        cmds = []
-        for i in range(ss_nb):
-            output = f"{dirpath}/SS.{name}_{i:02}.png"
-            cmd = [
-                BinConfig.FFMPEG_NAME,
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-ss",
-                f"{cap_time}",
-                "-i",
-                video_file,
-                "-q:v",
-                "1",
-                "-frames:v",
-                "1",
-                "-threads",
-                f"{max(1, cpu_no // 2)}",
-                output,
-            ]
-            cap_time += interval
-            cmds.append(cmd_exec(cmd))
+        outputs = [f"{dirpath}/SS.{name}_{i:02}.png" for i in range(ss_nb)]
+        timestamps = _ss_timestamps(duration, ss_nb)
         try:
-            resutls = await wait_for(gather(*cmds), timeout=60)
-            if resutls[0][2] != 0:
-                LOGGER.error(
-                    f"Error while creating sreenshots from video. Path: {video_file}. stderr: {resutls[0][1]}"
-                )
-                await rmtree(dirpath, ignore_errors=True)
-                return False
+            _, stderr, code = await _grab_frames(
+                video_file, timestamps, outputs, layout, grid
+            )
         except Exception:
-            LOGGER.error(
-                f"Error while creating sreenshots from video. Path: {video_file}. Error: Timeout some issues with ffmpeg with specific arch!"
+            stderr = "Timeout some issues with ffmpeg with specific arch!"
+            code = -1
+        if code != 0:
+            # one bad seek fails the combined run, keep the frames that work
+            LOGGER.warning(
+                f"Error while creating sreenshots from video, retrying one by one. Path: {video_file}. stderr: {stderr}"
             )
-            await rmtree(dirpath, ignore_errors=True)
-            return False
+            grabbed = 0
+            for cap_time, output in zip(timestamps, outputs):
+                grabbed += await _grab_frame(video_file, cap_time, output)
+            if not grabbed:
+                await rmtree(dirpath, ignore_errors=True)
+                return False
         return dirpath
     else:
         LOGGER.error("take_ss: Can't get the duration of video")
@@ -255,7 +420,7 @@ async def get_audio_thumbnail(audio_file):
         "-vcodec",
         "copy",
         "-threads",
-        f"{max(1, cpu_no // 2)}",
+        f"{ffmpeg_scheduler.threads}",
         output,
     ]
     try:
@@ -326,35 +491,22 @@ async def get_multiple_frames_thumbnail(video_file, layout, keep_screenshots):
     if ss_nb == 0:
         LOGGER.error(f"Invalid layout value: {layout}")
         return None
-    dirpath = await take_ss(video_file, ss_nb)
-    if not dirpath:
-        return None
     output_dir = f"{DOWNLOAD_DIR}thumbnails"
     await makedirs(output_dir, exist_ok=True)
     output = ospath.join(output_dir, f"{time()}.jpg")
-    cmd = [
-        BinConfig.FFMPEG_NAME,
-        "-hide_banner",
-        "-loglevel",
-        "error",
-        "-pattern_type",
-        "glob",
-        "-i",
-        f"{escape(dirpath)}/*.png",
-        "-vf",
-        f"tile={layout}, thumbnail",
-        "-q:v",
-        "1",
-        "-frames:v",
-        "1",
-        "-f",
-        "mjpeg",
-        "-threads",
-        f"{max(1, cpu_no // 2)}",
-        output,
-    ]
+    if keep_screenshots:
+        # screenshots and grid come out of the same ffmpeg run
+        if not await take_ss(video_file, ss_nb, layout, output):
+            return None
+        return output if await aiopath.exists(output) else None
+    duration = (await get_media_info(video_file))[0]
+    if duration == 0:
+        LOGGER.error("take_ss: Can't get the duration of video")
+        return None
     try:
-        _, err, code = await wait_for(cmd_exec(cmd), timeout=60)
+        _, err, code = await _grab_frames(
+            video_file, _ss_timestamps(duration, ss_nb), layout=layout, grid=output
+        )
         if code != 0 or not await aiopath.exists(output):
             LOGGER.error(
                 f"Error while combining thumbnails for video. Name: {video_file} stderr: {err}"
@@ -365,9 +517,6 @@ async def get_multiple_frames_thumbnail(video_file, layout, keep_screenshots):
             f"Error while combining thumbnails from video. Name: {video_file}. Error: Timeout some issues with ffmpeg with specific arch!"
         )
         return None
-    finally:
-        if not keep_screenshots:
-            await rmtree(dirpath, ignore_errors=True)
     return output
 
 
@@ -384,6 +533,9 @@ class FFMpeg:
         self._eta_raw = 0
         self._time_rate = 0.1
         self._start_time = 0
+        self._proc = None
+        self._procs = []
+        self.subsize = 0
 
     @property
     def processed_bytes(self):
@@ -412,14 +564,33 @@ class FFMpeg:
         self._last_processed_time = 0
         self._last_processed_bytes = 0
 
+    def kill_procs(self):
+        for proc in self._procs:
+            if proc.returncode is None:
+                with suppress(Exception):
+                    proc.kill()
+
+    async def _run_cmd(self, cmd):
+        # each job owns its process, so parallel jobs of one task don't
+        # overwrite each other's progress through listener.subproc
+        self._proc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+        self._procs.append(self._proc)
+        try:
+            await self._ffmpeg_progress()
+            _, stderr = await self._proc.communicate()
+        finally:
+            self._procs.remove(self._proc)
+        return self._proc.returncode, stderr
+
     async def _ffmpeg_progress(self):
+        subsize = self.subsize or getattr(self._listener, "subsize", 0)
         while not (
-            self._listener.subproc.returncode is not None
+            self._proc.returncode is not None
             or self._listener.is_cancelled
-            or self._listener.subproc.stdout.at_eof()
+            or self._proc.stdout.at_eof()
         ):
             try:
-                line = await wait_for(self._listener.subproc.stdout.readline(), 60)
+                line = await wait_for(self._proc.stdout.readline(), 60)
             except Exception:
                 break
             line = line.decode().strip()
@@ -443,13 +614,9 @@ class FFMpeg:
                             self._progress_raw = (
                                 self._processed_time * 100
                             ) / self._total_time
-                            if (
-                                hasattr(self._listener, "subsize")
-                                and self._listener.subsize
-                                and self._progress_raw > 0
-                            ):
+                            if subsize and self._progress_raw > 0:
                                 self._processed_bytes = int(
-                                    self._listener.subsize * (self._progress_raw / 100)
+                                    subsize * (self._progress_raw / 100)
                                 )
                             if (time() - self._start_time) > 0:
                                 self._speed_raw = self._processed_bytes / (
@@ -495,12 +662,7 @@ class FFMpeg:
             ffmpeg[index] = output
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *ffmpeg, stdout=PIPE, stderr=PIPE
-        )
-        await self._ffmpeg_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        code, stderr = await self._run_cmd(ffmpeg)
         if self._listener.is_cancelled:
             return False
         if code == 0:
@@ -543,7 +705,7 @@ class FFMpeg:
                 "-c:a",
                 "aac",
                 "-threads",
-                f"{max(1, cpu_no // 2)}",
+                f"{ffmpeg_scheduler.threads}",
                 output,
             ]
             if ext == "mp4":
@@ -567,17 +729,12 @@ class FFMpeg:
                 "-c",
                 "copy",
                 "-threads",
-                f"{max(1, cpu_no // 2)}",
+                f"{ffmpeg_scheduler.threads}",
                 output,
             ]
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *cmd, stdout=PIPE, stderr=PIPE
-        )
-        await self._ffmpeg_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        code, stderr = await self._run_cmd(cmd)
         if self._listener.is_cancelled:
             return False
         if code == 0:
@@ -614,17 +771,12 @@ class FFMpeg:
             "-i",
             audio_file,
             "-threads",
-            f"{max(1, cpu_no // 2)}",
+            f"{ffmpeg_scheduler.threads}",
             output,
         ]
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *cmd, stdout=PIPE, stderr=PIPE
-        )
-        await self._ffmpeg_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        code, stderr = await self._run_cmd(cmd)
         if self._listener.is_cancelled:
             return False
         if code == 0:
@@ -694,18 +846,13 @@ class FFMpeg:
             "-c:a",
             "aac",
             "-threads",
-            f"{max(1, cpu_no // 2)}",
+            f"{ffmpeg_scheduler.threads}",
             output_file,
         ]
 
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *cmd, stdout=PIPE, stderr=PIPE
-        )
-        await self._ffmpeg_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        code, stderr = await self._run_cmd(cmd)
         if self._listener.is_cancelled:
             return False
         if code == -9:
@@ -725,12 +872,237 @@ class FFMpeg:
                 await remove(output_file)
             return False
 
+    async def _probe_keyframes(self, f_path):
+        # only the main video stream, keep just keyframes while streaming
+        cmd = [
+            "ffprobe",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-select_streams",
+            "V:0",
+            "-show_entries",
+            "packet=pts_time,size,flags",
+            "-of",
+            "csv=p=0",
+            f_path,
+        ]
+        process = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+        self._procs.append(process)
+        stderr_task = create_task(process.stderr.read())
+        keyframes = []
+        video_bytes = 0
+        try:
+            async for line in process.stdout:
+                if self._listener.is_cancelled:
+                    process.kill()
+                    break
+                fields = line.split(b",")
+                if len(fields) < 3:
+                    continue
+                try:
+                    pts_time = float(fields[0])
+                    size = int(fields[1])
+                except ValueError:
+                    continue
+                if b"K" in fields[2]:
+                    keyframes.append((pts_time, video_bytes))
+                video_bytes += size
+            stderr = await stderr_task
+            await process.wait()
+        finally:
+            self._procs.remove(process)
+            if process.returncode is None:
+                with suppress(Exception):
+                    process.kill()
+        if process.returncode != 0:
+            if not self._listener.is_cancelled:
+                LOGGER.warning(f"Unable to probe keyframes: {stderr.decode().strip()}")
+            return None, 0
+        keyframes.sort()
+        return keyframes, video_bytes
+
+    async def _get_cut_points(self, f_path, split_size):
+        info, _, _ = await probe_media(f_path)
+        fmt = (info or {}).get("format", {})
+        try:
+            start = float(fmt.get("start_time", 0) or 0)
+            duration = float(fmt.get("duration", 0) or 0)
+        except ValueError:
+            return None
+        keyframes, video_bytes = await self._probe_keyframes(f_path)
+        if not keyframes or duration <= 0:
+            return None
+        total = await aiopath.getsize(f_path)
+        # audio, subtitles and container overhead are spread over the duration
+        other_bytes = max(total - video_bytes, 0)
+        times = [pts_time for pts_time, _ in keyframes]
+        offsets = [
+            before + other_bytes * max(pts_time - start, 0) / duration
+            for pts_time, before in keyframes
+        ]
+
+        limit = split_size - split_size // 50
+        cuts = [min(start, times[0])]
+        start_bytes = 0
+        previous = None
+        for index, keyframe in enumerate(times):
+            if keyframe <= cuts[-1]:
+                continue
+            if offsets[index] - start_bytes > limit:
+                if previous is None:
+                    return None
+                cuts.append(times[previous])
+                start_bytes = offsets[previous]
+                if offsets[index] - start_bytes > limit:
+                    # a single GOP is bigger than a part
+                    return None
+            previous = index
+        if total - start_bytes > limit:
+            if previous is None or times[previous] <= cuts[-1]:
+                return None
+            cuts.append(times[previous])
+            if total - offsets[previous] > limit:
+                return None
+        return cuts if len(cuts) > 1 else None
+
+    def _update_split_progress(self):
+        self._processed_time = sum(self._part_times.values())
+        elapsed = time() - self._start_time
+        try:
+            self._progress_raw = self._processed_time * 100 / self._total_time
+        except ZeroDivisionError:
+            self._progress_raw = 0
+        self._processed_bytes = int(
+            (getattr(self._listener, "subsize", 0) or 0) * self._progress_raw / 100
+        )
+        if elapsed > 0 and self._processed_time > 0:
+            self._speed_raw = self._processed_bytes / elapsed
+            self._eta_raw = (
+                (self._total_time - self._processed_time)
+                * elapsed
+                / self._processed_time
+            )
+
+    async def _run_split_part(self, semaphore, cmd, index, state):
+        async with semaphore, ffmpeg_scheduler.slot(self._listener.user_id):
+            if self._listener.is_cancelled or state["failed"] is not None:
+                return
+            proc = self._listener.subproc = await create_subprocess_exec(
+                *cmd, stdout=PIPE, stderr=PIPE
+            )
+            self._procs.append(proc)
+            try:
+                while not proc.stdout.at_eof():
+                    if self._listener.is_cancelled:
+                        proc.kill()
+                        break
+                    try:
+                        line = await wait_for(proc.stdout.readline(), 60)
+                    except (TimeoutError, ValueError):
+                        break
+                    line = line.decode().strip()
+                    if line.startswith("out_time=") and not line.endswith("N/A"):
+                        self._part_times[index] = time_to_seconds(line[9:])
+                        self._update_split_progress()
+                _, stderr = await proc.communicate()
+            finally:
+                self._procs.remove(proc)
+            # siblings killed below exit with -9 too, only the first failure counts
+            if (
+                proc.returncode != 0
+                and state["failed"] is None
+                and not self._listener.is_cancelled
+            ):
+                state["failed"] = stderr.decode(errors="ignore").strip() or (
+                    f"ffmpeg exited with code {proc.returncode}"
+                )
+                self.kill_procs()
+
+    async def _split_parallel(self, f_path, file_, cuts):
+        base_name, extension = ospath.splitext(file_)
+        self._part_times = {}
+        out_paths = []
+        cmds = []
+        for i, start_time in enumerate(cuts, 1):
+            out_path = f_path.replace(file_, f"{base_name}.part{i:03}{extension}")
+            cmd = [
+                BinConfig.FFMPEG_NAME,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-progress",
+                "pipe:1",
+                "-seek_timestamp",
+                "1",
+                "-ss",
+                str(start_time),
+                "-i",
+                f_path,
+                "-map",
+                "0",
+                "-map_chapters",
+                "-1",
+                "-avoid_negative_ts",
+                "make_zero",
+                "-strict",
+                "-2",
+                "-c",
+                "copy",
+                out_path,
+            ]
+            if i < len(cuts):
+                cmd[-1:-1] = ["-t", str(cuts[i] - start_time)]
+            if i == 1:
+                # first part keeps everything before the first keyframe
+                del cmd[6:10]
+            out_paths.append(out_path)
+            cmds.append(cmd)
+        # parts take scheduler slots like any ffmpeg job, the semaphore caps
+        # how many of them a single split runs at once
+        semaphore = Semaphore(MAX_SPLIT_JOBS)
+        state = {"failed": None}
+        await gather(
+            *(
+                self._run_split_part(semaphore, cmd, index, state)
+                for index, cmd in enumerate(cmds)
+            )
+        )
+        if self._listener.is_cancelled:
+            return False
+        failed = state["failed"]
+        if failed is None:
+            for out_path in out_paths:
+                if await aiopath.getsize(out_path) > self._listener.max_split_size:
+                    failed = f"Part {out_path} is bigger than the split size"
+                    break
+        if failed is not None:
+            LOGGER.warning(
+                f"{failed}. Parallel split failed, splitting part by part. Path: {f_path}"
+            )
+            for out_path in out_paths:
+                with suppress(OSError):
+                    await remove(out_path)
+            return None
+        return True
+
     async def split(self, f_path, file_, parts, split_size):
         self.clear()
-        multi_streams = True
         self._total_time = duration = (await get_media_info(f_path))[0]
-        base_name, extension = ospath.splitext(file_)
         split_size -= 3000000
+        if parts > 1 and (cuts := await self._get_cut_points(f_path, split_size)):
+            if self._listener.is_cancelled:
+                return False
+            res = await self._split_parallel(f_path, file_, cuts)
+            if res is not None:
+                return res
+            self.clear()
+            self._total_time = duration
+        return await self._split_sequential(f_path, file_, parts, split_size, duration)
+
+    async def _split_sequential(self, f_path, file_, parts, split_size, duration):
+        multi_streams = True
+        base_name, extension = ospath.splitext(file_)
         start_time = 0
         i = 1
         while i <= parts or start_time < duration - 4:
@@ -759,20 +1131,16 @@ class FFMpeg:
                 "-c",
                 "copy",
                 "-threads",
-                f"{max(1, cpu_no // 2)}",
+                f"{ffmpeg_scheduler.threads}",
                 out_path,
             ]
             if not multi_streams:
                 del cmd[12]
                 del cmd[12]
-            if self._listener.is_cancelled:
-                return False
-            self._listener.subproc = await create_subprocess_exec(
-                *cmd, stdout=PIPE, stderr=PIPE
-            )
-            await self._ffmpeg_progress()
-            _, stderr = await self._listener.subproc.communicate()
-            code = self._listener.subproc.returncode
+            async with ffmpeg_scheduler.slot(self._listener.user_id):
+                if self._listener.is_cancelled:
+                    return False
+                code, stderr = await self._run_cmd(cmd)
             if self._listener.is_cancelled:
                 return False
             if code == -9:
@@ -823,3 +1191,61 @@ class FFMpeg:
             start_time += lpd - 3
             i += 1
         return True
+
+
+class FFMpegJobs:
+    """
+    Runs a task's files as separate FFMpeg jobs, each in its own scheduler
+    slot, and reports them to FFmpegStatus as a single task.
+    """
+
+    def __init__(self, listener, total_size=0):
+        self._listener = listener
+        self._jobs = []
+        self.reset(total_size)
+
+    def reset(self, total_size):
+        self._total_size = total_size
+        self._done_bytes = 0
+        self._start_time = 0
+
+    @property
+    def processed_bytes(self):
+        return self._done_bytes + sum(job.processed_bytes for job in self._jobs)
+
+    @property
+    def speed_raw(self):
+        if not self._start_time or time() <= self._start_time:
+            return 0
+        return self.processed_bytes / (time() - self._start_time)
+
+    @property
+    def progress_raw(self):
+        if not self._total_size:
+            return 0
+        return min(100, self.processed_bytes * 100 / self._total_size)
+
+    @property
+    def eta_raw(self):
+        if speed := self.speed_raw:
+            return max(0, self._total_size - self.processed_bytes) / speed
+        return 0
+
+    def kill_procs(self):
+        for job in self._jobs:
+            job.kill_procs()
+
+    @asynccontextmanager
+    async def job(self, size):
+        async with ffmpeg_scheduler.slot(self._listener.user_id):
+            if not self._start_time:
+                self._start_time = time()
+            self._listener.progress = True
+            job = FFMpeg(self._listener)
+            job.subsize = size
+            self._jobs.append(job)
+            try:
+                yield job
+            finally:
+                self._jobs.remove(job)
+                self._done_bytes += size
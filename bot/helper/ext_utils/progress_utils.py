@@ -0,0 +1,125 @@
+from array import array
+from math import exp
+from time import time
+
+SAMPLES_SIZE = 32
+SAMPLE_GAP = 0.5
+EWMA_WINDOW = 8
+STALE_AFTER = 30
+
+progress_trackers = {}
+engine_speeds = {}
+
+
+class ProgressTracker:
+    __slots__ = (
+        "_bytes",
+        "_count",
+        "_index",
+        "_size",
+        "_times",
+        "engine",
+        "speed",
+    )
+
+    def __init__(self, engine, size=SAMPLES_SIZE):
+        self.engine = engine
+        self.speed = 0.0
+        self._size = size
+        self._times = array("d", [0.0]) * size
+        self._bytes = array("d", [0.0]) * size
+        self._index = 0
+        self._count = 0
+
+    def _last(self):
+        return (self._index - 1) % self._size
+
+    @property
+    def last_time(self):
+        return self._times[self._last()] if self._count else 0.0
+
+    @property
+    def last_bytes(self):
+        return self._bytes[self._last()] if self._count else 0.0
+
+    def add(self, processed, now=None):
+        now = now or time()
+        if self._count:
+            last = self._last()
+            elapsed = now - self._times[last]
+            # progress callbacks fire per chunk, keep one sample per SAMPLE_GAP
+            if elapsed < SAMPLE_GAP:
+                return False
+            rate = max(processed - self._bytes[last], 0) / elapsed
+            if self._count == 1:
+                self.speed = rate
+            else:
+                alpha = 1 - exp(-elapsed / EWMA_WINDOW)
+                self.speed += alpha * (rate - self.speed)
+        self._times[self._index] = now
+        self._bytes[self._index] = processed
+        self._index = (self._index + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+        return True
+
+    def is_stale(self, now=None):
+        return (now or time()) - self.last_time > STALE_AFTER
+
+    def current_speed(self):
+        return 0.0 if self.is_stale() else self.speed
+
+    def window_speed(self):
+        if self._count < 2:
+            return 0.0
+        first = (self._index - self._count) % self._size
+        last = self._last()
+        elapsed = self._times[last] - self._times[first]
+        if elapsed <= 0:
+            return 0.0
+        return (self._bytes[last] - self._bytes[first]) / elapsed
+
+    def eta(self, total):
+        # the window average moves slower than the EWMA, so the ETA doesn't jump
+        speed = 0.0 if self.is_stale() else self.window_speed() or self.speed
+        if not speed or not total:
+            return None
+        return max(total - self.last_bytes, 0) / speed
+
+
+def _set_engine_speed(engine, delta):
+    speed = engine_speeds.get(engine, 0.0) + delta
+    engine_speeds[engine] = speed if speed > 1 else 0.0
+
+
+def add_progress_sample(mid, engine, processed):
+    tracker = progress_trackers.get(mid)
+    if tracker is None or tracker.engine != engine or processed < tracker.last_bytes:
+        if tracker is not None:
+            _set_engine_speed(tracker.engine, -tracker.speed)
+        tracker = progress_trackers[mid] = ProgressTracker(engine)
+    old_speed = tracker.speed
+    if tracker.add(processed):
+        _set_engine_speed(engine, tracker.speed - old_speed)
+    return tracker
+
+
+def get_progress_tracker(mid):
+    return progress_trackers.get(mid)
+
+
+def drop_progress_tracker(mid):
+    if tracker := progress_trackers.pop(mid, None):
+        _set_engine_speed(tracker.engine, -tracker.speed)
+
+
+def get_engine_speeds():
+    now = time()
+    speeds = {}
+    stale = {}
+    for tracker in list(progress_trackers.values()):
+        if tracker.is_stale(now):
+            stale[tracker.engine] = stale.get(tracker.engine, 0.0) + tracker.speed
+    for engine, speed in engine_speeds.items():
+        if (speed := speed - stale.get(engine, 0.0)) > 1:
+            speeds[engine] = speed
+    return speeds
@@ -17,6 +17,11 @@ from ...core.config_manager import Config
 from ..telegram_helper.button_build import ButtonMaker
 
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB"]
+STATS_TICK = 1
+
+_bot_stats = {"time": 0}
+_status_snapshot = {"time": 0, "statuses": {}}
+_task_fragments = {}
 
 
 class MirrorStatus:
@@ -75,44 +80,60 @@ STATUSES = {
     "CK": MirrorStatus.STATUS_CHECK,
 }
 
+IDLE_STATUSES = {
+    MirrorStatus.STATUS_QUEUEDL,
+    MirrorStatus.STATUS_QUEUEUP,
+    MirrorStatus.STATUS_PAUSED,
+    MirrorStatus.STATUS_SEED,
+}
+
 
 async def get_task_by_gid(gid: str):
-    async with task_dict_lock:
-        for tk in task_dict.values():
-            if hasattr(tk, "seeding"):
-                await tk.update()
-            if tk.gid() == gid:
-                return tk
-        return None
+    if task := task_dict.get_by_gid(gid):
+        return task
+    for mid, tk in list(task_dict.items()):
+        if hasattr(tk, "seeding"):
+            await tk.update()
+        # compare the live gid, an indexed one may be outdated
+        if task_dict.index_gid(mid) == gid:
+            return tk
+    return None
+
+
+async def get_tasks_status(tasks, fresh=False):
+    now = time()
+    if now - _status_snapshot["time"] >= STATS_TICK:
+        _status_snapshot["time"] = now
+        _status_snapshot["statuses"] = {}
+    statuses = _status_snapshot["statuses"]
+    if fresh:
+        # filters must see current buckets, the page render can reuse these
+        for tk in tasks:
+            statuses.pop(tk, None)
+    pending = [tk for tk in tasks if tk not in statuses]
+    coro_tasks = [tk for tk in pending if iscoroutinefunction(tk.status)]
+    coro_statuses = await gather(*[tk.status() for tk in coro_tasks])
+    statuses.update(zip(coro_tasks, coro_statuses))
+    for tk in pending:
+        if tk not in statuses:
+            statuses[tk] = tk.status()
+        if task_dict.get(tk.listener.mid) is tk:
+            task_dict.set_status(tk.listener.mid, statuses[tk])
+    return [statuses[tk] for tk in tasks]
 
 
 async def get_specific_tasks(status, user_id):
+    tasks = task_dict.get_by_user(user_id) if user_id else list(task_dict.values())
     if status == "All":
-        if user_id:
-            return [tk for tk in task_dict.values() if tk.listener.user_id == user_id]
-        else:
-            return list(task_dict.values())
-    tasks_to_check = (
-        [tk for tk in task_dict.values() if tk.listener.user_id == user_id]
-        if user_id
-        else list(task_dict.values())
-    )
-    coro_tasks = []
-    coro_tasks.extend(tk for tk in tasks_to_check if iscoroutinefunction(tk.status))
-    coro_statuses = await gather(*[tk.status() for tk in coro_tasks])
-    result = []
-    coro_index = 0
-    for tk in tasks_to_check:
-        if tk in coro_tasks:
-            st = coro_statuses[coro_index]
-            coro_index += 1
-        else:
-            st = tk.status()
-        if (st == status) or (
-            status == MirrorStatus.STATUS_DOWNLOAD and st not in STATUSES.values()
-        ):
-            result.append(tk)
-    return result
+        return tasks
+    await get_tasks_status(tasks, True)
+    if status == MirrorStatus.STATUS_DOWNLOAD:
+        known = STATUSES.values()
+        return task_dict.get_by_statuses(
+            [st for st in task_dict.get_statuses() if st == status or st not in known],
+            user_id,
+        )
+    return task_dict.get_by_status(status, user_id)
 
 
 async def get_all_tasks(req_status: str, user_id):
@@ -199,12 +220,132 @@ def get_progress_bar_string(pct):
     return f"[{p_str}]"
 
 
+def get_bot_stats():
+    now = time()
+    if now - _bot_stats["time"] >= STATS_TICK:
+        disk = disk_usage(DOWNLOAD_DIR)
+        _bot_stats.update(
+            {
+                "time": now,
+                "cpu": cpu_percent(),
+                "free": get_readable_file_size(disk.free),
+                "free_percent": round(100 - disk.percent, 1),
+                "ram": virtual_memory().percent,
+                "uptime": get_readable_time(now - bot_start_time),
+            }
+        )
+        _bot_stats["footer"] = (
+            f"\n╭╴ <b>CPU</b> → {_bot_stats['cpu']}% | <b>F</b> → {_bot_stats['free']} [{_bot_stats['free_percent']}%]"
+            f"\n╰╴ <b>RAM</b> → {_bot_stats['ram']}% | <b>UP</b> → {_bot_stats['uptime']}"
+        )
+    return _bot_stats
+
+
+def _get_task_fragment(task, tstatus):
+    elapsed = time() - task.listener.message.date.timestamp()
+    show_progress = (
+        tstatus not in [MirrorStatus.STATUS_SEED, MirrorStatus.STATUS_QUEUEUP]
+        and task.listener.progress
+    )
+    # key only on cheap getters, speed, peers and time are rendered live
+    progress = processed = None
+    if show_progress:
+        progress = task.progress()
+        processed = task.processed_bytes()
+        try:
+            bucket = int(float(progress.strip("%")) * 2)
+        except ValueError:
+            bucket = progress
+        key = (tstatus, bucket, processed)
+        if task.listener.subname:
+            key += (
+                task.listener.subname,
+                task.listener.subsize,
+                task.listener.proceed_count,
+                len(task.listener.files_to_proceed),
+            )
+    elif tstatus == MirrorStatus.STATUS_SEED:
+        key = (tstatus, task.uploaded_bytes())
+    else:
+        key = (tstatus, task.size())
+    key += (task.name(),)
+    mid = task.listener.mid
+    if (cached := _task_fragments.get(mid)) and cached[0] == key:
+        head, tail = cached[1]
+    else:
+        head, tail = _render_task_fragment(
+            task, tstatus, show_progress, progress, processed
+        )
+        _task_fragments[mid] = (key, (head, tail))
+
+    live = ""
+    if show_progress:
+        eta = task.eta()
+        live += f"\n╞ <b>Speed</b> → <i>{task.speed()}</i>"
+        live += f"\n╞ <b>Time</b> → <i>{eta} of {get_readable_time(elapsed + get_raw_time(eta))} ( {get_readable_time(elapsed)} )</i>"
+        if tstatus == MirrorStatus.STATUS_DOWNLOAD and (
+            task.listener.is_torrent or task.listener.is_qbit
+        ):
+            try:
+                live += f"\n╞ <b>Seeders</b> → {task.seeders_num()} | <b>Leechers</b> → {task.leechers_num()}"
+            except Exception:
+                pass
+            # TODO: Add Connected Peers
+        elif hasattr(task, "hyper_params") and (params := task.hyper_params()):
+            live += f"\n╞ <b>HyperDL</b> → <i>{params}</i>"
+    elif tstatus == MirrorStatus.STATUS_SEED:
+        live += f"\n╞ <b>Speed</b> → <i>{task.seed_speed()}</i>"
+        live += f"\n╞ <b>Ratio</b> → <i>{task.ratio()}</i>"
+        live += f"\n╞ <b>Time</b> → <i>{task.seeding_time()}</i> | <b>Elapsed</b> → <i>{get_readable_time(elapsed)}</i>"
+    return f"{head}{live}{tail}"
+
+
+def _render_task_fragment(task, tstatus, show_progress, progress, processed):
+    msg = f"<b><i>{escape(f'{task.name()}')}</i></b>"
+    if task.listener.subname:
+        msg += f"\n┖ <b>Sub Name</b> → <i>{task.listener.subname}</i>"
+
+    msg += f"\n\n<b>By {task.listener.message.from_user.mention(style='html')} </b> ( #ID{task.listener.message.from_user.id} )"
+    if task.listener.is_super_chat:
+        msg += f" <i>[<a href='{task.listener.message.link}'>Link</a>]</i>"
+
+    if show_progress:
+        msg += f"\n╭╴ {get_progress_bar_string(progress)} <i>{progress}</i>"
+        if task.listener.subname:
+            subsize = f" / {get_readable_file_size(task.listener.subsize)}"
+            ac = len(task.listener.files_to_proceed)
+            count = f"( {task.listener.proceed_count} / {ac or '?'} )"
+        else:
+            subsize = ""
+            count = ""
+        msg += f"\n╞ <b>Processed</b> → <i>{processed}{subsize} of {task.size()}</i>"
+        if count:
+            msg += f"\n╞ <b>Count:</b> → <b>{count}</b>"
+        msg += f"\n╞ <b>Status</b> → <b>{tstatus}</b>"
+    elif tstatus == MirrorStatus.STATUS_SEED:
+        msg += f"\n╞ <b>Size</b> → <i>{task.size()}</i> | <b>Uploaded</b>  → <i>{task.uploaded_bytes()}</i>"
+        msg += f"\n╞ <b>Status</b> → <b>{tstatus}</b>"
+    else:
+        msg += f"\n╞ <b>Size</b> → <i>{task.size()}</i>"
+    tail = f"\n╞ <b>Engine</b> → <i>{task.engine}</i>"
+    tail += f"\n╞ <b>In Mode</b> → <i>{task.listener.mode[0]}</i>"
+    tail += f"\n╞ <b>Out Mode</b> → <i>{task.listener.mode[1]}</i>"
+    # TODO: Add Bt Sel
+    from ..telegram_helper.bot_commands import BotCommands
+
+    tail += f"\n<b>╰╴Cancle</b> → <i>/{BotCommands.CancelTaskCommand[1]}_{task.gid()}</i>\n\n"
+    return msg, tail
+
+
 async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=1):
     msg = ""
     button = None
 
     tasks = await get_specific_tasks(status, sid if is_user else None)
 
+    for mid in _task_fragments.keys() - task_dict.keys():
+        del _task_fragments[mid]
+
     STATUS_LIMIT = Config.STATUS_LIMIT
     tasks_no = len(tasks)
     pages = (max(tasks_no, 1) + STATUS_LIMIT - 1) // STATUS_LIMIT
@@ -216,67 +357,20 @@ async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=
         status_dict[sid]["page_no"] = page_no
     start_position = (page_no - 1) * STATUS_LIMIT
 
-    for index, task in enumerate(
-        tasks[start_position : STATUS_LIMIT + start_position], start=1
+    page_tasks = tasks[start_position : STATUS_LIMIT + start_position]
+    if status != "All":
+        page_statuses = [status] * len(page_tasks)
+    else:
+        page_statuses = await get_tasks_status(page_tasks)
+    if sid in status_dict:
+        status_dict[sid]["idle"] = all(
+            tstatus in IDLE_STATUSES for tstatus in page_statuses
+        )
+    for index, (task, tstatus) in enumerate(
+        zip(page_tasks, page_statuses), start=start_position + 1
     ):
-        if status != "All":
-            tstatus = status
-        elif iscoroutinefunction(task.status):
-            tstatus = await task.status()
-        else:
-            tstatus = task.status()
-        msg += f"<b>{index + start_position}.</b> "
-        msg += f"<b><i>{escape(f'{task.name()}')}</i></b>"
-        if task.listener.subname:
-            msg += f"\n┖ <b>Sub Name</b> → <i>{task.listener.subname}</i>"
-        elapsed = time() - task.listener.message.date.timestamp()
-
-        msg += f"\n\n<b>By {task.listener.message.from_user.mention(style='html')} </b> ( #ID{task.listener.message.from_user.id} )"
-        if task.listener.is_super_chat:
-            msg += f" <i>[<a href='{task.listener.message.link}'>Link</a>]</i>"
-
-        if (
-            tstatus not in [MirrorStatus.STATUS_SEED, MirrorStatus.STATUS_QUEUEUP]
-            and task.listener.progress
-        ):
-            progress = task.progress()
-            msg += f"\n╭╴ {get_progress_bar_string(progress)} <i>{progress}</i>"
-            if task.listener.subname:
-                subsize = f" / {get_readable_file_size(task.listener.subsize)}"
-                ac = len(task.listener.files_to_proceed)
-                count = f"( {task.listener.proceed_count} / {ac or '?'} )"
-            else:
-                subsize = ""
-                count = ""
-            msg += f"\n╞ <b>Processed</b> → <i>{task.processed_bytes()}{subsize} of {task.size()}</i>"
-            if count:
-                msg += f"\n╞ <b>Count:</b> → <b>{count}</b>"
-            msg += f"\n╞ <b>Status</b> → <b>{tstatus}</b>"
-            msg += f"\n╞ <b>Speed</b> → <i>{task.speed()}</i>"
-            msg += f"\n╞ <b>Time</b> → <i>{task.eta()} of {get_readable_time(elapsed + get_raw_time(task.eta()))} ( {get_readable_time(elapsed)} )</i>"
-            if tstatus == MirrorStatus.STATUS_DOWNLOAD and (
-                task.listener.is_torrent or task.listener.is_qbit
-            ):
-                try:
-                    msg += f"\n╞ <b>Seeders</b> → {task.seeders_num()} | <b>Leechers</b> → {task.leechers_num()}"
-                except Exception:
-                    pass
-            # TODO: Add Connected Peers
-        elif tstatus == MirrorStatus.STATUS_SEED:
-            msg += f"\n╞ <b>Size</b> → <i>{task.size()}</i> | <b>Uploaded</b>  → <i>{task.uploaded_bytes()}</i>"
-            msg += f"\n╞ <b>Status</b> → <b>{tstatus}</b>"
-            msg += f"\n╞ <b>Speed</b> → <i>{task.seed_speed()}</i>"
-            msg += f"\n╞ <b>Ratio</b> → <i>{task.ratio()}</i>"
-            msg += f"\n╞ <b>Time</b> → <i>{task.seeding_time()}</i> | <b>Elapsed</b> → <i>{get_readable_time(elapsed)}</i>"
-        else:
-            msg += f"\n╞ <b>Size</b> → <i>{task.size()}</i>"
-        msg += f"\n╞ <b>Engine</b> → <i>{task.engine}</i>"
-        msg += f"\n╞ <b>In Mode</b> → <i>{task.listener.mode[0]}</i>"
-        msg += f"\n╞ <b>Out Mode</b> → <i>{task.listener.mode[1]}</i>"
-        # TODO: Add Bt Sel
-        from ..telegram_helper.bot_commands import BotCommands
-
-        msg += f"\n<b>╰╴Cancle</b> → <i>/{BotCommands.CancelTaskCommand[1]}_{task.gid()}</i>\n\n"
+        msg += f"<b>{index}.</b> "
+        msg += _get_task_fragment(task, tstatus)
 
     if len(msg) == 0:
         if status == "All":
@@ -301,6 +395,5 @@ async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=
                 buttons.data_button(label, f"status {sid} st {status_value}")
     buttons.data_button("≈", f"status {sid} ref", position="header")
     button = buttons.build_menu(8)
-    msg += f"\n╭╴ <b>CPU</b> → {cpu_percent()}% | <b>F</b> → {get_readable_file_size(disk_usage(DOWNLOAD_DIR).free)} [{round(100 - disk_usage(DOWNLOAD_DIR).percent, 1)}%]"
-    msg += f"\n╰╴ <b>RAM</b> → {virtual_memory().percent}% | <b>UP</b> → {get_readable_time(time() - bot_start_time)}"
+    msg += get_bot_stats()["footer"]
     return msg, button
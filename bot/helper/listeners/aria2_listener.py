@@ -6,7 +6,12 @@ from aiohttp.client_exceptions import ClientError
 
 from ... import task_dict_lock, task_dict, LOGGER, intervals
 from ...core.config_manager import Config
-from ...core.torrent_manager import TorrentManager, is_metadata, aria2_name
+from ...core.torrent_manager import (
+    Aria2Tracker,
+    TorrentManager,
+    is_metadata,
+    aria2_name,
+)
 from ..ext_utils.bot_utils import bt_selection_buttons
 from ..ext_utils.files_utils import clean_unwanted
 from ..ext_utils.status_utils import get_task_by_gid
@@ -21,6 +26,7 @@ from ..telegram_helper.message_utils import (
 
 async def _on_download_started(api, data):
     gid = data["params"][0]["gid"]
+    Aria2Tracker.notify(gid)
     with suppress(TimeoutError, ClientError, Exception):
         download, options = await api.tellStatus(gid), await api.getOption(gid)
         if options.get("follow-torrent", "") == "false":
@@ -70,6 +76,7 @@ async def _on_download_started(api, data):
 async def _on_download_complete(api, data):
     try:
         gid = data["params"][0]["gid"]
+        Aria2Tracker.notify(gid)
         download, options = await api.tellStatus(gid), await api.getOption(gid)
         if options.get("follow-torrent", "") == "false":
             return
@@ -109,6 +116,7 @@ async def _on_download_complete(api, data):
 
 async def _on_bt_download_complete(api, data):
     gid = data["params"][0]["gid"]
+    Aria2Tracker.notify(gid)
     await sleep(1)
     download = await api.tellStatus(gid)
     LOGGER.info(f"onBtDownloadComplete: {aria2_name(download)} - Gid: {gid}")
@@ -171,6 +179,7 @@ async def _on_bt_download_complete(api, data):
 
 async def _on_download_stopped(_, data):
     gid = data["params"][0]["gid"]
+    Aria2Tracker.notify(gid)
     await sleep(4)
     if task := await get_task_by_gid(gid):
         await task.listener.on_download_error("Dead torrent!")
@@ -178,6 +187,7 @@ async def _on_download_stopped(_, data):
 
 async def _on_download_error(api, data):
     gid = data["params"][0]["gid"]
+    Aria2Tracker.notify(gid)
     await sleep(1)
     LOGGER.info(f"onDownloadError: {gid}")
     error = "None"
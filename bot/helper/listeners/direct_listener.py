@@ -1,8 +1,11 @@
-from asyncio import sleep, TimeoutError
+from asyncio import Semaphore, TimeoutError, gather
+from urllib.parse import urlparse
+
 from aiohttp.client_exceptions import ClientError
 
 from ... import LOGGER
-from ...core.torrent_manager import TorrentManager, aria2_name
+from ...core.config_manager import Config
+from ...core.torrent_manager import Aria2Tracker, TorrentManager, aria2_name
 
 
 class DirectListener:
@@ -12,64 +15,86 @@ class DirectListener:
         self._a2c_opt = a2c_opt
         self._proc_bytes = 0
         self._failed = 0
-        self.download_task = None
+        self._downloads = {}
         self.name = self.listener.name
 
+    @property
+    def download_task(self):
+        return next(iter(self._downloads.values()), None)
+
     @property
     def processed_bytes(self):
-        if self.download_task:
-            return self._proc_bytes + int(
-                self.download_task.get("completedLength", "0")
-            )
-        return self._proc_bytes
+        return self._proc_bytes + sum(
+            int(download.get("completedLength", "0"))
+            for download in self._downloads.values()
+        )
 
     @property
     def speed(self):
-        return (
-            int(self.download_task.get("downloadSpeed", "0"))
-            if self.download_task
-            else 0
+        return sum(
+            int(download.get("downloadSpeed", "0"))
+            for download in self._downloads.values()
         )
 
-    async def download(self, contents):
-        self.is_downloading = True
-        for content in contents:
-            if self.listener.is_cancelled:
+    def _get_parallel(self, contents):
+        limit = self.listener.user_dict.get("DIRECT_PARALLEL") or Config.DIRECT_PARALLEL
+        host = urlparse(contents[0]["url"]).hostname or ""
+        for domain, host_limit in Config.DIRECT_HOST_PARALLEL.items():
+            if host == domain or host.endswith(f".{domain}"):
+                limit = min(limit, host_limit) if limit else host_limit
                 break
+        return max(1, int(limit or 1))
+
+    async def _download_file(self, semaphore, content):
+        async with semaphore:
+            if self.listener.is_cancelled:
+                return
+            a2c_opt = self._a2c_opt.copy()
             if content["path"]:
-                self._a2c_opt["dir"] = f"{self._path}/{content['path']}"
+                a2c_opt["dir"] = f"{self._path}/{content['path']}"
             else:
-                self._a2c_opt["dir"] = self._path
+                a2c_opt["dir"] = self._path
             filename = content["filename"]
-            self._a2c_opt["out"] = filename
+            a2c_opt["out"] = filename
             try:
                 gid = await TorrentManager.aria2.addUri(
-                    uris=[content["url"]], options=self._a2c_opt, position=0
+                    uris=[content["url"]], options=a2c_opt, position=0
                 )
             except (TimeoutError, ClientError, Exception) as e:
                 self._failed += 1
                 LOGGER.error(f"Unable to download {filename} due to: {e}")
-                continue
-            self.download_task = await TorrentManager.aria2.tellStatus(gid)
-            while True:
-                if self.listener.is_cancelled:
-                    if self.download_task:
-                        await TorrentManager.aria2_remove(self.download_task)
-                    break
-                self.download_task = await TorrentManager.aria2.tellStatus(gid)
-                if error_message := self.download_task.get("errorMessage"):
-                    self._failed += 1
-                    LOGGER.error(
-                        f"Unable to download {aria2_name(self.download_task)} due to: {error_message}"
+                return
+            Aria2Tracker.notify(gid)
+            self._downloads[gid] = await Aria2Tracker.get(gid, {"gid": gid})
+            try:
+                while True:
+                    if self.listener.is_cancelled:
+                        await TorrentManager.aria2_remove(self._downloads[gid])
+                        break
+                    download = self._downloads[gid] = await Aria2Tracker.get(
+                        gid, self._downloads[gid]
                     )
-                    await TorrentManager.aria2_remove(self.download_task)
-                    break
-                elif self.download_task.get("status", "") == "complete":
-                    self._proc_bytes += int(self.download_task.get("totalLength", "0"))
-                    await TorrentManager.aria2_remove(self.download_task)
-                    break
-                await sleep(1)
-            self.download_task = None
+                    if error_message := download.get("errorMessage"):
+                        self._failed += 1
+                        LOGGER.error(
+                            f"Unable to download {aria2_name(download)} due to: {error_message}"
+                        )
+                        await TorrentManager.aria2_remove(download)
+                        break
+                    elif download.get("status", "") == "complete":
+                        self._downloads.pop(gid, None)
+                        self._proc_bytes += int(download.get("totalLength", "0"))
+                        await TorrentManager.aria2_remove(download)
+                        break
+                    await Aria2Tracker.wait(gid, 1)
+            finally:
+                Aria2Tracker.forget(gid)
+                self._downloads.pop(gid, None)
+
+    async def download(self, contents):
+        self.is_downloading = True
+        semaphore = Semaphore(self._get_parallel(contents))
+        await gather(*(self._download_file(semaphore, content) for content in contents))
         if self.listener.is_cancelled:
             return
         if self._failed == len(contents):
@@ -82,5 +107,5 @@ class DirectListener:
         self.listener.is_cancelled = True
         LOGGER.info(f"Cancelling Download: {self.listener.name}")
         await self.listener.on_download_error("Download Cancelled by User!")
-        if self.download_task:
-            await TorrentManager.aria2_remove(self.download_task)
+        for download in list(self._downloads.values()):
+            await TorrentManager.aria2_remove(download)
@@ -1,9 +1,16 @@
 from asyncio import sleep
 
-from ... import intervals, jd_listener_lock, jd_downloads
+from ... import LOGGER, intervals, jd_listener_lock, jd_downloads
 from ..ext_utils.bot_utils import new_task
 from ...core.jdownloader_booter import jdownloader
 from ..ext_utils.status_utils import get_task_by_gid
+from ..mirror_leech_utils.status_utils.jdownloader_status import (
+    PACKAGE_FIELDS,
+    publish_packages,
+)
+
+JD_TICK = 3
+JD_MAX_BACKOFF = 60
 
 
 @new_task
@@ -43,20 +50,33 @@ async def _on_download_complete(gid):
 
 @new_task
 async def _jd_listener():
+    delay = JD_TICK
     while True:
-        await sleep(3)
+        await sleep(delay)
         async with jd_listener_lock:
             if len(jd_downloads) == 0:
+                publish_packages([])
                 intervals["jd"] = ""
                 break
+            tracked = [pid for d_dict in jd_downloads.values() for pid in d_dict["ids"]]
             try:
                 packages = await jdownloader.device.downloads.query_packages(
-                    [{"finished": True, "saveTo": True}]
+                    [{**PACKAGE_FIELDS, "packageUUIDs": tracked, "maxResults": -1}]
                 )
-            except Exception:
+                all_packages = {pack["uuid"]: pack for pack in packages}
+                if any(pid not in all_packages for pid in tracked):
+                    # package ids change when JD moves them; rediscover by path
+                    packages = await jdownloader.device.downloads.query_packages(
+                        [{**PACKAGE_FIELDS, "maxResults": -1}]
+                    )
+                    all_packages = {pack["uuid"]: pack for pack in packages}
+            except Exception as e:
+                delay = min(delay * 2, JD_MAX_BACKOFF)
+                LOGGER.warning(f"JDownloader poll failed, retrying in {delay}s: {e}")
                 continue
+            delay = JD_TICK
+            publish_packages(packages)
 
-            all_packages = {pack["uuid"]: pack for pack in packages}
             for d_gid, d_dict in list(jd_downloads.items()):
                 if d_dict["status"] == "down":
                     for index, pid in enumerate(d_dict["ids"]):
@@ -10,6 +10,7 @@ from ... import (
 from ..ext_utils.bot_utils import new_task
 from ..ext_utils.status_utils import get_task_by_gid, get_raw_file_size
 from ..ext_utils.task_manager import stop_duplicate_check, limit_checker
+from ..mirror_leech_utils.status_utils.nzb_status import publish_slots
 
 
 async def _remove_job(nzo_id, mid):
@@ -65,14 +66,35 @@ async def _on_download_complete(nzo_id):
 
 @new_task
 async def _nzb_listener():
+    last_update = None
+    post_processing = False
     while not intervals["stopAll"]:
         async with nzb_listener_lock:
             try:
-                jobs = (await sabnzbd_client.get_history())["history"]["slots"]
-                downloads = (await sabnzbd_client.get_downloads())["queue"]["slots"]
                 if len(nzb_jobs) == 0:
+                    publish_slots([], [])
                     intervals["nzb"] = ""
                     break
+                nzo_ids = list(nzb_jobs)
+                history, queue = await gather(
+                    sabnzbd_client.get_history(
+                        nzo_ids=nzo_ids,
+                        last_history_update=None if post_processing else last_update,
+                    ),
+                    sabnzbd_client.get_downloads(nzo_ids=nzo_ids),
+                )
+                downloads = queue["queue"]["slots"]
+                # sabnzbd answers history: false when nothing changed since last_update
+                if history := history["history"]:
+                    last_update = history["last_history_update"]
+                    jobs = history["slots"]
+                    post_processing = any(
+                        job["status"] not in ["Completed", "Failed"] for job in jobs
+                    )
+                    publish_slots(downloads, jobs)
+                else:
+                    jobs = []
+                    publish_slots(downloads)
                 for job in jobs:
                     nzo_id = job["nzo_id"]
                     if nzo_id not in nzb_jobs:
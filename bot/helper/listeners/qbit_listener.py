@@ -18,7 +18,10 @@ from ..ext_utils.bot_utils import new_task
 from ..ext_utils.files_utils import clean_unwanted
 from ..ext_utils.status_utils import get_readable_time, get_task_by_gid
 from ..ext_utils.task_manager import stop_duplicate_check, limit_checker
-from ..mirror_leech_utils.status_utils.qbit_status import QbittorrentStatus
+from ..mirror_leech_utils.status_utils.qbit_status import (
+    QbittorrentStatus,
+    publish_torrents,
+)
 from ..telegram_helper.message_utils import update_status_message
 
 
@@ -123,6 +126,7 @@ async def _qb_listener():
         async with qb_listener_lock:
             try:
                 torrents = await TorrentManager.qbittorrent.torrents.info()
+                publish_torrents(torrents)
                 if len(torrents) == 0:
                     intervals["qb"] = ""
                     break
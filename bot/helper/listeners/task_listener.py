@@ -9,7 +9,6 @@ from aiofiles.os import listdir, remove, path as aiopath
 from requests import utils as rutils
 
 from ... import (
-    intervals,
     task_dict,
     task_dict_lock,
     LOGGER,
@@ -28,6 +27,7 @@ from ...core.config_manager import Config
 from ...core.torrent_manager import TorrentManager
 from ..ext_utils.bot_utils import sync_to_async
 from ..ext_utils.links_utils import encode_slink
+from ..ext_utils.progress_utils import drop_progress_tracker
 from ..ext_utils.db_handler import database
 from ..ext_utils.files_utils import (
     clean_download,
@@ -57,6 +57,7 @@ from ..telegram_helper.message_utils import (
     delete_message,
     delete_status,
     send_message,
+    status_scheduler,
     update_status_message,
 )
 
@@ -67,10 +68,7 @@ class TaskListener(TaskConfig):
 
     async def clean(self):
         with suppress(Exception):
-            if st := intervals["status"]:
-                for intvl in list(st.values()):
-                    intvl.cancel()
-            intervals["status"].clear()
+            status_scheduler.cancel()
             await gather(TorrentManager.aria2.purgeDownloadResult(), delete_status())
 
     def clear(self):
@@ -210,7 +208,7 @@ class TaskListener(TaskConfig):
             await start_from_queued()
 
         if self.join and not self.is_file:
-            await join_files(up_path)
+            await join_files(up_path, bool(self.extract) and not self.is_nzb)
 
         if self.extract and not self.is_nzb:
             up_path = await self.proceed_extract(up_path, gid)
@@ -519,6 +517,7 @@ class TaskListener(TaskConfig):
             if self.mid in task_dict:
                 del task_dict[self.mid]
             count = len(task_dict)
+        drop_progress_tracker(self.mid)
         if count == 0:
             await self.clean()
         else:
@@ -535,6 +534,7 @@ class TaskListener(TaskConfig):
             if self.mid in task_dict:
                 del task_dict[self.mid]
             count = len(task_dict)
+        drop_progress_tracker(self.mid)
         await self.remove_from_same_dir()
         msg = (
             f"""〶 <b><i><u>Limit Breached:</u></i></b>
@@ -592,6 +592,7 @@ class TaskListener(TaskConfig):
             if self.mid in task_dict:
                 del task_dict[self.mid]
             count = len(task_dict)
+        drop_progress_tracker(self.mid)
         await send_message(self.message, f"{self.tag} {escape(str(error))}")
         if count == 0:
             await self.clean()
@@ -17,6 +17,7 @@ from .... import (
 )
 from ....core.tg_client import TgClient
 from ....core.config_manager import Config
+from ...ext_utils.progress_utils import add_progress_sample
 from ...ext_utils.task_manager import check_running_tasks, stop_duplicate_check
 from ...mirror_leech_utils.status_utils.queue_status import QueueStatus
 from ...mirror_leech_utils.status_utils.telegram_status import TelegramStatus
@@ -34,6 +35,7 @@ class TelegramDownloadHelper:
         self._id = ""
         self.session = ""
         self._hyper_dl = len(TgClient.helper_bots) != 0 and Config.LEECH_DUMP_CHAT
+        self._hyper = None
 
     @property
     def speed(self):
@@ -43,6 +45,10 @@ class TelegramDownloadHelper:
     def processed_bytes(self):
         return self._processed_bytes
 
+    @property
+    def hyper_params(self):
+        return self._hyper.hyper_params if self._hyper else ""
+
     async def _on_download_start(self, file_id, gid, from_queue):
         async with global_lock:
             GLOBAL_GID[file_id] = gid
@@ -69,6 +75,7 @@ class TelegramDownloadHelper:
             else:
                 TgClient.bot.stop_transmission()
         self._processed_bytes = current
+        add_progress_sample(self._listener.mid, "Telegram", current)
 
     async def _on_download_error(self, error):
         async with global_lock:
@@ -87,7 +94,8 @@ class TelegramDownloadHelper:
             # TODO : Add support for user session ( Huh ??)
             if self._hyper_dl:
                 try:
-                    download = await HyperTGDownload().download_media(
+                    self._hyper = HyperTGDownload()
+                    download = await self._hyper.download_media(
                         message,
                         file_name=path,
                         progress=self._on_download_progress,
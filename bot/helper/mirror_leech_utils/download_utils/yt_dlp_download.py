@@ -8,6 +8,7 @@ from yt_dlp import YoutubeDL, DownloadError
 from .... import task_dict_lock, task_dict, user_data
 from ....core.config_manager import BinConfig
 from ...ext_utils.bot_utils import sync_to_async, async_to_sync
+from ...ext_utils.progress_utils import add_progress_sample
 from ...ext_utils.task_manager import (
     check_running_tasks,
     stop_duplicate_check,
@@ -131,6 +132,7 @@ class YoutubeDLHelper:
                     self._listener.size = d["total_bytes_estimate"] or 0
                 self._downloaded_bytes = d["downloaded_bytes"] or 0
                 self._eta = d.get("eta", "-") or "-"
+            add_progress_sample(self._listener.mid, "yt-dlp", self._downloaded_bytes)
             try:
                 self._progress = (self._downloaded_bytes / self._listener.size) * 100
             except ZeroDivisionError:
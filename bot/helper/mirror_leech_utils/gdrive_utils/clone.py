@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from googleapiclient.errors import HttpError
 from logging import getLogger
 from os import path as ospath
@@ -10,6 +11,7 @@ from tenacity import (
 )
 from time import time
 
+from ....core.config_manager import Config
 from ...ext_utils.bot_utils import async_to_sync
 from ...mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
 
@@ -103,39 +105,65 @@ class GoogleDriveClone(GoogleDriveHelper):
             return None, None, None, None, None
 
     def _clone_folder(self, folder_name, folder_id, dest_id):
-        LOGGER.info(f"Syncing: {folder_name}")
-        files = self.get_files_by_folder_id(folder_id)
-        if len(files) == 0:
-            return dest_id
-        for file in files:
-            if file.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
-                self.total_folders += 1
-                file_path = ospath.join(folder_name, file.get("name"))
-                current_dir_id = self.create_directory(file.get("name"), dest_id)
-                self._clone_folder(file_path, file.get("id"), current_dir_id)
-            elif (
-                not file.get("name")
-                .strip()
-                .lower()
-                .endswith(tuple(self.listener.excluded_extensions))
-            ):
-                self.total_files += 1
-                self._copy_file(file.get("id"), dest_id)
-                self.proc_bytes += int(file.get("size", 0))
-                self.total_time = int(time() - self._start_time)
-            if self.listener.is_cancelled:
-                break
+        level = [(folder_name, folder_id, dest_id)]
+        futures = set()
+        with ThreadPoolExecutor(
+            max_workers=max(1, Config.GDRIVE_WORKERS), thread_name_prefix="gd_clone"
+        ) as pool:
+            try:
+                while level and not self.listener.is_cancelled:
+                    sub_folders = []
+                    for path, src_id, dst_id in level:
+                        LOGGER.info(f"Syncing: {path}")
+                        for file in self.get_files_by_folder_id(src_id):
+                            if self.listener.is_cancelled:
+                                break
+                            if file.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
+                                sub_folders.append((path, file, dst_id))
+                            elif (
+                                not file.get("name")
+                                .strip()
+                                .lower()
+                                .endswith(tuple(self.listener.excluded_extensions))
+                            ):
+                                futures.add(pool.submit(self._clone_file, file, dst_id))
+                        futures = self._reap(futures)
+                    if not sub_folders or self.listener.is_cancelled:
+                        break
+                    self.total_folders += len(sub_folders)
+                    ids = self.create_directories(
+                        [(file.get("name"), dst_id) for _, file, dst_id in sub_folders]
+                    )
+                    level = [
+                        (ospath.join(path, file.get("name")), file.get("id"), new_id)
+                        for (path, file, _), new_id in zip(sub_folders, ids)
+                    ]
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _clone_file(self, file, dest_id):
+        if self.listener.is_cancelled:
+            return
+        self._copy_file(file.get("id"), dest_id, self.worker_service)
+        with self._worker_lock:
+            self.total_files += 1
+            self.proc_bytes += int(file.get("size", 0))
+            self.total_time = int(time() - self._start_time)
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(Exception),
     )
-    def _copy_file(self, file_id, dest_id):
+    def _copy_file(self, file_id, dest_id, service=None):
         body = {"parents": [dest_id]}
         try:
             return (
-                self.service.files()
+                (service or self.service)
+                .files()
                 .copy(fileId=file_id, body=body, supportsAllDrives=True)
                 .execute()
             )
@@ -159,8 +187,11 @@ class GoogleDriveClone(GoogleDriveHelper):
                     else:
                         if self.listener.is_cancelled:
                             return
-                        self.switch_service_account()
-                        return self._copy_file(file_id, dest_id)
+                        if service is None:
+                            self.switch_service_account()
+                            return self._copy_file(file_id, dest_id)
+                        self.switch_worker_account()
+                        return self._copy_file(file_id, dest_id, self.worker_service)
                 else:
                     LOGGER.error(f"Got: {reason}")
                     raise err
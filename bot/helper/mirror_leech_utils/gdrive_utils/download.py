@@ -1,22 +1,29 @@
-from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from io import FileIO
 from logging import getLogger
-from os import makedirs, path as ospath
+from os import O_CREAT, O_WRONLY, close, ftruncate, makedirs, pwrite
+from os import open as osopen
+from os import path as ospath
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload
 from tenacity import (
+    RetryError,
     retry,
-    wait_exponential,
-    stop_after_attempt,
     retry_if_exception_type,
-    RetryError,
+    stop_after_attempt,
+    wait_exponential,
 )
 
-from ...ext_utils.bot_utils import async_to_sync
-from ...ext_utils.bot_utils import SetInterval
+from ....core.config_manager import Config
+from ...ext_utils.bot_utils import SetInterval, async_to_sync
 from ...mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
 
 LOGGER = getLogger(__name__)
 
+RANGE_SIZE = 32 * 1024 * 1024
+SPLIT_THRESHOLD = 4 * RANGE_SIZE
+
 
 class GoogleDriveDownload(GoogleDriveHelper):
     def __init__(self, listener, path):
@@ -33,12 +40,19 @@ class GoogleDriveDownload(GoogleDriveHelper):
         try:
             meta = self.get_file_metadata(file_id)
             if meta.get("mimeType") == self.G_DRIVE_DIR_MIME_TYPE:
-                self._download_folder(file_id, self._path, self.listener.name)
+                files = self._list_folder(file_id, self._path, self.listener.name)
             else:
                 makedirs(self._path, exist_ok=True)
-                self._download_file(
-                    file_id, self._path, self.listener.name, meta.get("mimeType")
-                )
+                files = [
+                    (
+                        file_id,
+                        self._path,
+                        self.listener.name,
+                        meta.get("mimeType"),
+                        int(meta.get("size", 0)),
+                    )
+                ]
+            self._download_files(files)
         except Exception as err:
             if isinstance(err, RetryError):
                 LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
@@ -63,103 +77,234 @@ class GoogleDriveDownload(GoogleDriveHelper):
             async_to_sync(self.listener.on_download_complete)
             return
 
-    def _download_folder(self, folder_id, path, folder_name):
-        folder_name = folder_name.replace("/", "")
-        if not ospath.exists(f"{path}/{folder_name}"):
-            makedirs(f"{path}/{folder_name}")
-        path += f"/{folder_name}"
-        result = self.get_files_by_folder_id(folder_id)
-        if len(result) == 0:
+    def _list_folder(self, folder_id, path, folder_name):
+        files = []
+        level = [(folder_id, ospath.join(path, folder_name.replace("/", "")))]
+        while level and not self.listener.is_cancelled:
+            sub_folders = []
+            for src_id, dir_path in level:
+                makedirs(dir_path, exist_ok=True)
+                result = sorted(
+                    self.get_files_by_folder_id(src_id), key=lambda k: k["name"]
+                )
+                for item in result:
+                    file_id = item["id"]
+                    filename = item["name"]
+                    shortcut_details = item.get("shortcutDetails")
+                    if shortcut_details is not None:
+                        file_id = shortcut_details["targetId"]
+                        mime_type = shortcut_details["targetMimeType"]
+                    else:
+                        mime_type = item.get("mimeType")
+                    if mime_type == self.G_DRIVE_DIR_MIME_TYPE:
+                        sub_folders.append(
+                            (file_id, ospath.join(dir_path, filename.replace("/", "")))
+                        )
+                    elif not ospath.isfile(
+                        ospath.join(dir_path, filename)
+                    ) and not filename.strip().lower().endswith(
+                        tuple(self.listener.excluded_extensions)
+                    ):
+                        files.append(
+                            (
+                                file_id,
+                                dir_path,
+                                filename,
+                                mime_type,
+                                int(item.get("size", 0)),
+                            )
+                        )
+            level = sub_folders
+        return files
+
+    def _download_files(self, files):
+        futures = set()
+        with ThreadPoolExecutor(
+            max_workers=max(1, Config.GDRIVE_WORKERS), thread_name_prefix="gd_download"
+        ) as pool:
+            try:
+                for file_id, path, filename, mime_type, size in files:
+                    if self.listener.is_cancelled:
+                        break
+                    if size < SPLIT_THRESHOLD:
+                        futures.add(
+                            pool.submit(
+                                self._download_worker_file,
+                                file_id,
+                                path,
+                                filename,
+                                mime_type,
+                            )
+                        )
+                    else:
+                        file_path = self._create_file(path, filename, size)
+                        futures.update(
+                            pool.submit(
+                                self._download_range,
+                                file_id,
+                                file_path,
+                                start,
+                                min(start + RANGE_SIZE, size) - 1,
+                            )
+                            for start in range(0, size, RANGE_SIZE)
+                        )
+                    futures = self._reap(futures)
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _download_worker_file(self, file_id, path, filename, mime_type):
+        if self.listener.is_cancelled:
             return
-        result = sorted(result, key=lambda k: k["name"])
-        for item in result:
-            file_id = item["id"]
-            filename = item["name"]
-            shortcut_details = item.get("shortcutDetails")
-            if shortcut_details is not None:
-                file_id = shortcut_details["targetId"]
-                mime_type = shortcut_details["targetMimeType"]
-            else:
-                mime_type = item.get("mimeType")
-            if mime_type == self.G_DRIVE_DIR_MIME_TYPE:
-                self._download_folder(file_id, path, filename)
-            elif not ospath.isfile(
-                f"{path}{filename}"
-            ) and not filename.strip().lower().endswith(
-                tuple(self.listener.excluded_extensions)
-            ):
-                self._download_file(file_id, path, filename, mime_type)
-            if self.listener.is_cancelled:
-                break
+        self._download_file(
+            file_id, path, filename, mime_type, service=self.worker_service
+        )
+
+    def _fix_filename(self, filename, export=False):
+        filename = filename.replace("/", "")
+        if export:
+            filename = f"{filename}.pdf"
+        if len(filename.encode()) > 255:
+            ext = ospath.splitext(filename)[1]
+            filename = f"{filename[:245]}{ext}"
+
+            if self.listener.name.strip().endswith(ext):
+                self.listener.name = filename
+        return filename
+
+    def _create_file(self, path, filename, size):
+        file_path = f"{path}/{self._fix_filename(filename)}"
+        fd = osopen(file_path, O_CREAT | O_WRONLY, 0o644)
+        try:
+            ftruncate(fd, size)
+        finally:
+            close(fd)
+        return file_path
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(Exception),
     )
-    def _download_file(self, file_id, path, filename, mime_type, export=False):
+    def _download_range(self, file_id, file_path, start, end):
+        if self.listener.is_cancelled:
+            return
+        request = self.worker_service.files().get_media(
+            fileId=file_id, supportsAllDrives=True, acknowledgeAbuse=True
+        )
+        request.headers["Range"] = f"bytes={start}-{end}"
+        try:
+            content = request.execute()
+        except HttpError as err:
+            if err.resp.get("content-type", "").startswith("application/json"):
+                reason = eval(err.content).get("error").get("errors")[0].get("reason")
+                if (
+                    reason in ["downloadQuotaExceeded", "dailyLimitExceeded"]
+                    and self.use_sa
+                    and self.sa_count < self.sa_number
+                    and not self.listener.is_cancelled
+                ):
+                    self.switch_worker_account()
+                    LOGGER.info(f"Got: {reason}, Trying Again...")
+                    return self._download_range(file_id, file_path, start, end)
+            raise
+        if len(content) != end - start + 1:
+            raise ValueError(
+                f"Got {len(content)} bytes for range {start}-{end} of {file_path}"
+            )
+        fd = osopen(file_path, O_WRONLY)
+        try:
+            pwrite(fd, content, start)
+        finally:
+            close(fd)
+        self._add_progress(len(content))
+
+    @retry(
+        wait=wait_exponential(multiplier=2, min=3, max=6),
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception_type(Exception),
+    )
+    def _download_file(
+        self, file_id, path, filename, mime_type, export=False, service=None
+    ):
+        drive = service or self.service
         if export:
-            request = self.service.files().export_media(
+            request = drive.files().export_media(
                 fileId=file_id, mimeType="application/pdf"
             )
         else:
-            request = self.service.files().get_media(
+            request = drive.files().get_media(
                 fileId=file_id, supportsAllDrives=True, acknowledgeAbuse=True
             )
-        filename = filename.replace("/", "")
-        if export:
-            filename = f"{filename}.pdf"
-        if len(filename.encode()) > 255:
-            ext = ospath.splitext(filename)[1]
-            filename = f"{filename[:245]}{ext}"
-
-            if self.listener.name.strip().endswith(ext):
-                self.listener.name = filename
+        filename = self._fix_filename(filename, export)
         if self.listener.is_cancelled:
             return
         fh = FileIO(f"{path}/{filename}", "wb")
         downloader = MediaIoBaseDownload(fh, request, chunksize=100 * 1024 * 1024)
         done = False
         retries = 0
-        while not done:
-            if self.listener.is_cancelled:
-                fh.close()
-                break
-            try:
-                self.status, done = downloader.next_chunk()
-            except HttpError as err:
-                LOGGER.error(err)
-                if err.resp.status in [500, 502, 503, 504, 429] and retries < 10:
-                    retries += 1
-                    continue
-                if err.resp.get("content-type", "").startswith("application/json"):
-                    reason = (
-                        eval(err.content).get("error").get("errors")[0].get("reason")
-                    )
-                    if "fileNotDownloadable" in reason and "document" in mime_type:
-                        return self._download_file(
-                            file_id, path, filename, mime_type, True
+        downloaded = 0
+        try:
+            while not done:
+                if self.listener.is_cancelled:
+                    break
+                try:
+                    status, done = downloader.next_chunk()
+                except HttpError as err:
+                    LOGGER.error(err)
+                    if err.resp.status in [500, 502, 503, 504, 429] and retries < 10:
+                        retries += 1
+                        continue
+                    if err.resp.get("content-type", "").startswith("application/json"):
+                        reason = (
+                            eval(err.content)
+                            .get("error")
+                            .get("errors")[0]
+                            .get("reason")
                         )
-                    if reason not in [
-                        "downloadQuotaExceeded",
-                        "dailyLimitExceeded",
-                    ]:
-                        raise err
-                    if self.use_sa:
-                        if self.sa_count >= self.sa_number:
-                            LOGGER.info(
-                                f"Reached maximum number of service accounts switching, which is {self.sa_count}"
-                            )
-                            raise err
-                        else:
-                            if self.listener.is_cancelled:
-                                return
-                            self.switch_service_account()
-                            LOGGER.info(f"Got: {reason}, Trying Again...")
+                        if "fileNotDownloadable" in reason and "document" in mime_type:
                             return self._download_file(
-                                file_id, path, filename, mime_type
+                                file_id, path, filename, mime_type, True, service
                             )
-                    else:
-                        LOGGER.error(f"Got: {reason}")
-                        raise err
-        self.file_processed_bytes = 0
+                        if reason not in [
+                            "downloadQuotaExceeded",
+                            "dailyLimitExceeded",
+                        ]:
+                            raise
+                        if self.use_sa:
+                            if self.sa_count >= self.sa_number:
+                                LOGGER.info(
+                                    f"Reached maximum number of service accounts switching, which is {self.sa_count}"
+                                )
+                                raise
+                            else:
+                                if self.listener.is_cancelled:
+                                    return
+                                self._add_progress(-downloaded)
+                                downloaded = 0
+                                LOGGER.info(f"Got: {reason}, Trying Again...")
+                                if service is None:
+                                    self.switch_service_account()
+                                else:
+                                    self.switch_worker_account()
+                                    service = self.worker_service
+                                return self._download_file(
+                                    file_id,
+                                    path,
+                                    filename,
+                                    mime_type,
+                                    service=service,
+                                )
+                        else:
+                            LOGGER.error(f"Got: {reason}")
+                            raise
+                    continue
+                self._add_progress(status.resumable_progress - downloaded)
+                downloaded = status.resumable_progress
+        except Exception:
+            self._add_progress(-downloaded)
+            raise
+        finally:
+            fh.close()
@@ -1,18 +1,25 @@
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from google_auth_httplib2 import AuthorizedHttp
-from googleapiclient.http import build_http
-from logging import getLogger, ERROR
-from os import path as ospath, listdir
+from collections import OrderedDict
+from logging import ERROR, getLogger
+from os import listdir
+from os import path as ospath
 from pickle import load as pload
 from random import randrange
 from re import search as re_search
+from threading import Lock, local
+from time import time
 from urllib.parse import parse_qs, urlparse
+
+from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from httplib2 import HttpLib2Error
 from tenacity import (
     retry,
-    wait_exponential,
-    stop_after_attempt,
     retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
 )
 
 from ....core.config_manager import Config
@@ -21,6 +28,105 @@ from ...ext_utils.links_utils import is_gdrive_id
 LOGGER = getLogger(__name__)
 getLogger("googleapiclient.discovery").setLevel(ERROR)
 
+BATCH_SIZE = 100
+DRIVE_CACHE_SIZE = 256
+DRIVE_CACHE_TTL = 10 * 60
+CHANGES_INTERVAL = 5
+
+
+class DriveListCache:
+    def __init__(self, max_size=DRIVE_CACHE_SIZE, ttl=DRIVE_CACHE_TTL):
+        self._entries = OrderedDict()
+        self._tokens = {}
+        self._lock = Lock()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _drop_scope(self, scope):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == scope]:
+                del self._entries[key]
+
+    def _sync(self, service, scope):
+        # any change in the scope's change log drops every cached listing of it
+        state = self._tokens.get(scope)
+        now = time()
+        if state is not None and now - state[1] < CHANGES_INTERVAL:
+            return True
+        drive_id = scope[1]
+        kwargs = {"driveId": drive_id} if drive_id else {}
+        try:
+            if state is None:
+                token = (
+                    service.changes()
+                    .getStartPageToken(supportsAllDrives=True, **kwargs)
+                    .execute()["startPageToken"]
+                )
+                changed = True
+            else:
+                token = state[0]
+                changed = False
+                while True:
+                    response = (
+                        service.changes()
+                        .list(
+                            pageToken=token,
+                            supportsAllDrives=True,
+                            includeItemsFromAllDrives=True,
+                            pageSize=1000,
+                            fields="nextPageToken, newStartPageToken, changes(fileId)",
+                            **kwargs,
+                        )
+                        .execute()
+                    )
+                    changed = changed or bool(response.get("changes"))
+                    if "newStartPageToken" in response:
+                        token = response["newStartPageToken"]
+                        break
+                    token = response["nextPageToken"]
+        except (HttpError, HttpLib2Error, OSError) as e:
+            LOGGER.error(f"Drive changes check failed: {e}")
+            self._tokens.pop(scope, None)
+            self._drop_scope(scope)
+            return False
+        self._tokens[scope] = (token, now)
+        if changed:
+            self._drop_scope(scope)
+        return True
+
+    def get(self, service, scope, key):
+        if not self._sync(service, scope):
+            return None
+        key = (scope, key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time() - entry[1] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, scope, key, value):
+        if scope not in self._tokens:
+            return
+        key = (scope, key)
+        with self._lock:
+            self._entries[key] = (value, time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+drive_cache = DriveListCache()
+
 
 class GoogleDriveHelper:
     def __init__(self):
@@ -41,12 +147,13 @@ class GoogleDriveHelper:
         self.service = None
         self.total_files = 0
         self.total_folders = 0
-        self.file_processed_bytes = 0
         self.proc_bytes = 0
         self.total_time = 0
-        self.status = None
         self.update_interval = 3
         self.use_sa = Config.USE_SERVICE_ACCOUNTS
+        self._local = local()
+        self._worker_lock = Lock()
+        self._next_sa = 0
 
     @property
     def speed(self):
@@ -60,24 +167,23 @@ class GoogleDriveHelper:
         return self.proc_bytes
 
     async def progress(self):
-        if self.status is not None:
-            chunk_size = (
-                self.status.total_size * self.status.progress()
-                - self.file_processed_bytes
-            )
-            self.file_processed_bytes = self.status.total_size * self.status.progress()
-            self.proc_bytes += chunk_size
-            self.total_time += self.update_interval
+        self.total_time += self.update_interval
+
+    def _add_progress(self, size):
+        with self._worker_lock:
+            self.proc_bytes += size
 
-    def authorize(self):
+    def authorize(self, sa_index=None):
         credentials = None
         if self.use_sa:
             json_files = listdir("accounts")
             self.sa_number = len(json_files)
-            self.sa_index = randrange(self.sa_number)
-            LOGGER.info(f"Authorizing with {json_files[self.sa_index]} service account")
+            if sa_index is None:
+                self.sa_index = sa_index = randrange(self.sa_number)
+                self._next_sa = sa_index
+            LOGGER.info(f"Authorizing with {json_files[sa_index]} service account")
             credentials = service_account.Credentials.from_service_account_file(
-                f"accounts/{json_files[self.sa_index]}", scopes=self._OAUTH_SCOPE
+                f"accounts/{json_files[sa_index]}", scopes=self._OAUTH_SCOPE
             )
         elif ospath.exists(self.token_path):
             LOGGER.info(f"Authorize with {self.token_path}")
@@ -96,7 +202,73 @@ class GoogleDriveHelper:
             self.sa_index += 1
         self.sa_count += 1
         LOGGER.info(f"Switching to {self.sa_index} index")
-        self.service = self.authorize()
+        self.service = self.authorize(self.sa_index)
+
+    def _authorize_next(self):
+        if not self.use_sa:
+            return self.authorize(self.sa_index)
+        with self._worker_lock:
+            self._next_sa = (self._next_sa + 1) % self.sa_number
+            sa_index = self._next_sa
+        return self.authorize(sa_index)
+
+    @property
+    def worker_service(self):
+        if (service := getattr(self._local, "service", None)) is None:
+            service = self._local.service = self._authorize_next()
+        return service
+
+    def switch_worker_account(self):
+        with self._worker_lock:
+            self.sa_count += 1
+        LOGGER.info("Switching worker to next service account")
+        self._local.service = self._authorize_next()
+
+    @staticmethod
+    def _reap(futures):
+        pending = set()
+        for future in futures:
+            if future.done():
+                future.result()
+            else:
+                pending.add(future)
+        return pending
+
+    def cache_scope(self, drive_id=None):
+        # shared drive change logs are the same for every service account
+        if not self.use_sa:
+            return self.token_path, drive_id
+        if drive_id:
+            return "sa", drive_id
+        return f"sa:{self.sa_index}", None
+
+    def folder_cache_scope(self, folder_id):
+        # only a shared drive's or the owner's change log reports edits inside
+        # a folder, listings of folders shared with this account aren't cached
+        account = self.cache_scope()
+        key = ("scope", folder_id)
+        if (scope := drive_cache.get(self.service, account, key)) is None:
+            try:
+                meta = (
+                    self.service.files()
+                    .get(
+                        fileId=folder_id,
+                        supportsAllDrives=True,
+                        fields="driveId, ownedByMe",
+                    )
+                    .execute()
+                )
+            except (HttpError, HttpLib2Error, OSError) as e:
+                LOGGER.error(f"Drive folder scope check failed: {e}")
+                return None
+            if drive_id := meta.get("driveId"):
+                scope = self.cache_scope(drive_id)
+            elif meta.get("ownedByMe"):
+                scope = account
+            else:
+                scope = ()
+            drive_cache.put(account, key, scope)
+        return scope or None
 
     def get_id_from_url(self, link, user_id=""):
         if user_id and link.startswith("mtp:"):
@@ -125,7 +297,7 @@ class GoogleDriveHelper:
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(Exception),
     )
-    def set_permission(self, file_id):
+    def set_permission(self, file_id, service=None):
         permissions = {
             "role": "reader",
             "type": "anyone",
@@ -133,7 +305,8 @@ class GoogleDriveHelper:
             "withLink": True,
         }
         return (
-            self.service.permissions()
+            (service or self.service)
+            .permissions()
             .create(fileId=file_id, body=permissions, supportsAllDrives=True)
             .execute()
         )
@@ -160,6 +333,13 @@ class GoogleDriveHelper:
         retry=retry_if_exception_type(Exception),
     )
     def get_files_by_folder_id(self, folder_id, item_type=""):
+        scope = self.folder_cache_scope(folder_id)
+        cache_key = ("children", folder_id, item_type)
+        if (
+            scope
+            and (files := drive_cache.get(self.service, scope, cache_key)) is not None
+        ):
+            return list(files)
         page_token = None
         files = []
         if not item_type:
@@ -187,7 +367,9 @@ class GoogleDriveHelper:
             page_token = response.get("nextPageToken")
             if page_token is None:
                 break
-        return files
+        if scope:
+            drive_cache.put(scope, cache_key, files)
+        return list(files)
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
@@ -213,6 +395,65 @@ class GoogleDriveHelper:
         LOGGER.info(f"Created G-Drive Folder:\nName: {file.get('name')}\nID: {file_id}")
         return file_id
 
+    def _execute_batched(self, requests):
+        results = [None] * len(requests)
+
+        def on_response(request_id, response, exception):
+            if exception is None:
+                results[int(request_id)] = response
+
+        for start in range(0, len(requests), BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for index in range(start, min(start + BATCH_SIZE, len(requests))):
+                batch.add(requests[index], request_id=str(index))
+            batch.execute()
+        return results
+
+    def create_directories(self, folders):
+        files = self.service.files()
+        created = self._execute_batched(
+            [
+                files.create(
+                    body={
+                        "name": name,
+                        "description": "Uploaded by Mirror-leech-telegram-bot",
+                        "mimeType": self.G_DRIVE_DIR_MIME_TYPE,
+                        "parents": [dest_id],
+                    },
+                    supportsAllDrives=True,
+                    fields="id",
+                )
+                for name, dest_id in folders
+            ]
+        )
+        ids = [file.get("id") if file else None for file in created]
+        if not Config.IS_TEAM_DRIVE:
+            permissions = {
+                "role": "reader",
+                "type": "anyone",
+                "value": None,
+                "withLink": True,
+            }
+            granted = self._execute_batched(
+                [
+                    self.service.permissions().create(
+                        fileId=file_id, body=permissions, supportsAllDrives=True
+                    )
+                    for file_id in ids
+                    if file_id
+                ]
+            )
+            pending = iter(granted)
+            for file_id in ids:
+                if file_id and next(pending) is None:
+                    self.set_permission(file_id)
+        # anything the batch dropped goes through the retrying single-call path
+        for index, (name, dest_id) in enumerate(folders):
+            if ids[index] is None:
+                ids[index] = self.create_directory(name, dest_id)
+        LOGGER.info(f"Created {len(folders)} G-Drive Folders")
+        return ids
+
     def escapes(self, estr):
         chars = ["\\", "'", '"', r"\a", r"\b", r"\f", r"\n", r"\r", r"\t"]
         for char in chars:
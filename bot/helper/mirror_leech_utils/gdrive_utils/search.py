@@ -2,7 +2,10 @@ from logging import getLogger
 
 from .... import drives_names, drives_ids, index_urls, user_data
 from ....helper.ext_utils.status_utils import get_readable_file_size
-from ....helper.mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
+from ....helper.mirror_leech_utils.gdrive_utils.helper import (
+    GoogleDriveHelper,
+    drive_cache,
+)
 
 LOGGER = getLogger(__name__)
 
@@ -16,6 +19,25 @@ class GoogleDriveSearch(GoogleDriveHelper):
         self._item_type = item_type
 
     def _drive_query(self, dir_id, file_name, is_recursive):
+        # stop duplicate checks must see uploads made a moment ago
+        if self._stop_dup:
+            return self._list_query(dir_id, file_name, is_recursive) or {"files": []}
+        if not is_recursive:
+            scope = self.folder_cache_scope(dir_id)
+        elif dir_id != "root":
+            scope = self.cache_scope(dir_id)
+        else:
+            scope = self.cache_scope()
+        if scope is None:
+            return self._list_query(dir_id, file_name, is_recursive) or {"files": []}
+        cache_key = ("query", dir_id, file_name, is_recursive, self._item_type)
+        if (response := drive_cache.get(self.service, scope, cache_key)) is None:
+            response = self._list_query(dir_id, file_name, is_recursive)
+            if response is not None:
+                drive_cache.put(scope, cache_key, response)
+        return response or {"files": []}
+
+    def _list_query(self, dir_id, file_name, is_recursive):
         try:
             if is_recursive:
                 if self._stop_dup:
@@ -90,7 +112,7 @@ class GoogleDriveSearch(GoogleDriveHelper):
         except Exception as err:
             err = str(err).replace(">", "").replace("<", "")
             LOGGER.error(err)
-            return {"files": []}
+            return None
 
     def drive_list(self, file_name, target_id="", user_id=""):
         msg = ""
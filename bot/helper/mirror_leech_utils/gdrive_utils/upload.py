@@ -1,7 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
+from hashlib import sha1
+from json import dump, load
 from logging import getLogger
-from os import path as ospath, listdir, remove
+from os import path as ospath, listdir, makedirs, remove, replace
 from tenacity import (
     retry,
     wait_exponential,
@@ -9,6 +13,7 @@ from tenacity import (
     retry_if_exception_type,
     RetryError,
 )
+from time import time
 
 from ....core.config_manager import Config
 from ...ext_utils.bot_utils import async_to_sync, SetInterval
@@ -17,6 +22,16 @@ from ...mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
 
 LOGGER = getLogger(__name__)
 
+# resumable chunks must be multiples of 256 KiB
+CHUNK_ALIGN = 256 * 1024
+MIN_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_CHUNK_SIZE = 100 * 1024 * 1024
+CHUNK_TARGET = 10
+SESSION_DIR = "/usr/src/app/gd_sessions/"
+# Drive keeps resumable sessions for a week
+SESSION_TTL = 6 * 24 * 60 * 60
+FINGERPRINT_SIZE = 64 * 1024
+
 
 class GoogleDriveUpload(GoogleDriveHelper):
     def __init__(self, listener, path):
@@ -42,6 +57,7 @@ class GoogleDriveUpload(GoogleDriveHelper):
     def upload(self):
         self.user_setting()
         self.service = self.authorize()
+        self._prune_sessions()
         LOGGER.info(f"Uploading: {self._path}")
         self._updater = SetInterval(self.update_interval, self.progress)
         try:
@@ -101,33 +117,127 @@ class GoogleDriveUpload(GoogleDriveHelper):
             )
             return
 
+    @staticmethod
+    def _adapt_chunk(drive_file, file_path, mime_type, sent, elapsed):
+        if sent <= 0 or elapsed <= 0:
+            return
+        chunk_size = int(sent / elapsed * CHUNK_TARGET) // CHUNK_ALIGN * CHUNK_ALIGN
+        chunk_size = min(max(chunk_size, MIN_CHUNK_SIZE), MAX_CHUNK_SIZE)
+        current = drive_file.resumable.chunksize()
+        # reopening the file for a few percent isn't worth it
+        if abs(chunk_size - current) < current // 4:
+            return
+        # next_chunk takes the chunk size from the request's media body
+        drive_file.resumable = MediaFileUpload(
+            file_path, mimetype=mime_type, resumable=True, chunksize=chunk_size
+        )
+
+    @staticmethod
+    def _prune_sessions():
+        makedirs(SESSION_DIR, exist_ok=True)
+        now = time()
+        for name in listdir(SESSION_DIR):
+            path = ospath.join(SESSION_DIR, name)
+            with suppress(OSError):
+                if now - ospath.getmtime(path) > SESSION_TTL:
+                    remove(path)
+
+    @staticmethod
+    def _session_path(file_path, file_name, dest_id, file_size):
+        digest = sha1(f"{dest_id}/{file_name}/{file_size}".encode())
+        with open(file_path, "rb") as f:
+            digest.update(f.read(FINGERPRINT_SIZE))
+            if file_size > FINGERPRINT_SIZE:
+                f.seek(-FINGERPRINT_SIZE, 2)
+                digest.update(f.read(FINGERPRINT_SIZE))
+        return ospath.join(SESSION_DIR, f"{digest.hexdigest()}.json")
+
+    @staticmethod
+    def _load_session(session_path, file_size):
+        try:
+            with open(session_path) as f:
+                session = load(f)
+            if session["size"] != file_size or not session["uri"]:
+                return None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return session
+
+    @staticmethod
+    def _save_session(session_path, uri, offset, file_size):
+        try:
+            with open(f"{session_path}.tmp", "w") as f:
+                dump({"uri": uri, "offset": offset, "size": file_size}, f)
+            replace(f"{session_path}.tmp", session_path)
+        except OSError as e:
+            LOGGER.error(f"Upload session save failed: {e}")
+
+    @staticmethod
+    def _drop_session(session_path):
+        with suppress(OSError):
+            remove(session_path)
+
     def _upload_dir(self, input_directory, dest_id):
-        list_dirs = listdir(input_directory)
-        if len(list_dirs) == 0:
-            return dest_id
-        new_id = None
-        for item in list_dirs:
-            current_file_name = ospath.join(input_directory, item)
-            if ospath.isdir(current_file_name):
-                current_dir_id = self.create_directory(item, dest_id)
-                new_id = self._upload_dir(current_file_name, current_dir_id)
-                self.total_folders += 1
-            else:
-                mime_type = get_mime_type(current_file_name)
-                file_name = current_file_name.split("/")[-1]
-                self._upload_file(current_file_name, file_name, mime_type, dest_id)
-                self.total_files += 1
-                new_id = dest_id
-            if self.listener.is_cancelled:
-                break
-        return new_id
+        level = [(input_directory, dest_id)]
+        futures = set()
+        with ThreadPoolExecutor(
+            max_workers=max(1, Config.GDRIVE_WORKERS), thread_name_prefix="gd_upload"
+        ) as pool:
+            try:
+                while level and not self.listener.is_cancelled:
+                    sub_dirs = []
+                    for path, parent_id in level:
+                        for item in listdir(path):
+                            if self.listener.is_cancelled:
+                                break
+                            current_file_name = ospath.join(path, item)
+                            if ospath.isdir(current_file_name):
+                                sub_dirs.append((current_file_name, item, parent_id))
+                            else:
+                                mime_type = get_mime_type(current_file_name)
+                                futures.add(
+                                    pool.submit(
+                                        self._upload_dir_file,
+                                        current_file_name,
+                                        item,
+                                        mime_type,
+                                        parent_id,
+                                    )
+                                )
+                        futures = self._reap(futures)
+                    if not sub_dirs or self.listener.is_cancelled:
+                        break
+                    self.total_folders += len(sub_dirs)
+                    ids = self.create_directories(
+                        [(item, parent_id) for _, item, parent_id in sub_dirs]
+                    )
+                    level = [
+                        (path, new_id) for (path, _, _), new_id in zip(sub_dirs, ids)
+                    ]
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        return dest_id
+
+    def _upload_dir_file(self, file_path, file_name, mime_type, dest_id):
+        if self.listener.is_cancelled:
+            return
+        self._upload_file(
+            file_path, file_name, mime_type, dest_id, service=self.worker_service
+        )
+        with self._worker_lock:
+            self.total_files += 1
 
     @retry(
         wait=wait_exponential(multiplier=2, min=3, max=6),
         stop=stop_after_attempt(3),
         retry=retry_if_exception_type(Exception),
     )
-    def _upload_file(self, file_path, file_name, mime_type, dest_id, in_dir=True):
+    def _upload_file(
+        self, file_path, file_name, mime_type, dest_id, in_dir=True, service=None
+    ):
         file_metadata = {
             "name": file_name,
             "description": Config.GD_DESP,
@@ -136,82 +246,133 @@ class GoogleDriveUpload(GoogleDriveHelper):
         if dest_id is not None:
             file_metadata["parents"] = [dest_id]
 
-        if ospath.getsize(file_path) == 0:
+        drive = service or self.service
+        file_size = ospath.getsize(file_path)
+        if file_size == 0:
             media_body = MediaFileUpload(file_path, mimetype=mime_type, resumable=False)
             response = (
-                self.service.files()
+                drive.files()
                 .create(
                     body=file_metadata, media_body=media_body, supportsAllDrives=True
                 )
                 .execute()
             )
             if not Config.IS_TEAM_DRIVE:
-                self.set_permission(response["id"])
+                self.set_permission(response["id"], service)
 
             drive_file = (
-                self.service.files()
+                drive.files()
                 .get(fileId=response["id"], supportsAllDrives=True)
                 .execute()
             )
             return self.G_DRIVE_BASE_DOWNLOAD_URL.format(drive_file.get("id"))
         media_body = MediaFileUpload(
-            file_path, mimetype=mime_type, resumable=True, chunksize=100 * 1024 * 1024
+            file_path, mimetype=mime_type, resumable=True, chunksize=MIN_CHUNK_SIZE
         )
 
-        drive_file = self.service.files().create(
+        drive_file = drive.files().create(
             body=file_metadata, media_body=media_body, supportsAllDrives=True
         )
+        session_path = self._session_path(file_path, file_name, dest_id, file_size)
+        if session := self._load_session(session_path, file_size):
+            LOGGER.info(
+                f"Resuming upload of {file_name} from {session['offset']} bytes"
+            )
+            # Drive answers a chunk sent from behind its offset with a 308
+            # carrying the persisted range, next_chunk continues from there
+            drive_file.resumable_uri = session["uri"]
+            drive_file.resumable_progress = session["offset"]
         response = None
         retries = 0
-        while response is None and not self.listener.is_cancelled:
-            try:
-                self.status, response = drive_file.next_chunk()
-            except HttpError as err:
-                if err.resp.status in [500, 502, 503, 504, 429] and retries < 10:
-                    retries += 1
-                    continue
-                if err.resp.get("content-type", "").startswith("application/json"):
-                    reason = (
-                        eval(err.content).get("error").get("errors")[0].get("reason")
-                    )
-                    if reason not in [
-                        "userRateLimitExceeded",
-                        "dailyLimitExceeded",
-                    ]:
-                        raise err
-                    if self.use_sa:
-                        if self.sa_count >= self.sa_number:
-                            LOGGER.info(
-                                f"Reached maximum number of service accounts switching, which is {self.sa_count}"
-                            )
+        uploaded = 0
+        try:
+            while response is None and not self.listener.is_cancelled:
+                start_time = time()
+                try:
+                    status, response = drive_file.next_chunk()
+                except HttpError as err:
+                    if session and err.resp.status in [404, 410]:
+                        LOGGER.info(f"Upload session of {file_name} expired")
+                        self._drop_session(session_path)
+                        session = None
+                        drive_file.resumable_uri = None
+                        drive_file.resumable_progress = 0
+                        self._add_progress(-uploaded)
+                        uploaded = 0
+                        continue
+                    if err.resp.status in [500, 502, 503, 504, 429] and retries < 10:
+                        retries += 1
+                        continue
+                    if err.resp.get("content-type", "").startswith("application/json"):
+                        reason = (
+                            eval(err.content)
+                            .get("error")
+                            .get("errors")[0]
+                            .get("reason")
+                        )
+                        if reason not in [
+                            "userRateLimitExceeded",
+                            "dailyLimitExceeded",
+                        ]:
                             raise err
+                        if self.use_sa:
+                            if self.sa_count >= self.sa_number:
+                                LOGGER.info(
+                                    f"Reached maximum number of service accounts switching, which is {self.sa_count}"
+                                )
+                                raise err
+                            else:
+                                if self.listener.is_cancelled:
+                                    return
+                                self._add_progress(-uploaded)
+                                uploaded = 0
+                                self._drop_session(session_path)
+                                LOGGER.info(f"Got: {reason}, Trying Again...")
+                                if service is None:
+                                    self.switch_service_account()
+                                else:
+                                    self.switch_worker_account()
+                                    service = self.worker_service
+                                return self._upload_file(
+                                    file_path,
+                                    file_name,
+                                    mime_type,
+                                    dest_id,
+                                    in_dir,
+                                    service,
+                                )
                         else:
-                            if self.listener.is_cancelled:
-                                return
-                            self.switch_service_account()
-                            LOGGER.info(f"Got: {reason}, Trying Again...")
-                            return self._upload_file(
-                                file_path,
-                                file_name,
-                                mime_type,
-                                dest_id,
-                                in_dir,
-                            )
-                    else:
-                        LOGGER.error(f"Got: {reason}")
-                        raise err
+                            LOGGER.error(f"Got: {reason}")
+                            raise err
+                sent = (status.resumable_progress if status else file_size) - uploaded
+                uploaded += sent
+                self._add_progress(sent)
+                if status is not None:
+                    self._save_session(
+                        session_path,
+                        drive_file.resumable_uri,
+                        status.resumable_progress,
+                        file_size,
+                    )
+                    self._adapt_chunk(
+                        drive_file, file_path, mime_type, sent, time() - start_time
+                    )
+        except Exception:
+            # the retry counts the confirmed offset again, drop this attempt's bytes
+            self._add_progress(-uploaded)
+            raise
+        self._drop_session(session_path)
         if self.listener.is_cancelled:
             return
         try:
             remove(file_path)
         except Exception:
             pass
-        self.file_processed_bytes = 0
         if not Config.IS_TEAM_DRIVE:
-            self.set_permission(response["id"])
+            self.set_permission(response["id"], service)
         if not in_dir:
             drive_file = (
-                self.service.files()
+                drive.files()
                 .get(fileId=response["id"], supportsAllDrives=True)
                 .execute()
             )
@@ -12,6 +12,8 @@ from contextlib import suppress
 
 from ....core.config_manager import Config, BinConfig
 from ...ext_utils.bot_utils import cmd_exec, sync_to_async
+from ...ext_utils.progress_utils import add_progress_sample
+from ...ext_utils.status_utils import speed_string_to_bytes
 from ...ext_utils.files_utils import (
     count_files_and_folders,
     get_mime_type,
@@ -81,6 +83,11 @@ class RcloneTransferHelper:
                     self._speed,
                     self._eta,
                 ) = data[0]
+                add_progress_sample(
+                    self._listener.mid,
+                    "RClone",
+                    speed_string_to_bytes(self._transferred_size),
+                )
             await sleep(0.05)
 
     def _switch_service_account(self):
@@ -1,7 +1,7 @@
 from time import time
 
-from .... import LOGGER
-from ....core.torrent_manager import TorrentManager, aria2_name
+from .... import LOGGER, task_dict
+from ....core.torrent_manager import Aria2Tracker, TorrentManager, aria2_name
 from ...ext_utils.status_utils import (
     EngineStatus,
     MirrorStatus,
@@ -12,8 +12,7 @@ from ...ext_utils.status_utils import (
 
 async def get_download(gid, old_info=None):
     try:
-        res = await TorrentManager.aria2.tellStatus(gid)
-        return res or old_info
+        return await Aria2Tracker.get(gid, old_info)
     except Exception as e:
         LOGGER.error(f"{e}: Aria2c, Error while getting torrent info")
         return old_info
@@ -33,11 +32,13 @@ class Aria2Status:
         self._download = await get_download(self._gid, self._download)
         if self._download.get("followedBy", []):
             self._gid = self._download["followedBy"][0]
-            self._download = await get_download(self._gid)
+            self._download = await get_download(self._gid, self._download)
+            if task_dict.get(self.listener.mid) is self:
+                task_dict.index_gid(self.listener.mid)
 
     def progress(self):
         try:
-            return f"{round(int(self._download.get("completedLength", "0")) / int(self._download.get("totalLength", "0")) * 100, 2)}%"
+            return f"{round(int(self._download.get('completedLength', '0')) / int(self._download.get('totalLength', '0')) * 100, 2)}%"
         except ZeroDivisionError:
             return "0%"
 
@@ -46,7 +47,7 @@ class Aria2Status:
 
     def speed(self):
         return (
-            f"{get_readable_file_size(int(self._download.get("downloadSpeed", "0")))}/s"
+            f"{get_readable_file_size(int(self._download.get('downloadSpeed', '0')))}/s"
         )
 
     def name(self):
@@ -92,7 +93,7 @@ class Aria2Status:
 
     def seed_speed(self):
         return (
-            f"{get_readable_file_size(int(self._download.get("uploadSpeed", "0")))}/s"
+            f"{get_readable_file_size(int(self._download.get('uploadSpeed', '0')))}/s"
         )
 
     def ratio(self):
@@ -60,4 +60,5 @@ class FFmpegStatus:
                 self.listener.subproc.kill()
             except Exception:
                 pass
+        self._obj.kill_procs()
         await self.listener.on_upload_error(f"{self._cstatus} stopped by user!")
@@ -2,6 +2,7 @@ from time import time
 
 from .... import LOGGER, jd_listener_lock, jd_downloads
 from ....core.jdownloader_booter import jdownloader
+from ...ext_utils.progress_utils import add_progress_sample, get_progress_tracker
 from ...ext_utils.status_utils import (
     MirrorStatus,
     EngineStatus,
@@ -9,6 +10,26 @@ from ...ext_utils.status_utils import (
     get_readable_time,
 )
 
+PACKAGE_FIELDS = {
+    "bytesLoaded": True,
+    "bytesTotal": True,
+    "enabled": True,
+    "finished": True,
+    "running": True,
+    "saveTo": True,
+    "speed": True,
+    "eta": True,
+    "status": True,
+    "hosts": True,
+}
+
+jd_packages = {}
+
+
+def publish_packages(packages):
+    jd_packages.clear()
+    jd_packages.update((pack["uuid"], pack) for pack in packages)
+
 
 def _get_combined_info(result, old_info):
     name = result[0].get("name")
@@ -47,22 +68,13 @@ def _get_combined_info(result, old_info):
 
 async def get_download(gid, old_info):
     try:
-        result = await jdownloader.device.downloads.query_packages(
-            [
-                {
-                    "bytesLoaded": True,
-                    "bytesTotal": True,
-                    "enabled": True,
-                    "packageUUIDs": jd_downloads[gid]["ids"],
-                    "maxResults": -1,
-                    "running": True,
-                    "speed": True,
-                    "eta": True,
-                    "status": True,
-                    "hosts": True,
-                }
-            ]
-        )
+        ids = jd_downloads[gid]["ids"]
+        if ids and all(pid in jd_packages for pid in ids):
+            result = [jd_packages[pid] for pid in ids]
+        else:
+            result = await jdownloader.device.downloads.query_packages(
+                [{**PACKAGE_FIELDS, "packageUUIDs": ids, "maxResults": -1}]
+            )
         return _get_combined_info(result, old_info) if len(result) > 1 else result[0]
     except Exception:
         return old_info
@@ -77,6 +89,9 @@ class JDownloaderStatus:
 
     async def _update(self):
         self._info = await get_download(self._gid, self._info)
+        add_progress_sample(
+            self.listener.mid, "JDownloader", self._info.get("bytesLoaded", 0)
+        )
 
     def progress(self):
         try:
@@ -88,6 +103,8 @@ class JDownloaderStatus:
         return get_readable_file_size(self._info.get("bytesLoaded", 0))
 
     def speed(self):
+        if tracker := get_progress_tracker(self.listener.mid):
+            return f"{get_readable_file_size(tracker.current_speed())}/s"
         return f"{get_readable_file_size(self._info.get('speed', 0))}/s"
 
     def name(self):
@@ -97,6 +114,10 @@ class JDownloaderStatus:
         return get_readable_file_size(self._info.get("bytesTotal", 0))
 
     def eta(self):
+        if (tracker := get_progress_tracker(self.listener.mid)) and (
+            eta := tracker.eta(self._info.get("bytesTotal", 0))
+        ) is not None:
+            return get_readable_time(eta)
         return get_readable_time(eta) if (eta := self._info.get("eta", False)) else "-"
 
     async def status(self):
@@ -10,19 +10,40 @@ from ...ext_utils.status_utils import (
     time_to_seconds,
 )
 
+queue_slots = {}
+history_slots = {}
+
+
+def publish_slots(queue, history=None):
+    queue_slots.clear()
+    queue_slots.update((slot["nzo_id"], slot) for slot in queue)
+    if history is not None:
+        history_slots.clear()
+        history_slots.update((slot["nzo_id"], slot) for slot in history)
+
+
+async def _get_slots(nzo_id):
+    if nzo_id in queue_slots or nzo_id in history_slots:
+        return queue_slots.get(nzo_id), history_slots.get(nzo_id)
+    queue = await sabnzbd_client.get_downloads(nzo_ids=nzo_id)
+    if res := queue["queue"]["slots"]:
+        return res[0], None
+    history = await sabnzbd_client.get_history(nzo_ids=nzo_id)
+    if res := history["history"]["slots"]:
+        return None, res[0]
+    return None, None
+
 
 async def get_download(nzo_id, old_info):
     try:
-        queue = await sabnzbd_client.get_downloads(nzo_ids=nzo_id)
-        if res := queue["queue"]["slots"]:
-            slot = res[0]
+        slot, history_slot = await _get_slots(nzo_id)
+        if slot is not None:
             if msg := slot["labels"]:
                 LOGGER.warning(" | ".join(msg))
             return slot
         else:
-            history = await sabnzbd_client.get_history(nzo_ids=nzo_id)
-            if res := history["history"]["slots"]:
-                slot = res[0]
+            if history_slot is not None:
+                slot = history_slot
                 if slot["status"] == "Verifying":
                     percentage = slot["action_line"].split("Verifying: ")[-1].split("/")
                     percentage = round(
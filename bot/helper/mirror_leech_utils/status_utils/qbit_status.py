@@ -1,6 +1,6 @@
 from asyncio import sleep, gather
 
-from .... import LOGGER, qb_torrents, qb_listener_lock
+from .... import LOGGER, qb_torrents, qb_listener_lock, task_dict
 from ....core.torrent_manager import TorrentManager
 from ...ext_utils.status_utils import (
     MirrorStatus,
@@ -9,8 +9,19 @@ from ...ext_utils.status_utils import (
     get_readable_time,
 )
 
+torrent_infos = {}
+
+
+def publish_torrents(torrents):
+    torrent_infos.clear()
+    for tor_info in torrents:
+        if tor_info.tags:
+            torrent_infos[tor_info.tags[0]] = tor_info
+
 
 async def get_download(tag, old_info=None):
+    if (info := torrent_infos.get(tag)) is not None:
+        return info
     try:
         res = (await TorrentManager.qbittorrent.torrents.info(tag=tag))[0]
         return res or old_info
@@ -29,6 +40,8 @@ class QbittorrentStatus:
 
     async def update(self):
         self._info = await get_download(f"{self.listener.mid}", self._info)
+        if self._info is not None and task_dict.get(self.listener.mid) is self:
+            task_dict.index_gid(self.listener.mid)
 
     def progress(self):
         return f"{round(self._info.progress * 100, 2)}%"
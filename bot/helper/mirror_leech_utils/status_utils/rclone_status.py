@@ -1,4 +1,11 @@
-from ...ext_utils.status_utils import MirrorStatus, EngineStatus
+from ...ext_utils.progress_utils import get_progress_tracker
+from ...ext_utils.status_utils import (
+    MirrorStatus,
+    EngineStatus,
+    get_readable_file_size,
+    get_readable_time,
+    speed_string_to_bytes,
+)
 
 
 class RcloneStatus:
@@ -16,6 +23,8 @@ class RcloneStatus:
         return self._obj.percentage
 
     def speed(self):
+        if tracker := get_progress_tracker(self.listener.mid):
+            return f"{get_readable_file_size(tracker.current_speed())}/s"
         return self._obj.speed
 
     def name(self):
@@ -25,6 +34,10 @@ class RcloneStatus:
         return self._obj.size
 
     def eta(self):
+        if (tracker := get_progress_tracker(self.listener.mid)) and (
+            seconds := tracker.eta(speed_string_to_bytes(self._obj.size))
+        ) is not None:
+            return get_readable_time(seconds)
         return self._obj.eta
 
     def status(self):
@@ -1,3 +1,4 @@
+from ...ext_utils.progress_utils import get_progress_tracker
 from ...ext_utils.status_utils import (
     MirrorStatus,
     EngineStatus,
@@ -37,15 +38,25 @@ class TelegramStatus:
         return f"{round(progress_raw, 2)}%"
 
     def speed(self):
+        if tracker := get_progress_tracker(self.listener.mid):
+            return f"{get_readable_file_size(tracker.current_speed())}/s"
         return f"{get_readable_file_size(self._obj.speed)}/s"
 
     def eta(self):
+        if tracker := get_progress_tracker(self.listener.mid):
+            seconds = tracker.eta(self._size)
+            return get_readable_time(seconds) if seconds is not None else "-"
         try:
             seconds = (self._size - self._obj.processed_bytes) / self._obj.speed
             return get_readable_time(seconds)
         except ZeroDivisionError:
             return "-"
 
+    def hyper_params(self):
+        if self._status == "dl":
+            return getattr(self._obj, "hyper_params", "")
+        return ""
+
     def gid(self):
         return self._gid
 
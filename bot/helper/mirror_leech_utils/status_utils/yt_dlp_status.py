@@ -1,3 +1,4 @@
+from ...ext_utils.progress_utils import get_progress_tracker
 from ...ext_utils.status_utils import (
     MirrorStatus,
     EngineStatus,
@@ -32,9 +33,15 @@ class YtDlpStatus:
         return f"{round(self._obj.progress, 2)}%"
 
     def speed(self):
+        if tracker := get_progress_tracker(self.listener.mid):
+            return f"{get_readable_file_size(tracker.current_speed())}/s"
         return f"{get_readable_file_size(self._obj.download_speed)}/s"
 
     def eta(self):
+        if (tracker := get_progress_tracker(self.listener.mid)) and (
+            seconds := tracker.eta(self._obj.size)
+        ) is not None:
+            return get_readable_time(seconds)
         if self._obj.eta != "-":
             return get_readable_time(self._obj.eta)
         try:
@@ -1,4 +1,4 @@
-from asyncio import sleep
+from asyncio import Semaphore, create_task, sleep
 from logging import getLogger
 from os import path as ospath, walk
 from re import match as re_match, sub as re_sub
@@ -7,7 +7,14 @@ from time import time
 from aioshutil import rmtree
 from natsort import natsorted
 from PIL import Image
-from pyrogram.errors import BadRequest, FloodWait, RPCError
+from pyrogram.errors import (
+    BadRequest,
+    ChannelPrivate,
+    ChatWriteForbidden,
+    FloodWait,
+    PeerIdInvalid,
+    RPCError,
+)
 
 try:
     from pyrogram.errors import FloodPremiumWait
@@ -27,6 +34,7 @@ from tenacity import (
     RetryError,
     retry,
     retry_if_exception_type,
+    retry_if_not_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
@@ -35,6 +43,7 @@ from ....core.config_manager import Config
 from ....core.tg_client import TgClient
 from ...ext_utils.bot_utils import sync_to_async
 from ...ext_utils.files_utils import get_base_name, is_archive
+from ...ext_utils.progress_utils import add_progress_sample
 from ...ext_utils.status_utils import get_readable_file_size, get_readable_time
 from ...telegram_helper.message_utils import send_message
 from ...ext_utils.media_utils import (
@@ -49,6 +58,10 @@ from ...telegram_helper.message_utils import delete_message
 
 LOGGER = getLogger(__name__)
 
+HELPER_POST_ERRORS = (ChatWriteForbidden, ChannelPrivate, PeerIdInvalid)
+# (helper no, chat id) pairs where a helper bot can't post
+unusable_helpers = set()
+
 
 class TelegramUploader:
     def __init__(self, listener, path):
@@ -77,6 +90,10 @@ class TelegramUploader:
         self._log_msg = None
         self._user_session = self._listener.user_transmission
         self._error = ""
+        self._is_log_del = False
+        self._parallel_threads = 1
+        self._bot_load = 0
+        self._stage_msgs = {}
 
     async def _upload_progress(self, current, _):
         if self._listener.is_cancelled:
@@ -87,6 +104,7 @@ class TelegramUploader:
         chunk_size = current - self._last_uploaded
         self._last_uploaded = current
         self._processed_bytes += chunk_size
+        add_progress_sample(self._listener.mid, "Telegram", self._processed_bytes)
 
     async def _user_settings(self):
         settings_map = {
@@ -333,12 +351,189 @@ class TelegramUploader:
             if not self._listener.is_cancelled:
                 LOGGER.error(f"Failed To Send in BotPM:\n{str(err)}")
 
+    async def _flush_media_groups(self, f_path):
+        if not self._last_msg_in_group:
+            return
+        group_lists = [x for v in self._media_dict.values() for x in v.keys()]
+        match = re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", f_path)
+        if not match or match and match.group(0) not in group_lists:
+            for key, value in list(self._media_dict.items()):
+                for subkey, msgs in list(value.items()):
+                    if len(msgs) > 1:
+                        await self._send_media_group(subkey, key, msgs)
+
+    async def _clean_log_msg(self):
+        if self._log_msg and not self._is_log_del and Config.CLEAN_LOG_MSG:
+            await delete_message(self._log_msg)
+            self._is_log_del = True
+
+    def _get_parallel_threads(self):
+        if (
+            not TgClient.helper_bots
+            or not self._listener.up_dest
+            or self._is_private
+            or (self._user_session and not self._listener.hybrid_leech)
+        ):
+            return 1
+        return max(1, Config.LEECH_UPLOAD_THREADS)
+
+    def _acquire_client(self, f_size):
+        if f_size > 2097152000 and TgClient.user and self._listener.user_transmission:
+            TgClient.user_load += 1
+            return "user", TgClient.user
+        chat_id = self._sent_msg.chat.id
+        loads = {
+            no: TgClient.helper_loads.get(no, 0)
+            for no in TgClient.helper_bots
+            if (no, chat_id) not in unusable_helpers
+        }
+        loads[0] = self._bot_load
+        no = min(loads, key=loads.get)
+        if no == 0:
+            self._bot_load += 1
+            return no, self._listener.client
+        TgClient.helper_loads[no] = loads[no] + 1
+        return no, TgClient.helper_bots[no]
+
+    def _release_client(self, no):
+        if no == "user":
+            TgClient.user_load -= 1
+        elif no == 0:
+            self._bot_load -= 1
+        elif no in TgClient.helper_loads:
+            TgClient.helper_loads[no] -= 1
+
+    @retry(
+        wait=wait_exponential(multiplier=2, min=4, max=8),
+        stop=stop_after_attempt(3),
+        retry=retry_if_not_exception_type(HELPER_POST_ERRORS),
+    )
+    async def _stage_file(self, no, client, file_, up_path, cap_mono):
+        if (reply_to := self._stage_msgs.get(no)) is None:
+            reply_to = self._stage_msgs[no] = await client.get_messages(
+                chat_id=self._sent_msg.chat.id, message_ids=self._sent_msg.id
+            )
+        last_uploaded = 0
+
+        async def progress(current, _):
+            nonlocal last_uploaded
+            if self._listener.is_cancelled:
+                client.stop_transmission()
+            self._processed_bytes += current - last_uploaded
+            last_uploaded = current
+            add_progress_sample(self._listener.mid, "Telegram", self._processed_bytes)
+
+        try:
+            return await self._send_file(reply_to, up_path, cap_mono, file_, progress)
+        except Exception:
+            self._processed_bytes -= last_uploaded
+            raise
+
+    async def _stage_job(self, semaphore, file_, up_path, cap_mono, f_size):
+        async with semaphore:
+            if self._listener.is_cancelled:
+                return None
+            while True:
+                no, client = self._acquire_client(f_size)
+                try:
+                    return await self._stage_file(no, client, file_, up_path, cap_mono)
+                except HELPER_POST_ERRORS as e:
+                    if no in (0, "user"):
+                        raise
+                    chat_id = self._sent_msg.chat.id
+                    LOGGER.warning(
+                        f"Helper bot {no} can't post in {chat_id}, skipping it: {e}"
+                    )
+                    unusable_helpers.add((no, chat_id))
+                    self._stage_msgs.pop(no, None)
+                finally:
+                    self._release_client(no)
+
+    async def _copy_staged(self, staged):
+        try:
+            return await self._listener.client.copy_message(
+                chat_id=self._sent_msg.chat.id,
+                from_chat_id=staged.chat.id,
+                message_id=staged.id,
+                reply_to_message_id=self._sent_msg.id,
+                disable_notification=True,
+            )
+        except (FloodWait, FloodPremiumWait) as f:
+            LOGGER.warning(str(f))
+            await sleep(f.value * 1.3)
+            return await self._copy_staged(staged)
+
+    async def _upload_dir_parallel(self, dirpath, files):
+        entries = []
+        for file_ in files:
+            self._up_path = f_path = ospath.join(dirpath, file_)
+            if not await aiopath.exists(f_path):
+                LOGGER.error(f"{f_path} not exists! Continue uploading!")
+                continue
+            f_size = await aiopath.getsize(f_path)
+            self._total_files += 1
+            if f_size == 0:
+                LOGGER.error(
+                    f"{f_path} size is zero, telegram don't upload zero size files"
+                )
+                self._corrupted += 1
+                continue
+            if self._listener.is_cancelled:
+                return False
+            cap_mono = await self._prepare_file(file_, dirpath)
+            entries.append((file_, f_path, self._up_path, cap_mono, f_size))
+
+        semaphore = Semaphore(self._parallel_threads)
+        jobs = [
+            create_task(self._stage_job(semaphore, file_, up_path, cap_mono, f_size))
+            for file_, _, up_path, cap_mono, f_size in entries
+        ]
+        try:
+            for (file_, f_path, up_path, _, _), job in zip(entries, jobs):
+                self._error = ""
+                self._up_path = up_path
+                try:
+                    staged = await job
+                    if self._listener.is_cancelled:
+                        return False
+                    if staged is None:
+                        continue
+                    await self._flush_media_groups(f_path)
+                    self._last_msg_in_group = False
+                    self._sent_msg = await self._copy_staged(staged)
+                    await delete_message(staged)
+                    await self._after_upload(f_path)
+                    await self._clean_log_msg()
+                    if self._listener.is_cancelled:
+                        return False
+                    if (
+                        self._listener.is_super_chat or self._listener.up_dest
+                    ) and not self._is_private:
+                        self._msgs_dict[self._sent_msg.link] = file_
+                except Exception as err:
+                    if isinstance(err, RetryError):
+                        LOGGER.info(
+                            f"Total Attempts: {err.last_attempt.attempt_number}"
+                        )
+                        err = err.last_attempt.exception()
+                    LOGGER.exception(f"{err}. Path: {up_path}")
+                    self._error = str(err)
+                    self._corrupted += 1
+                    if self._listener.is_cancelled:
+                        return False
+                if not self._listener.is_cancelled and await aiopath.exists(up_path):
+                    await remove(up_path)
+        finally:
+            for job in jobs:
+                job.cancel()
+        return True
+
     async def upload(self):
         await self._user_settings()
         res = await self._msg_to_reply()
         if not res:
             return
-        is_log_del = False
+        self._parallel_threads = self._get_parallel_threads()
         for dirpath, _, files in natsorted(await sync_to_async(walk, self._path)):
             if dirpath.strip().endswith("/yt-dlp-thumb"):
                 continue
@@ -346,6 +541,10 @@ class TelegramUploader:
                 await self._send_screenshots(dirpath, files)
                 await rmtree(dirpath, ignore_errors=True)
                 continue
+            if self._parallel_threads > 1:
+                if not await self._upload_dir_parallel(dirpath, natsorted(files)):
+                    return
+                continue
             for file_ in natsorted(files):
                 self._error = ""
                 self._up_path = f_path = ospath.join(dirpath, file_)
@@ -364,16 +563,7 @@ class TelegramUploader:
                     if self._listener.is_cancelled:
                         return
                     cap_mono = await self._prepare_file(file_, dirpath)
-                    if self._last_msg_in_group:
-                        group_lists = [
-                            x for v in self._media_dict.values() for x in v.keys()
-                        ]
-                        match = re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", f_path)
-                        if not match or match and match.group(0) not in group_lists:
-                            for key, value in list(self._media_dict.items()):
-                                for subkey, msgs in list(value.items()):
-                                    if len(msgs) > 1:
-                                        await self._send_media_group(subkey, key, msgs)
+                    await self._flush_media_groups(f_path)
                     if self._listener.hybrid_leech and self._listener.user_transmission:
                         self._user_session = f_size > 2097152000
                         if self._user_session:
@@ -389,9 +579,7 @@ class TelegramUploader:
                     self._last_msg_in_group = False
                     self._last_uploaded = 0
                     await self._upload_file(cap_mono, file_, f_path)
-                    if self._log_msg and not is_log_del and Config.CLEAN_LOG_MSG:
-                        await delete_message(self._log_msg)
-                        is_log_del = True
+                    await self._clean_log_msg()
                     if self._listener.is_cancelled:
                         return
                     if (
@@ -407,7 +595,7 @@ class TelegramUploader:
                             f"Total Attempts: {err.last_attempt.attempt_number}"
                         )
                         err = err.last_attempt.exception()
-                    LOGGER.error(f"{err}. Path: {self._up_path}", exc_info=True)
+                    LOGGER.exception(f"{err}. Path: {self._up_path}")
                     self._error = str(err)
                     self._corrupted += 1
                     if self._listener.is_cancelled:
@@ -455,7 +643,6 @@ class TelegramUploader:
                 "Upload failed: Message not initialized"
             )
             return
-
         if not hasattr(self._sent_msg, "chat") or self._sent_msg.chat is None:
             LOGGER.error("Cannot upload: _sent_msg.chat is None")
             await self._listener.on_upload_error(
@@ -463,6 +650,23 @@ class TelegramUploader:
             )
             return
 
+        self._is_corrupted = False
+        sent_msg = await self._send_file(
+            self._sent_msg,
+            self._up_path,
+            cap_mono,
+            file,
+            self._upload_progress,
+            force_document,
+        )
+        if sent_msg is None:
+            return
+        self._sent_msg = sent_msg
+        await self._after_upload(o_path)
+
+    async def _send_file(
+        self, reply_to, up_path, cap_mono, file, progress, force_document=False
+    ):
         if (
             self._thumb is not None
             and not await aiopath.exists(self._thumb)
@@ -470,9 +674,9 @@ class TelegramUploader:
         ):
             self._thumb = None
         thumb = self._thumb
-        self._is_corrupted = False
+        key = ""
         try:
-            is_video, is_audio, is_image = await get_document_type(self._up_path)
+            is_video, is_audio, is_image = await get_document_type(up_path)
 
             if not is_image and thumb is None:
                 file_name = ospath.splitext(file)[0]
@@ -480,7 +684,7 @@ class TelegramUploader:
                 if await aiopath.isfile(thumb_path):
                     thumb = thumb_path
                 elif is_audio and not is_video:
-                    thumb = await get_audio_thumbnail(self._up_path)
+                    thumb = await get_audio_thumbnail(up_path)
 
             if (
                 self._listener.as_doc
@@ -489,32 +693,32 @@ class TelegramUploader:
             ):
                 key = "documents"
                 if is_video and thumb is None:
-                    thumb = await get_video_thumbnail(self._up_path, None)
+                    thumb = await get_video_thumbnail(up_path, None)
 
                 if self._listener.is_cancelled:
                     return
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_document(
-                    document=self._up_path,
+                sent_msg = await reply_to.reply_document(
+                    document=up_path,
                     quote=True,
                     thumb=thumb,
                     caption=cap_mono,
                     force_document=True,
                     disable_notification=True,
-                    progress=self._upload_progress,
+                    progress=progress,
                 )
             elif is_video:
                 key = "videos"
-                duration = (await get_media_info(self._up_path))[0]
+                duration = (await get_media_info(up_path))[0]
                 if thumb is None and self._listener.thumbnail_layout:
                     thumb = await get_multiple_frames_thumbnail(
-                        self._up_path,
+                        up_path,
                         self._listener.thumbnail_layout,
                         self._listener.screen_shots,
                     )
                 if thumb is None:
-                    thumb = await get_video_thumbnail(self._up_path, duration)
+                    thumb = await get_video_thumbnail(up_path, duration)
                 if thumb is not None and thumb != "none":
                     with Image.open(thumb) as img:
                         width, height = img.size
@@ -525,8 +729,8 @@ class TelegramUploader:
                     return
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_video(
-                    video=self._up_path,
+                sent_msg = await reply_to.reply_video(
+                    video=up_path,
                     quote=True,
                     caption=cap_mono,
                     duration=duration,
@@ -535,17 +739,17 @@ class TelegramUploader:
                     thumb=thumb,
                     supports_streaming=True,
                     disable_notification=True,
-                    progress=self._upload_progress,
+                    progress=progress,
                 )
             elif is_audio:
                 key = "audios"
-                duration, artist, title = await get_media_info(self._up_path)
+                duration, artist, title = await get_media_info(up_path)
                 if self._listener.is_cancelled:
                     return
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_audio(
-                    audio=self._up_path,
+                sent_msg = await reply_to.reply_audio(
+                    audio=up_path,
                     quote=True,
                     caption=cap_mono,
                     duration=duration,
@@ -553,73 +757,26 @@ class TelegramUploader:
                     title=title,
                     thumb=thumb,
                     disable_notification=True,
-                    progress=self._upload_progress,
+                    progress=progress,
                 )
             else:
                 key = "photos"
                 if self._listener.is_cancelled:
                     return
-                self._sent_msg = await self._sent_msg.reply_photo(
-                    photo=self._up_path,
+                sent_msg = await reply_to.reply_photo(
+                    photo=up_path,
                     quote=True,
                     caption=cap_mono,
                     disable_notification=True,
-                    progress=self._upload_progress,
+                    progress=progress,
                 )
-
-            if (
-                not self._listener.is_cancelled
-                and self._media_group
-                and (self._sent_msg.video or self._sent_msg.document)
-            ):
-                key = "documents" if self._sent_msg.document else "videos"
-                if match := re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", o_path):
-                    pname = match.group(0)
-                    if pname in self._media_dict[key].keys():
-                        self._media_dict[key][pname].append(
-                            [self._sent_msg.chat.id, self._sent_msg.id]
-                        )
-                    else:
-                        self._media_dict[key][pname] = [
-                            [self._sent_msg.chat.id, self._sent_msg.id]
-                        ]
-                    msgs = self._media_dict[key][pname]
-                    if len(msgs) == 10:
-                        await self._send_media_group(pname, key, msgs)
-                    else:
-                        self._last_msg_in_group = True
-
-            if self._sent_msg:
-                await self._copy_media()
-                if self._listener.leech_dest:
-                    try:
-                        leech_dest = self._listener.leech_dest
-                        if not isinstance(leech_dest, int):
-                            if "|" in str(leech_dest):
-                                leech_dest, _ = str(leech_dest).split("|", 1)
-                            if leech_dest.lstrip("-").isdigit():
-                                leech_dest = int(leech_dest)
-                        await TgClient.bot.copy_message(
-                            chat_id=leech_dest,
-                            from_chat_id=self._sent_msg.chat.id,
-                            message_id=self._sent_msg.id,
-                        )
-                    except Exception as e:
-                        if not self._listener.is_cancelled:
-                            LOGGER.error(
-                                f"Failed to forward to {self._listener.leech_dest}: {e}"
-                            )
-                            await send_message(
-                                self._listener.user_id,
-                                f"Failed to forward to {self._listener.leech_dest}\n{e}",
-                            )
-
             if (
                 self._thumb is None
                 and thumb is not None
                 and await aiopath.exists(thumb)
             ):
                 await remove(thumb)
+            return sent_msg
         except (FloodWait, FloodPremiumWait) as f:
             LOGGER.warning(str(f))
             await sleep(f.value * 1.3)
@@ -629,7 +786,9 @@ class TelegramUploader:
                 and await aiopath.exists(thumb)
             ):
                 await remove(thumb)
-            return await self._upload_file(cap_mono, file, o_path)
+            return await self._send_file(
+                reply_to, up_path, cap_mono, file, progress, force_document
+            )
         except Exception as err:
             if (
                 self._thumb is None
@@ -638,12 +797,63 @@ class TelegramUploader:
             ):
                 await remove(thumb)
             err_type = "RPCError: " if isinstance(err, RPCError) else ""
-            LOGGER.error(f"{err_type}{err}. Path: {self._up_path}", exc_info=True)
+            LOGGER.exception(f"{err_type}{err}. Path: {up_path}")
             if isinstance(err, BadRequest) and key != "documents":
-                LOGGER.error(f"Retrying As Document. Path: {self._up_path}")
-                return await self._upload_file(cap_mono, file, o_path, True)
+                LOGGER.error(f"Retrying As Document. Path: {up_path}")
+                return await self._send_file(
+                    reply_to, up_path, cap_mono, file, progress, True
+                )
             raise err
 
+    async def _after_upload(self, o_path):
+        if (
+            not self._listener.is_cancelled
+            and self._media_group
+            and (self._sent_msg.video or self._sent_msg.document)
+        ):
+            key = "documents" if self._sent_msg.document else "videos"
+            if match := re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", o_path):
+                pname = match.group(0)
+                if pname in self._media_dict[key].keys():
+                    self._media_dict[key][pname].append(
+                        [self._sent_msg.chat.id, self._sent_msg.id]
+                    )
+                else:
+                    self._media_dict[key][pname] = [
+                        [self._sent_msg.chat.id, self._sent_msg.id]
+                    ]
+                msgs = self._media_dict[key][pname]
+                if len(msgs) == 10:
+                    await self._send_media_group(pname, key, msgs)
+                else:
+                    self._last_msg_in_group = True
+
+        if self._sent_msg:
+            await self._copy_media()
+            if self._listener.leech_dest:
+                try:
+                    leech_dest = self._listener.leech_dest
+                    if not isinstance(leech_dest, int):
+                        if "|" in str(leech_dest):
+                            leech_dest, _ = str(leech_dest).split("|", 1)
+                        if leech_dest.lstrip("-").isdigit():
+                            leech_dest = int(leech_dest)
+                    await TgClient.bot.copy_message(
+                        chat_id=leech_dest,
+                        from_chat_id=self._sent_msg.chat.id,
+                        message_id=self._sent_msg.id,
+                    )
+                except (RPCError, KeyError, ValueError) as e:
+                    # pyrogram raises KeyError/ValueError for unresolvable peers
+                    if not self._listener.is_cancelled:
+                        LOGGER.error(
+                            f"Failed to forward to {self._listener.leech_dest}: {e}"
+                        )
+                        await send_message(
+                            self._listener.user_id,
+                            f"Failed to forward to {self._listener.leech_dest}\n{e}",
+                        )
+
     @property
     def speed(self):
         try:
@@ -2,6 +2,7 @@ from asyncio import sleep, gather
 from re import match as re_match
 from time import time
 
+from aiohttp import ClientError
 from pyrogram.types import Message
 from pyrogram.enums import ParseMode
 from pyrogram.errors import (
@@ -13,6 +14,7 @@ from pyrogram.errors import (
     WebpageCurlFailed,
     MediaEmpty,
     MediaCaptionTooLong,
+    RPCError,
 )
 
 try:
@@ -20,13 +22,19 @@ try:
 except ImportError:
     FloodPremiumWait = FloodWait
 
-from ... import LOGGER, intervals, status_dict, task_dict_lock
+from ... import LOGGER, bot_loop, intervals, status_dict, task_dict_lock
 from ...core.config_manager import Config
 from ...core.tg_client import TgClient
-from ..ext_utils.bot_utils import SetInterval
 from ..ext_utils.exceptions import TgLinkException
 from ..ext_utils.status_utils import get_readable_message
 
+STATUS_TICK = 1
+STATUS_EDITS_PER_SEC = 20
+STATUS_EDITS_BURST = 20
+STATUS_MAX_STRETCH = 3
+STATUS_CHAT_GAP = 1.1
+STATUS_MIN_GAP = 3
+
 
 async def send_message(message, text, buttons=None, block=True, photo=None, **kwargs):
     try:
@@ -117,7 +125,7 @@ async def edit_message(message, text, buttons=None, block=True):
     except FloodWait as f:
         LOGGER.warning(str(f))
         if not block:
-            return str(f)
+            return f
         await sleep(f.value * 1.2)
         return await edit_message(message, text, buttons)
     except Exception as e:
@@ -282,17 +290,114 @@ async def get_tg_link_message(link):
         raise TgLinkException("Private: Please report!")
 
 
+class StatusScheduler:
+    def __init__(self):
+        self._due = {}
+        self._idle = {}
+        self._chat_edits = {}
+        self._tokens = STATUS_EDITS_BURST
+        self._last_fill = time()
+        self._task = None
+
+    def add(self, sid):
+        self._due.setdefault(sid, time() + Config.STATUS_UPDATE_INTERVAL)
+        self._idle.setdefault(sid, 0)
+        if self._task is None or self._task.done():
+            self._task = bot_loop.create_task(self._run())
+
+    def remove(self, sid):
+        self._due.pop(sid, None)
+        self._idle.pop(sid, None)
+
+    def delay(self, sid, seconds):
+        if sid in self._due:
+            self._due[sid] = max(self._due[sid], time() + seconds)
+
+    def mark_edit(self, chat_id):
+        self._chat_edits[chat_id] = time()
+
+    def _chat_ready(self, chat_id, now):
+        return now - self._chat_edits.get(chat_id, 0) >= STATUS_CHAT_GAP
+
+    def cancel(self):
+        self._due.clear()
+        self._idle.clear()
+        self._chat_edits.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _take_token(self):
+        now = time()
+        self._tokens = min(
+            STATUS_EDITS_BURST,
+            self._tokens + (now - self._last_fill) * STATUS_EDITS_PER_SEC,
+        )
+        self._last_fill = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def _run(self):
+        while self._due and not intervals["stopAll"]:
+            await sleep(STATUS_TICK)
+            now = time()
+            due = [
+                sid
+                for sid in sorted(self._due, key=self._due.get)
+                if self._due[sid] <= now and self._chat_ready(sid, now)
+            ]
+            # spread the edits over the tick instead of firing them back-to-back
+            gap = STATUS_TICK / len(due) if due else 0
+            for index, sid in enumerate(due):
+                if index:
+                    await sleep(gap)
+                if sid not in self._due or not self._take_token():
+                    break
+                if not self._chat_ready(sid, time()):
+                    continue
+                try:
+                    active = await update_status_message(sid)
+                except (
+                    # engine clients and half-initialised status getters
+                    ClientError,
+                    OSError,
+                    RPCError,
+                    AttributeError,
+                    KeyError,
+                    TypeError,
+                    ValueError,
+                    ZeroDivisionError,
+                ) as e:
+                    LOGGER.error(f"Status with id: {sid} failed to refresh. Error: {e}")
+                    active = False
+                if sid not in self._due:
+                    continue
+                if active is None:
+                    idle = self._idle[sid]
+                else:
+                    idle = 0 if active else min(self._idle[sid] + 1, STATUS_MAX_STRETCH)
+                self._idle[sid] = idle
+                self._due[sid] = max(
+                    self._due[sid],
+                    time() + Config.STATUS_UPDATE_INTERVAL * (1 + idle),
+                )
+
+
+status_scheduler = StatusScheduler()
+
+
+# True: edited with live tasks, False: idle or failed, None: skipped, too soon
 async def update_status_message(sid, force=False):
     if intervals["stopAll"]:
-        return
+        return False
     async with task_dict_lock:
         if not status_dict.get(sid):
-            if obj := intervals["status"].get(sid):
-                obj.cancel()
-                del intervals["status"][sid]
-            return
-        if not force and time() - status_dict[sid]["time"] < 3:
-            return
+            status_scheduler.remove(sid)
+            return False
+        if not force and time() - status_dict[sid]["time"] < STATUS_MIN_GAP:
+            return None
         status_dict[sid]["time"] = time()
         page_no = status_dict[sid]["page_no"]
         status = status_dict[sid]["status"]
@@ -303,27 +408,29 @@ async def update_status_message(sid, force=False):
         )
         if text is None:
             del status_dict[sid]
-            if obj := intervals["status"].get(sid):
-                obj.cancel()
-                del intervals["status"][sid]
-            return
-        if text != status_dict[sid]["message"].text:
-            message = await edit_message(
-                status_dict[sid]["message"], text, buttons, block=False
-            )
-            if isinstance(message, str):
-                if message.startswith("Telegram says: [40"):
-                    del status_dict[sid]
-                    if obj := intervals["status"].get(sid):
-                        obj.cancel()
-                        del intervals["status"][sid]
-                else:
-                    LOGGER.error(
-                        f"Status with id: {sid} haven't been updated. Error: {message}"
-                    )
-                return
-            status_dict[sid]["message"].text = text
-            status_dict[sid]["time"] = time()
+            status_scheduler.remove(sid)
+            return False
+        if text == status_dict[sid]["message"].text:
+            return False
+        message = await edit_message(
+            status_dict[sid]["message"], text, buttons, block=False
+        )
+        if isinstance(message, FloodWait):
+            status_scheduler.delay(sid, message.value * 1.2)
+            return False
+        if isinstance(message, str):
+            if message.startswith("Telegram says: [40"):
+                del status_dict[sid]
+                status_scheduler.remove(sid)
+            else:
+                LOGGER.error(
+                    f"Status with id: {sid} haven't been updated. Error: {message}"
+                )
+            return False
+        status_scheduler.mark_edit(status_dict[sid]["message"].chat.id)
+        status_dict[sid]["message"].text = text
+        status_dict[sid]["time"] = time()
+        return not status_dict[sid].get("idle", False)
 
 
 async def send_status_message(msg, user_id=0):
@@ -341,9 +448,7 @@ async def send_status_message(msg, user_id=0):
             )
             if text is None:
                 del status_dict[sid]
-                if obj := intervals["status"].get(sid):
-                    obj.cancel()
-                    del intervals["status"][sid]
+                status_scheduler.remove(sid)
                 return
             old_message = status_dict[sid]["message"]
             message = await send_message(msg, text, buttons, block=False)
@@ -374,7 +479,5 @@ async def send_status_message(msg, user_id=0):
                 "status": "All",
                 "is_user": is_user,
             }
-        if not intervals["status"].get(sid) and not is_user:
-            intervals["status"][sid] = SetInterval(
-                Config.STATUS_UPDATE_INTERVAL, update_status_message, sid
-            )
+        if not is_user:
+            status_scheduler.add(sid)
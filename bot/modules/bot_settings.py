@@ -22,21 +22,16 @@ from .. import (
     drives_ids,
     drives_names,
     index_urls,
-    intervals,
     jd_listener_lock,
     nzb_options,
     qbit_options,
     sabnzbd_client,
-    task_dict,
     shortener_dict,
     excluded_extensions,
     auth_chats,
     sudo_users,
 )
-from ..helper.ext_utils.bot_utils import (
-    SetInterval,
-    new_task,
-)
+from ..helper.ext_utils.bot_utils import new_task
 from ..core.config_manager import Config
 from ..core.tg_client import TgClient
 from ..core.torrent_manager import TorrentManager
@@ -51,7 +46,6 @@ from ..helper.telegram_helper.message_utils import (
     edit_message,
     send_file,
     send_message,
-    update_status_message,
 )
 from .rss import add_job
 from .search import initiate_search_tools
@@ -284,12 +278,6 @@ async def edit_variable(_, message, pre_message, key):
             await database.trunc_table("tasks")
     elif key == "STATUS_UPDATE_INTERVAL":
         value = int(value)
-        if len(task_dict) != 0 and (st := intervals["status"]):
-            for cid, intvl in list(st.items()):
-                intvl.cancel()
-                intervals["status"][cid] = SetInterval(
-                    value, update_status_message, cid
-                )
     elif key == "TORRENT_TIMEOUT":
         await TorrentManager.change_aria2_option("bt-stop-timeout", value)
         value = int(value)
@@ -658,16 +646,6 @@ async def edit_bot_settings(client, query):
         value = ""
         if data[2] in DEFAULT_VALUES:
             value = DEFAULT_VALUES[data[2]]
-            if (
-                data[2] == "STATUS_UPDATE_INTERVAL"
-                and len(task_dict) != 0
-                and (st := intervals["status"])
-            ):
-                for key, intvl in list(st.items()):
-                    intvl.cancel()
-                    intervals["status"][key] = SetInterval(
-                        value, update_status_message, key
-                    )
         elif data[2] == "EXCLUDED_EXTENSIONS":
             excluded_extensions.clear()
             excluded_extensions.extend(["aria2", "!qB"])
@@ -935,13 +913,6 @@ async def load_config():
     if not await aiopath.exists("accounts"):
         Config.USE_SERVICE_ACCOUNTS = False
 
-    if len(task_dict) != 0 and (st := intervals["status"]):
-        for key, intvl in list(st.items()):
-            intvl.cancel()
-            intervals["status"][key] = SetInterval(
-                Config.STATUS_UPDATE_INTERVAL, update_status_message, key
-            )
-
     if Config.TORRENT_TIMEOUT:
         await TorrentManager.change_aria2_option(
             "bt-stop-timeout", f"{Config.TORRENT_TIMEOUT}"
@@ -17,10 +17,12 @@ from ..core.torrent_manager import TorrentManager
 from ..helper.ext_utils.bot_utils import new_task
 from ..helper.ext_utils.db_handler import database
 from ..helper.ext_utils.files_utils import clean_all
+from ..helper.ext_utils.hyperdl_utils import media_sessions
 from ..helper.telegram_helper import button_build
 from ..helper.telegram_helper.message_utils import (
     delete_message,
     send_message,
+    status_scheduler,
 )
 
 
@@ -123,6 +125,7 @@ async def confirm_restart(_, query):
         intervals["stopAll"] = True
         restart_message = await send_message(reply_to, "<i>Restarting...</i>")
         await delete_message(message)
+        await media_sessions.stop_all()
         await TgClient.stop()
         if scheduler.running:
             scheduler.shutdown(wait=False)
@@ -132,9 +135,7 @@ async def confirm_restart(_, query):
             jd.cancel()
         if nzb := intervals["nzb"]:
             nzb.cancel()
-        if st := intervals["status"]:
-            for intvl in list(st.values()):
-                intvl.cancel()
+        status_scheduler.cancel()
         await clean_all()
         await TorrentManager.close_all()
         if sabnzbd_client.LOGGED_IN:
@@ -24,6 +24,7 @@ from psutil import (
 from .. import bot_cache, bot_start_time
 from ..core.config_manager import Config, BinConfig
 from ..helper.ext_utils.bot_utils import cmd_exec, compare_versions, new_task
+from ..helper.ext_utils.progress_utils import get_engine_speeds
 from ..helper.ext_utils.status_utils import (
     get_progress_bar_string,
     get_readable_file_size,
@@ -94,6 +95,11 @@ async def get_stats(event, key="home"):
 ┃ <b>Total Disk Write :</b> {f"{get_readable_file_size(disk_io.write_bytes)} ({get_readable_time(disk_io.write_time / 1000)})" if disk_io else "Access Denied"}
 ┖ <b>U :</b> {get_readable_file_size(used)} | <b>F :</b> {get_readable_file_size(free)} | <b>T :</b> {get_readable_file_size(total)}
 """
+        if engine_speeds := get_engine_speeds():
+            msg += "\n┎ <b><i>TASKS THROUGHPUT :</i></b>"
+            for engine, speed in engine_speeds.items():
+                msg += f"\n┠ <b>{engine} :</b> {get_readable_file_size(speed)}/s"
+            msg += f"\n┖ <b>Total :</b> {get_readable_file_size(sum(engine_speeds.values()))}/s\n"
     elif key == "stsys":
         cpu_usage = cpu_percent(interval=0.5)
         msg = f"""⌬ <b><i>OS SYSTEM :</i></b>
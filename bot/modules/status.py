@@ -1,5 +1,3 @@
-from psutil import cpu_percent, virtual_memory, disk_usage
-from time import time
 from asyncio import gather, iscoroutinefunction
 
 from pyrogram.errors import QueryIdInvalid
@@ -8,10 +6,7 @@ from .. import (
     task_dict_lock,
     status_dict,
     task_dict,
-    bot_start_time,
-    intervals,
     sabnzbd_client,
-    DOWNLOAD_DIR,
 )
 from ..core.torrent_manager import TorrentManager
 from ..core.jdownloader_booter import jdownloader
@@ -19,8 +14,8 @@ from ..helper.ext_utils.bot_utils import new_task
 from ..helper.ext_utils.status_utils import (
     EngineStatus,
     MirrorStatus,
+    get_bot_stats,
     get_readable_file_size,
-    get_readable_time,
     speed_string_to_bytes,
 )
 from ..helper.telegram_helper.bot_commands import BotCommands
@@ -29,6 +24,7 @@ from ..helper.telegram_helper.message_utils import (
     delete_message,
     auto_delete_message,
     send_status_message,
+    status_scheduler,
     update_status_message,
     edit_message,
 )
@@ -40,15 +36,14 @@ async def task_status(_, message):
     async with task_dict_lock:
         count = len(task_dict)
     if count == 0:
-        currentTime = get_readable_time(time() - bot_start_time)
-        free = get_readable_file_size(disk_usage(DOWNLOAD_DIR).free)
+        stats = get_bot_stats()
         msg = f"""〶 <b><i>No Active Bot Tasks!</i></b>
 │
 ┖ <b>NOTE</b> → <i>Each user can get status for his tasks by adding "me" or user_id like "1234xxx" after cmd: /{BotCommands.StatusCommand[0]} me or /{BotCommands.StatusCommand[1]} me</i>
 
 ⌬ <b><u>Bot Stats</u></b>
-┟ <b>CPU</b> → {cpu_percent()}% | <b>F</b> → {free} [{round(100 - disk_usage(DOWNLOAD_DIR).percent, 1)}%]
-┖ <b>RAM</b> → {virtual_memory().percent}% | <b>UP</b> → {currentTime}
+┟ <b>CPU</b> → {stats["cpu"]}% | <b>F</b> → {stats["free"]} [{stats["free_percent"]}%]
+┖ <b>RAM</b> → {stats["ram"]}% | <b>UP</b> → {stats["uptime"]}
 """
         reply_message = await send_message(message, msg)
         await auto_delete_message(message, reply_message)
@@ -58,10 +53,7 @@ async def task_status(_, message):
             user_id = message.from_user.id if text[1] == "me" else int(text[1])
         else:
             user_id = 0
-            sid = message.chat.id
-            if obj := intervals["status"].get(sid):
-                obj.cancel()
-                del intervals["status"][sid]
+            status_scheduler.remove(message.chat.id)
         await send_status_message(message, user_id)
         await delete_message(message)
 
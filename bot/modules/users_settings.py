@@ -58,6 +58,7 @@ advanced_options = [
     "YT_DLP_OPTIONS",
     "UPLOAD_PATHS",
     "USER_COOKIE_FILE",
+    "DIRECT_PARALLEL",
 ]
 yt_options = ["YT_DESP", "YT_TAGS", "YT_CATEGORY_ID", "YT_PRIVACY_STATUS"]
 
@@ -137,6 +138,11 @@ user_settings_text = {
         "",
         "Send Dict of keys that have path values. Example: {'path 1': 'remote:rclonefolder', 'path 2': 'gdrive1 id', 'path 3': 'tg chat id', 'path 4': 'mrcc:remote:', 'path 5': b:@username} . </i> \n┖ <b>Time Left :</b> <code>60 sec</code>",
     ),
+    "DIRECT_PARALLEL": (
+        "",
+        "",
+        "Send how many files of a multi-file direct link to download at once. Example: 4. </i> \n┖ <b>Time Left :</b> <code>60 sec</code>",
+    ),
     "EXCLUDED_EXTENSIONS": (
         "",
         "",
@@ -731,6 +737,11 @@ async def get_user_settings(from_user, stype="main"):
             "YT Cookie File", f"userset {user_id} menu USER_COOKIE_FILE"
         )
 
+        buttons.data_button(
+            "Direct Parallel", f"userset {user_id} menu DIRECT_PARALLEL"
+        )
+        direct_parallel = user_dict.get("DIRECT_PARALLEL") or Config.DIRECT_PARALLEL
+
         buttons.data_button("Back", f"userset {user_id} back", "footer")
         buttons.data_button("Close", f"userset {user_id} close", "footer")
         btns = buttons.build_menu(1)
@@ -742,7 +753,8 @@ async def get_user_settings(from_user, stype="main"):
 ┠ <b>Excluded Extensions</b> → <code>{ex_ex}</code>
 ┠ <b>Upload Paths</b> → <b>{upload_paths}</b>
 ┠ <b>YT-DLP Options</b> → <code>{ytopt}</code>
-┖ <b>YT User Cookie File</b> → <b>{user_cookie_msg}</b>"""
+┠ <b>YT User Cookie File</b> → <b>{user_cookie_msg}</b>
+┖ <b>Direct Parallel Files</b> → <b>{direct_parallel}</b>"""
     elif stype == "yttools":
         buttons.data_button("YT Description", f"userset {user_id} menu YT_DESP")
         yt_desp_val = user_dict.get(
@@ -884,6 +896,11 @@ async def set_option(_, message, option, rfunc):
             value = get_size_bytes(value)
         value = min(int(value), TgClient.MAX_SPLIT_SIZE)
     # elif option == "LEECH_DUMP_CHAT": # TODO: Add
+    elif option == "DIRECT_PARALLEL":
+        if not value.isdigit() or int(value) < 1:
+            await send_message(message, "Direct Parallel must be a positive number.")
+            return
+        value = int(value)
     elif option == "EXCLUDED_EXTENSIONS":
         fx = value.split()
         value = ["aria2", "!qB"]
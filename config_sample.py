@@ -25,6 +25,7 @@ YT_DLP_OPTIONS = ""
 USE_SERVICE_ACCOUNTS = False
 NAME_SWAP = ""
 FFMPEG_CMDS = {}
+FFMPEG_SLOTS = 0
 UPLOAD_PATHS = {}
 
 # Hyper Tg Downloader
@@ -103,6 +104,7 @@ TIMEZONE = "Asia/Kolkata"
 
 # GDrive Tools
 GDRIVE_ID = ""
+GDRIVE_WORKERS = 4
 GD_DESP = "Uploaded with WZ Bot"
 IS_TEAM_DRIVE = False
 STOP_DUPLICATE = False
@@ -156,6 +158,7 @@ UPDATE_PKGS = True
 
 # Leech
 LEECH_SPLIT_SIZE = 0
+LEECH_UPLOAD_THREADS = 1
 AS_DOCUMENT = False
 EQUAL_SPLITS = False
 MEDIA_GROUP = False
@@ -174,6 +177,8 @@ MIRROR_LOG_ID = ""
 
 # qBittorrent/Aria2c
 TORRENT_TIMEOUT = 0
+DIRECT_PARALLEL = 4
+DIRECT_HOST_PARALLEL = {}
 BASE_URL = ""
 BASE_URL_PORT = 0
 WEB_PINCODE = True